@@ -0,0 +1,144 @@
+"""
+Decode/encode cost per WebSocket message type for each installed JSON backend,
+plus sendtx frame building with and without the tx_info round-trip.
+
+Messages are synthetic but shaped like the live feed; pass --replay FILE (one
+raw frame per line, e.g. from bench_order_book.py --record) to time real ones.
+
+Usage: python benchmarks/bench_codec.py [--replay book.jsonl] [--number 20000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lighter import codec
+
+
+def level(price, size):
+    return {"price": f"{price:.2f}", "size": f"{size:.4f}"}
+
+
+def sample_messages():
+    snapshot = {
+        "type": "subscribed/order_book",
+        "channel": "order_book:0",
+        "offset": 41692864,
+        "order_book": {
+            "code": 0,
+            "asks": [level(3000.01 + i * 0.01, 1.5 + i) for i in range(250)],
+            "bids": [level(2999.99 - i * 0.01, 1.5 + i) for i in range(250)],
+            "offset": 41692864,
+            "nonce": 1001,
+        },
+    }
+    update = {
+        "type": "update/order_book",
+        "channel": "order_book:0",
+        "offset": 41692865,
+        "order_book": {
+            "code": 0,
+            "asks": [level(3000.05, 0), level(3000.07, 2.25)],
+            "bids": [level(2999.95, 4.5)],
+            "offset": 41692865,
+            "begin_nonce": 1001,
+            "nonce": 1002,
+        },
+    }
+    trade = {
+        "type": "update/trade",
+        "channel": "trade:0",
+        "trades": [{
+            "trade_id": 123456789, "tx_hash": "ab" * 32, "type": "trade", "market_id": 0,
+            "size": "0.0100", "price": "3000.01", "usd_amount": "30.0001", "ask_id": 281474976710656,
+            "bid_id": 281474976710657, "ask_account_id": 1, "bid_account_id": 2, "is_maker_ask": True,
+            "block_height": 1000, "timestamp": 1730000000000,
+        }],
+    }
+    account_all = {
+        "type": "update/account_all",
+        "channel": "account_all:1",
+        "account": 1,
+        "positions": {"0": {"market_id": 0, "symbol": "ETH", "position": "0.0100", "avg_entry_price": "3000.00",
+                            "position_value": "30.00", "unrealized_pnl": "0.01", "realized_pnl": "0.00", "sign": 1}},
+        "trades": {"0": trade["trades"]},
+        "funding_histories": {},
+    }
+    ack = {"type": "jsonapi/sendtx", "data": {"id": "req_1730000000000_1", "code": 200, "tx_hash": "cd" * 32}}
+    return {
+        "order_book snapshot": json.dumps(snapshot),
+        "order_book update": json.dumps(update),
+        "trade": json.dumps(trade),
+        "account_all": json.dumps(account_all),
+        "sendtx ack": json.dumps(ack),
+        "ping": json.dumps({"type": "ping"}),
+    }
+
+
+def replay_messages(path):
+    by_type = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                by_type.setdefault(json.loads(line).get("type", "?"), line.strip())
+    return by_type
+
+
+def available_backends():
+    names = []
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codec.set_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    codec.set_backend()
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--replay", metavar="FILE")
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    messages = replay_messages(args.replay) if args.replay else sample_messages()
+    backends = available_backends()
+    print(f"decode, us/message (backends: {', '.join(backends)})")
+    print(f"{'message':<22}{'bytes':>8}" + "".join(f"{b:>10}" for b in backends))
+    for label, raw in messages.items():
+        row = f"{label:<22}{len(raw):>8}"
+        for name in backends:
+            codec.set_backend(name)
+            number = max(1, args.number // max(1, len(raw) // 200))
+            elapsed = timeit.timeit(lambda: codec.loads(raw), number=number)
+            row += f"{elapsed / number * 1e6:>10.2f}"
+        print(row)
+
+    tx_info = json.dumps({
+        "AccountIndex": 1, "ApiKeyIndex": 2, "MarketIndex": 0, "ClientOrderIndex": 123, "BaseAmount": 10,
+        "Price": 300000, "IsAsk": 0, "Type": 1, "TimeInForce": 0, "ReduceOnly": 0, "TriggerPrice": 0,
+        "OrderExpiry": 0, "ExpiredAt": 1730000600000, "Nonce": 42, "Sig": "ef" * 40,
+    })
+    print()
+    print("sendtx frame, us/frame")
+    print(f"{'backend':<22}{'round-trip':>12}{'splice':>10}")
+    for name in backends:
+        codec.set_backend(name)
+
+        def round_trip():
+            return codec.dumps({"type": "jsonapi/sendtx", "data": {"id": "req_1", "tx_type": 14,
+                                                                   "tx_info": codec.loads(tx_info)}})
+
+        t_round = timeit.timeit(round_trip, number=args.number) / args.number
+        t_splice = timeit.timeit(lambda: codec.sendtx_frame("req_1", 14, tx_info), number=args.number) / args.number
+        print(f"{name:<22}{t_round * 1e6:>12.2f}{t_splice * 1e6:>10.2f}")
+    codec.set_backend()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Per-response cost of ApiClient.deserialize for the polling endpoints.
+
+Times decode + model building for canned order_book_orders / trades /
+account_txs / candlesticks bodies (shapes from bench_rest_models.py), with
+and without an unknown key on every element, so the model_validate fast path
+and the from_dict fallback both show up.
+
+Usage: python benchmarks/bench_deserialize.py [--number 500] [--rows 100]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import lighter
+from lighter import codec
+from bench_rest_models import responses
+
+RESPONSE_TYPES = {
+    "/api/v1/orderBookOrders": "OrderBookOrders",
+    "/api/v1/trades": "Trades",
+    "/api/v1/accountTxs": "Txs",
+    "/api/v1/candlesticks": "Candlesticks",
+}
+
+
+def with_unknown_keys(body):
+    return {
+        key: [dict(item, unknown_field=1) for item in value] if isinstance(value, list) else value
+        for key, value in body.items()
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+
+    api_client = lighter.ApiClient()
+    try:
+        print(f"us per response (JSON backend: {codec.backend})")
+        print(f"{'response':<18}{'exact keys':>12}{'extra keys':>12}")
+        for path, body in responses(args.rows).items():
+            response_type = RESPONSE_TYPES[path]
+            row = f"{response_type:<18}"
+            for payload in (body, with_unknown_keys(body)):
+                text = codec.dumps(payload)
+                elapsed = timeit.timeit(
+                    lambda: api_client.deserialize(text, response_type, "application/json"), number=args.number
+                )
+                row += f"{elapsed / args.number * 1e6:>12.0f}"
+            print(row)
+    finally:
+        await api_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""
+Cold import time of the SDK, measured in fresh interpreters.
+
+Each case runs in a new `python -c` process `--runs` times. The
+interpreter's own startup is measured the same way and subtracted. The "all
+names" case resolves every lazy export, which is what `import lighter` used
+to cost before the package switched to lazy loading.
+
+Usage: python benchmarks/bench_import.py [--runs 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CASES = {
+    "import lighter": "import lighter",
+    "tester imports": "import lighter; from lighter import AccountApi, OrderBook, SignerClient, codec, sessions",
+    "ApiClient + OrderApi": "from lighter import ApiClient, OrderApi",
+    "WsClient only": "from lighter import WsClient",
+    "all names (eager)": "import lighter; [getattr(lighter, n) for n in lighter.__all__]",
+}
+
+
+def run(statement, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
+        samples.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = run("pass", args.runs)
+    print(f"median ms over {args.runs} runs, interpreter startup ({baseline:.0f} ms) subtracted")
+    for label, statement in CASES.items():
+        print(f"{label:<24}{run(statement, args.runs) - baseline:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
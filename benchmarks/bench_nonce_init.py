@@ -0,0 +1,97 @@
+"""
+Nonce manager start-up time: blocking per-key requests vs concurrent aiohttp.
+
+Runs a local /api/v1/nextNonce server (in its own thread, with --delay ms of
+simulated round trip) and builds an OptimisticNonceManager for 1, 8 and 32
+API keys with nonce_manager_factory (sequential `requests` calls, what
+SignerClient did at construction) and nonce_manager_factory_async.
+
+Usage: python benchmarks/bench_nonce_init.py [--delay 50] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import lighter
+from lighter import nonce_manager
+
+KEY_COUNTS = (1, 8, 32)
+
+
+def start_server(delay):
+    """Serve nextNonce on a background loop; returns the base URL."""
+    ready = threading.Event()
+    address = {}
+
+    async def next_nonce(request):
+        await asyncio.sleep(delay)
+        return web.json_response({"code": 200, "nonce": 1000 + int(request.query["api_key_index"])})
+
+    async def serve():
+        app = web.Application()
+        app.router.add_get("/api/v1/nextNonce", next_nonce)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        address["url"] = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        ready.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    ready.wait()
+    return address["url"]
+
+
+async def time_async(api_client, keys, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await nonce_manager.nonce_manager_factory_async(
+            nonce_manager.NonceManagerType.OPTIMISTIC, 1, api_client, keys
+        )
+        samples.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(samples)
+
+
+def time_sync(api_client, keys, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        nonce_manager.nonce_manager_factory(nonce_manager.NonceManagerType.OPTIMISTIC, 1, api_client, keys)
+        samples.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--delay", type=float, default=50, help="simulated round trip, ms")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    url = start_server(args.delay / 1e3)
+    api_client = lighter.ApiClient(configuration=lighter.Configuration(host=url))
+    try:
+        print(f"median ms to initialise nonces, {args.delay:.0f} ms simulated RTT")
+        print(f"{'keys':>6}{'blocking':>12}{'async':>10}")
+        for count in KEY_COUNTS:
+            keys = list(range(2, 2 + count))
+            # the blocking path runs in a thread only so this loop can keep timing; it is sequential either way
+            t_sync = await asyncio.to_thread(time_sync, api_client, keys, args.runs)
+            t_async = await time_async(api_client, keys, args.runs)
+            print(f"{count:>6}{t_sync:>12.0f}{t_async:>10.0f}")
+    finally:
+        await api_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
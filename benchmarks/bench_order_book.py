@@ -0,0 +1,158 @@
+"""
+Per-update cost of OrderBook vs the list-of-dicts merge WsClient used before.
+
+Replays `update/order_book` messages from a recording, or from a synthetic
+random walk when no recording is given. Record one from the live feed with:
+
+    python benchmarks/bench_order_book.py --record book.jsonl --market 0 --seconds 60
+
+then replay it with:
+
+    python benchmarks/bench_order_book.py --replay book.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lighter.order_book import OrderBook
+
+WS_URL = "wss://mainnet.zklighter.elliot.ai/stream"
+
+
+def legacy_update_orders(new_orders, existing_orders):
+    # WsClient.update_orders before OrderBook, kept verbatim for comparison
+    for new_order in new_orders:
+        is_new_order = True
+        for existing_order in existing_orders:
+            if new_order["price"] == existing_order["price"]:
+                is_new_order = False
+                existing_order["size"] = new_order["size"]
+                if float(new_order["size"]) == 0:
+                    existing_orders.remove(existing_order)
+                break
+        if is_new_order:
+            existing_orders.append(new_order)
+
+    existing_orders = [
+        order for order in existing_orders if float(order["size"]) > 0
+    ]
+
+
+def legacy_top(state):
+    # best bid/ask needed a full sort
+    bids = sorted(state["bids"], key=lambda x: float(x["price"]), reverse=True)
+    asks = sorted(state["asks"], key=lambda x: float(x["price"]))
+    return bids[:1], asks[:1]
+
+
+async def record(path, market, seconds):
+    import websockets
+
+    count = 0
+    async with websockets.connect(WS_URL) as ws:
+        await ws.send(json.dumps({"type": "subscribe", "channel": f"order_book/{market}"}))
+        deadline = time.monotonic() + seconds
+        with open(path, "w") as f:
+            while time.monotonic() < deadline:
+                message = json.loads(await ws.recv())
+                message_type = message.get("type")
+                if message_type == "ping":
+                    await ws.send(json.dumps({"type": "pong"}))
+                elif message_type in ("subscribed/order_book", "update/order_book"):
+                    f.write(json.dumps(message) + "\n")
+                    count += 1
+    print(f"recorded {count} messages to {path}")
+
+
+def load(path):
+    with open(path) as f:
+        messages = [json.loads(line) for line in f if line.strip()]
+    snapshot = next(m["order_book"] for m in messages if m["type"] == "subscribed/order_book")
+    updates = [m["order_book"] for m in messages if m["type"] == "update/order_book"]
+    return snapshot, updates
+
+
+def synthetic(n_updates, depth=200, seed=1):
+    rng = random.Random(seed)
+    mid = 300000  # cents
+
+    def level(price, size):
+        return {"price": f"{price / 100:.2f}", "size": f"{size / 10000:.4f}"}
+
+    snapshot = {
+        "asks": [level(mid + 1 + i, rng.randint(1, 50000)) for i in range(depth)],
+        "bids": [level(mid - 1 - i, rng.randint(1, 50000)) for i in range(depth)],
+    }
+    updates = []
+    for _ in range(n_updates):
+        mid += rng.choice((-1, 0, 0, 1))
+        update = {"asks": [], "bids": []}
+        for _ in range(rng.randint(1, 6)):
+            offset = int(rng.expovariate(0.1))
+            size = 0 if rng.random() < 0.3 else rng.randint(1, 50000)
+            update["asks"].append(level(mid + 1 + offset, size))
+            update["bids"].append(level(mid - 1 - offset, size))
+        updates.append(update)
+    return snapshot, updates
+
+
+def run_order_book(snapshot, updates):
+    book = OrderBook()
+    book.apply_snapshot(snapshot)
+    t0 = time.perf_counter_ns()
+    for update in updates:
+        book.apply_update(update)
+        book.best_bid()
+        book.best_ask()
+    return time.perf_counter_ns() - t0
+
+
+def run_legacy(snapshot, updates):
+    state = json.loads(json.dumps(snapshot))
+    t0 = time.perf_counter_ns()
+    for update in updates:
+        legacy_update_orders(update["asks"], state["asks"])
+        legacy_update_orders(update["bids"], state["bids"])
+        legacy_top(state)
+    return time.perf_counter_ns() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--record", metavar="FILE")
+    parser.add_argument("--replay", metavar="FILE")
+    parser.add_argument("--market", type=int, default=0)
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--updates", type=int, default=20000, help="synthetic updates when not replaying")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record, args.market, args.seconds))
+        return
+
+    if args.replay:
+        snapshot, updates = load(args.replay)
+        source = args.replay
+    else:
+        snapshot, updates = synthetic(args.updates)
+        source = "synthetic"
+    levels = sum(len(u.get("asks") or []) + len(u.get("bids") or []) for u in updates)
+    print(f"{source}: {len(updates)} updates, {levels} level changes, best of {args.repeat}")
+    print(f"{'engine':<12}{'ns/update':>12}{'ns/level':>12}")
+
+    for label, run in (("OrderBook", run_order_book), ("legacy", run_legacy)):
+        # the legacy merge mutates its input levels, so each run gets a fresh copy
+        best = min(run(snapshot, json.loads(json.dumps(updates))) for _ in range(args.repeat))
+        print(f"{label:<12}{best / len(updates):>12.0f}{best / max(levels, 1):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+End-to-end latency of large REST responses, eager models vs lazy views.
+
+Serves canned order_book_orders / trades / account_txs / candlesticks
+responses from a local aiohttp server and calls the real API methods through
+an eager ApiClient and one with lazy_models=True, reading a couple of fields
+from the first element the way a poller would.
+
+Usage: python benchmarks/bench_rest_models.py [--number 200] [--rows 100]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import lighter
+from lighter import codec
+
+
+def simple_order(i):
+    return {"order_index": i, "order_id": str(i), "owner_account_index": 1, "initial_base_amount": "1.0000",
+            "remaining_base_amount": "0.5000", "price": f"{3000 + i * 0.01:.2f}", "order_expiry": 1730000600000}
+
+
+def trade(i):
+    return {
+        "trade_id": i, "tx_hash": "ab" * 32, "type": "trade", "market_id": 0, "size": "0.0100",
+        "price": "3000.01", "usd_amount": "30.0001", "ask_id": 1, "bid_id": 2, "ask_client_id": 3,
+        "bid_client_id": 4, "ask_account_id": 1, "bid_account_id": 2, "is_maker_ask": True,
+        "block_height": 1000, "timestamp": 1730000000000, "taker_fee": 0, "taker_position_size_before": "0",
+        "taker_entry_quote_before": "0", "taker_initial_margin_fraction_before": 0,
+        "taker_position_sign_changed": False, "maker_fee": 0, "maker_position_size_before": "0",
+        "maker_entry_quote_before": "0", "maker_initial_margin_fraction_before": 0,
+        "maker_position_sign_changed": False,
+    }
+
+
+def tx(i):
+    return {
+        "hash": "cd" * 32, "type": 14, "info": "{}", "event_info": "{}", "status": 2, "transaction_index": i,
+        "l1_address": "0x" + "00" * 20, "account_index": 1, "nonce": i, "expire_at": 1730000600000,
+        "block_height": 1000, "queued_at": 1730000000000, "executed_at": 1730000000100, "sequence_index": i,
+        "parent_hash": "", "api_key_index": 2,
+    }
+
+
+def candle(i):
+    return {"timestamp": 1730000000000 + i * 60000, "open": 3000.0, "high": 3001.5, "low": 2999.5, "close": 3000.5,
+            "open_raw": 3000.0, "high_raw": 3001.5, "low_raw": 2999.5, "close_raw": 3000.5, "volume0": 12.5,
+            "volume1": 37500.0, "last_trade_id": i}
+
+
+def responses(rows):
+    return {
+        "/api/v1/orderBookOrders": {"code": 200, "total_asks": 250, "total_bids": 250,
+                                    "asks": [simple_order(i) for i in range(250)],
+                                    "bids": [simple_order(i) for i in range(250)]},
+        "/api/v1/trades": {"code": 200, "trades": [trade(i) for i in range(rows)]},
+        "/api/v1/accountTxs": {"code": 200, "txs": [tx(i) for i in range(rows)]},
+        "/api/v1/candlesticks": {"code": 200, "resolution": "1m", "candlesticks": [candle(i) for i in range(rows)]},
+    }
+
+
+async def serve(rows):
+    bodies = {path: codec.dumps(body) for path, body in responses(rows).items()}
+
+    async def handler(request):
+        return web.Response(text=bodies[request.path], content_type="application/json")
+
+    app = web.Application()
+    for path in bodies:
+        app.router.add_get(path, handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def calls(api_client, rows):
+    order_api = lighter.OrderApi(api_client)
+    transaction_api = lighter.TransactionApi(api_client)
+    candlestick_api = lighter.CandlestickApi(api_client)
+
+    async def book():
+        orders = await order_api.order_book_orders(market_id=0, limit=250)
+        return orders.asks[0].price, orders.bids[0].price
+
+    async def trades():
+        result = await order_api.trades(sort_by="timestamp", limit=rows)
+        return result.trades[0].price
+
+    async def txs():
+        result = await transaction_api.account_txs(limit=rows, by="account_index", value="1")
+        return result.txs[0].nonce
+
+    async def candles():
+        result = await candlestick_api.candlesticks(market_id=0, resolution="1m", start_timestamp=0,
+                                                    end_timestamp=1730000000000, count_back=rows)
+        return result.candlesticks[-1].close
+
+    return {"order_book_orders": book, "trades": trades, "account_txs": txs, "candlesticks": candles}
+
+
+async def measure(call, number):
+    await call()
+    samples = []
+    for _ in range(number):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+
+    runner, host = await serve(args.rows)
+    config = lighter.Configuration(host=host)
+    eager = lighter.ApiClient(configuration=config)
+    lazy = lighter.ApiClient(configuration=config, lazy_models=True)
+    try:
+        eager_calls, lazy_calls = calls(eager, args.rows), calls(lazy, args.rows)
+        print(f"median us per call, local server (JSON backend: {codec.backend})")
+        print(f"{'endpoint':<20}{'eager':>10}{'lazy':>10}{'speedup':>10}")
+        for name in eager_calls:
+            t_eager = await measure(eager_calls[name], args.number)
+            t_lazy = await measure(lazy_calls[name], args.number)
+            print(f"{name:<20}{t_eager:>10.0f}{t_lazy:>10.0f}{t_eager / t_lazy:>9.1f}x")
+    finally:
+        await eager.close()
+        await lazy.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
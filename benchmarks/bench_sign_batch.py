@@ -0,0 +1,126 @@
+"""
+Per-order signing cost: a sign_create_order loop vs sign_create_orders_batch.
+
+The batch path is fed each supported input shape (CreateOrderTxReq list, dict
+list and, when NumPy is installed, a structured array).
+
+Runs offline: the API key is generated locally and nonces start at 0; nothing
+is submitted.
+
+Usage: python benchmarks/bench_sign_batch.py [--orders 1000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lighter import nonce_manager
+from lighter.signer_client import CreateOrderTxReq, SignerClient, create_api_key
+
+URL = "https://mainnet.zklighter.elliot.ai"
+ACCOUNT_INDEX = 1
+API_KEY_INDEX = 2
+
+
+def make_specs(n):
+    return [
+        dict(
+            MarketIndex=0,
+            ClientOrderIndex=i,
+            BaseAmount=10,
+            Price=300000 + i % 100,
+            IsAsk=i % 2,
+            Type=SignerClient.ORDER_TYPE_LIMIT,
+            TimeInForce=SignerClient.ORDER_TIME_IN_FORCE_GOOD_TILL_TIME,
+            ReduceOnly=0,
+            TriggerPrice=SignerClient.NIL_TRIGGER_PRICE,
+            OrderExpiry=SignerClient.DEFAULT_28_DAY_ORDER_EXPIRY,
+        )
+        for i in range(n)
+    ]
+
+
+def as_numpy(specs):
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    dtype = np.dtype([
+        ("MarketIndex", np.uint8), ("ClientOrderIndex", np.int64), ("BaseAmount", np.int64),
+        ("Price", np.uint32), ("IsAsk", np.uint8), ("Type", np.uint8), ("TimeInForce", np.uint8),
+        ("ReduceOnly", np.uint8), ("TriggerPrice", np.uint32), ("OrderExpiry", np.int64),
+    ])
+    return np.array([tuple(spec[name] for name in dtype.names) for spec in specs], dtype=dtype)
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+async def bench(args):
+    private_key, _, err = create_api_key()
+    if err is not None:
+        raise Exception(err)
+    client = SignerClient(URL, ACCOUNT_INDEX, {API_KEY_INDEX: private_key})
+
+    specs = make_specs(args.orders)
+    structs = [CreateOrderTxReq(**spec) for spec in specs]
+    array = as_numpy(specs)
+
+    def loop():
+        for spec in specs:
+            api_key_index, nonce = client.nonce_manager.next_nonce()
+            _, _, _, error = client.sign_create_order(
+                spec["MarketIndex"], spec["ClientOrderIndex"], spec["BaseAmount"], spec["Price"],
+                spec["IsAsk"], spec["Type"], spec["TimeInForce"], spec["ReduceOnly"],
+                spec["TriggerPrice"], spec["OrderExpiry"], nonce, api_key_index,
+            )
+            if error is not None:
+                raise Exception(error)
+
+    def batch(orders):
+        def run():
+            _, _, _, error = client.sign_create_orders_batch(orders)
+            if error is not None:
+                raise Exception(error)
+        return run
+
+    cases = [("sign_create_order loop", loop),
+             ("batch: CreateOrderTxReq", batch(structs)),
+             ("batch: dicts", batch(specs))]
+    if array is not None:
+        cases.append(("batch: numpy", batch(array)))
+
+    print(f"{args.orders} orders, best of {args.repeat}")
+    print(f"{'mode':<26}{'us/order':>10}{'orders/s':>10}")
+    for label, fn in cases:
+        elapsed = best_of(args.repeat, fn)
+        print(f"{label:<26}{elapsed / args.orders * 1e6:>10.1f}{args.orders / elapsed:>10.0f}")
+
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Offline: skip the nextNonce REST lookups, nonces start at 0
+    nonce_manager.get_nonce_from_api = lambda client, account_index, api_key: 0
+
+    # SignerClient's ApiClient needs a running event loop
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Signing throughput: SignerClient.sign_create_order on the event loop thread vs
+sign_create_orders_async on 1..N worker threads.
+
+Also reports the worst event-loop stall seen by a 1ms ticker while a batch is
+being signed, which is what WebSocket readers sharing the loop experience.
+
+Runs offline: API keys are generated locally and nonces start at 0; nothing is
+submitted.
+
+Usage: python benchmarks/bench_signing.py [--orders 2000] [--keys 4] [--max-workers 8]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lighter import nonce_manager
+from lighter.signer_client import SignerClient, create_api_key
+
+URL = "https://mainnet.zklighter.elliot.ai"
+ACCOUNT_INDEX = 1
+
+
+def make_client(n_keys, workers):
+    keys = {}
+    for api_key_index in range(2, 2 + n_keys):
+        private_key, _, err = create_api_key()
+        if err is not None:
+            raise Exception(err)
+        keys[api_key_index] = private_key
+    return SignerClient(URL, ACCOUNT_INDEX, keys, signing_workers=workers)
+
+
+def make_orders(n):
+    return [
+        dict(
+            market_index=0,
+            client_order_index=i,
+            base_amount=10,
+            price=300000 + i % 100,
+            is_ask=bool(i % 2),
+            order_type=SignerClient.ORDER_TYPE_LIMIT,
+            time_in_force=SignerClient.ORDER_TIME_IN_FORCE_GOOD_TILL_TIME,
+        )
+        for i in range(n)
+    ]
+
+
+async def measure_stall(work):
+    """Run `work` while a 1ms ticker measures the longest event-loop stall."""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            t = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, time.perf_counter() - t - 0.001)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - t0
+    done = True
+    await task
+    return elapsed, worst
+
+
+async def bench(args):
+    orders = make_orders(args.orders)
+    print(f"{args.orders} orders, {args.keys} API key(s)")
+    print(f"{'mode':<14}{'signs/s':>10}{'us/sign':>10}{'max stall ms':>14}")
+
+    client = make_client(args.keys, 1)
+
+    async def inline():
+        for order in orders:
+            api_key_index, nonce = client.nonce_manager.next_nonce()
+            client.sign_create_order(**order, nonce=nonce, api_key_index=api_key_index)
+
+    elapsed, stall = await measure_stall(inline)
+    print(f"{'event loop':<14}{len(orders) / elapsed:>10.0f}{elapsed / len(orders) * 1e6:>10.1f}{stall * 1e3:>14.1f}")
+
+    for workers in range(1, args.max_workers + 1):
+        if client._signing_executor is not None:
+            client._signing_executor.shutdown()
+            client._signing_executor = None
+        client.signing_workers = workers
+
+        async def pooled():
+            results = await client.sign_create_orders_async(orders)
+            errors = [r[3] for r in results if r[3] is not None]
+            if errors:
+                raise Exception(errors[0])
+
+        await pooled()  # start the worker threads outside the measurement
+        elapsed, stall = await measure_stall(pooled)
+        label = f"{workers} worker(s)"
+        print(f"{label:<14}{len(orders) / elapsed:>10.0f}{elapsed / len(orders) * 1e6:>10.1f}{stall * 1e3:>14.1f}")
+
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--keys", type=int, default=4)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    # Offline: skip the nextNonce REST lookups, nonces start at 0
+    nonce_manager.get_nonce_from_api = lambda client, account_index, api_key: 0
+
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Memory and CPU of raw message dicts vs the ws_messages structs.
+
+Holds one order book snapshot per market both ways and reports the retained
+memory, the one-off decode cost, and the cost of reading best bid/ask (sort
+with float() per level vs integer fields).
+
+Usage: python benchmarks/bench_ws_messages.py [--markets 60] [--depth 250]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lighter import codec
+from lighter.ws_messages import WsMessageDecoder
+
+
+def snapshot_frame(market_id, depth):
+    mid = 1000 + market_id * 37.5
+    return json.dumps({
+        "type": "subscribed/order_book",
+        "channel": f"order_book:{market_id}",
+        "offset": 1,
+        "order_book": {
+            "code": 0,
+            "asks": [{"price": f"{mid + 0.01 * (i + 1):.2f}", "size": f"{0.5 + i:.4f}"} for i in range(depth)],
+            "bids": [{"price": f"{mid - 0.01 * (i + 1):.2f}", "size": f"{0.5 + i:.4f}"} for i in range(depth)],
+            "nonce": 1,
+        },
+    })
+
+
+def retained(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--markets", type=int, default=60)
+    parser.add_argument("--depth", type=int, default=250)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = [snapshot_frame(m, args.depth) for m in range(args.markets)]
+    decoder = WsMessageDecoder()
+
+    raw_books, raw_bytes = retained(lambda: [codec.loads(f) for f in frames])
+    typed_books, typed_bytes = retained(lambda: [decoder.decode(codec.loads(f)) for f in frames])
+
+    print(f"{args.markets} markets x {args.depth} levels per side, JSON backend: {codec.backend}")
+    print(f"{'':<10}{'held MB':>10}{'decode us':>12}{'top us':>10}")
+
+    t_raw = timeit.timeit(lambda: codec.loads(frames[0]), number=args.number) / args.number
+    t_typed = timeit.timeit(lambda: decoder.decode(codec.loads(frames[0])), number=args.number) / args.number
+
+    book = raw_books[0]["order_book"]
+
+    def raw_top():
+        bids = sorted(book["bids"], key=lambda x: float(x["price"]), reverse=True)
+        asks = sorted(book["asks"], key=lambda x: float(x["price"]))
+        return bids[0], asks[0]
+
+    typed = typed_books[0]
+
+    def typed_top():
+        return max(typed.bids, key=lambda level: level.price), min(typed.asks, key=lambda level: level.price)
+
+    top_raw = timeit.timeit(raw_top, number=args.number) / args.number
+    top_typed = timeit.timeit(typed_top, number=args.number) / args.number
+
+    print(f"{'dicts':<10}{raw_bytes / 1e6:>10.2f}{t_raw * 1e6:>12.1f}{top_raw * 1e6:>10.1f}")
+    print(f"{'structs':<10}{typed_bytes / 1e6:>10.2f}{t_typed * 1e6:>12.1f}{top_typed * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,20 +12,24 @@
 """  # noqa: E501
 
 
+import asyncio
 import datetime
+import logging
 from dateutil.parser import parse
 from enum import Enum
-import json
 import mimetypes
 import os
 import re
 import tempfile
+import typing
 
 from urllib.parse import quote
-from typing import Tuple, Optional, List, Dict, Union
-from pydantic import SecretStr
+from typing import Callable, Tuple, Optional, List, Dict, Union
+from pydantic import BaseModel, SecretStr
 
+from lighter import codec
 from lighter.configuration import Configuration
+from lighter.lazy_model import LazyModel, _field_kind
 from lighter.api_response import ApiResponse, T as ApiResponseT
 import lighter.models
 from lighter import rest
@@ -41,6 +45,104 @@ from lighter.exceptions import (
 
 RequestSerialized = Tuple[str, str, Dict[str, str], Optional[str], List[str]]
 
+logger = logging.getLogger(__name__)
+
+
+# model class -> key check for the model_validate fast path (see _model_deserializer)
+_key_checks: Dict[type, Optional[Callable[[dict], bool]]] = {}
+_PENDING = object()
+
+
+def _contains_model(annotation) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_contains_model(arg) for arg in typing.get_args(annotation))
+
+
+def _key_check(klass) -> Optional[Callable[[dict], bool]]:
+    """Build `check(obj)`: True when `klass.model_validate(obj)` gives what
+    `klass.from_dict(obj)` would, i.e. obj and its nested model dicts carry
+    every required field and no keys outside the model (which from_dict would
+    collect into additional_properties). None if the model's from_dict does
+    anything model_validate cannot reproduce.
+    """
+    check = _key_checks.get(klass)
+    if check is _PENDING:
+        # recursive model: resolve at call time
+        return lambda obj: (_key_checks[klass] or (lambda _: False))(obj)
+    if klass in _key_checks:
+        return check
+
+    _key_checks[klass] = _PENDING
+    _key_checks[klass] = check = _build_key_check(klass)
+    return check
+
+
+def _build_key_check(klass) -> Optional[Callable[[dict], bool]]:
+    properties = getattr(klass, f"_{klass.__name__}__properties", None)
+    fields = {name: field for name, field in klass.model_fields.items() if name != "additional_properties"}
+    if properties is None or set(properties) != set(fields):
+        return None
+
+    required = frozenset(name for name, field in fields.items() if field.is_required())
+    allowed = frozenset(fields)
+    nested = []
+    for name, field in fields.items():
+        if not field.is_required() and field.default is not None:
+            # from_dict substitutes the default for an explicit null
+            return None
+        kind, sub = _field_kind(field.annotation)
+        if kind == "value":
+            if _contains_model(field.annotation):
+                return None
+            continue
+        sub_check = _key_check(sub)
+        if sub_check is None:
+            return None
+        nested.append((name, kind, sub_check))
+
+    def check(obj) -> bool:
+        if not isinstance(obj, dict):
+            return False
+        keys = obj.keys()
+        if not required <= keys <= allowed:
+            return False
+        for name, kind, sub_check in nested:
+            value = obj.get(name)
+            if value is None:
+                continue
+            if kind == "model":
+                if not sub_check(value):
+                    return False
+            elif kind == "list":
+                for item in value:
+                    if not sub_check(item):
+                        return False
+            else:
+                for item in value.values():
+                    if not sub_check(item):
+                        return False
+        return True
+
+    return check
+
+
+def _model_deserializer(klass) -> Callable[[dict], BaseModel]:
+    """`klass.from_dict`, skipping its per-key additional_properties loop and
+    nested from_dict calls (one model_validate over the whole payload) when
+    the payload has no keys outside the model."""
+    check = _key_check(klass)
+    if check is None:
+        return klass.from_dict
+    validate = klass.model_validate
+    from_dict = klass.from_dict
+
+    def deserialize(data):
+        return validate(data) if check(data) else from_dict(data)
+
+    return deserialize
+
+
 class ApiClient:
     """Generic API client for OpenAPI client library builds.
 
@@ -55,6 +157,8 @@ class ApiClient:
         the API.
     :param cookie: a cookie to include in the header when making calls
         to the API
+    :param lazy_models: return LazyModel views that validate fields on
+        first access instead of fully built models
     """
 
     PRIMITIVE_TYPES = (float, bool, bytes, str, int)
@@ -75,7 +179,8 @@ class ApiClient:
         configuration=None,
         header_name=None,
         header_value=None,
-        cookie=None
+        cookie=None,
+        lazy_models=False
     ) -> None:
         # use default configuration if none is provided
         if configuration is None:
@@ -90,6 +195,11 @@ class ApiClient:
         # Set default User-Agent.
         self.user_agent = 'OpenAPI-Generator/1.0.0/python'
         self.client_side_validation = configuration.client_side_validation
+        # return LazyModel views that validate fields on first access
+        self.lazy_models = lazy_models
+        # response type string or class -> compiled deserializer
+        self._deserializers = {}
+        self._keepalive_task: Optional[asyncio.Task] = None
 
     async def __aenter__(self):
         return self
@@ -98,8 +208,50 @@ class ApiClient:
         await self.close()
 
     async def close(self):
+        self.stop_keepalive()
         await self.rest_client.close()
 
+    async def warmup(self, connections: int = 2) -> int:
+        """Pre-open `connections` pooled connections to the host, so the next
+        requests (e.g. send_tx) skip DNS, TCP and TLS setup.
+
+        Issues that many concurrent `RootApi.status` calls; each needs its
+        own connection and goes back to the pool when done. Returns how many
+        succeeded; failures are logged, not raised.
+        """
+        # imported here: lighter.api imports this module
+        from lighter.api.root_api import RootApi
+
+        root_api = RootApi(self)
+        results = await asyncio.gather(*(root_api.status() for _ in range(connections)), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            logger.warning(f"{len(errors)}/{connections} warmup requests failed: {errors[0]}")
+        return connections - len(errors)
+
+    def start_keepalive(self, interval: float = 15.0, connections: int = 2) -> None:
+        """Re-run `warmup(connections)` every `interval` seconds in the
+        background, so pooled connections are neither idled out by
+        `Configuration.keepalive_timeout` nor by the server. Stopped by
+        `stop_keepalive()` or `close()`."""
+        self.stop_keepalive()
+
+        async def keepalive():
+            while True:
+                await asyncio.sleep(interval)
+                await self.warmup(connections)
+
+        self._keepalive_task = asyncio.get_running_loop().create_task(keepalive())
+
+    def stop_keepalive(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+    def connection_stats(self) -> Dict[str, int]:
+        """See RESTClientObject.connection_stats."""
+        return self.rest_client.connection_stats()
+
     @property
     def user_agent(self):
         """User agent for this API client"""
@@ -399,14 +551,14 @@ class ApiClient:
         # fetch data from response object
         if content_type is None:
             try:
-                data = json.loads(response_text)
-            except ValueError:
+                data = codec.loads(response_text)
+            except codec.DecodeError:
                 data = response_text
         elif content_type.startswith("application/json"):
             if response_text == "":
                 data = ""
             else:
-                data = json.loads(response_text)
+                data = codec.loads(response_text)
         elif content_type.startswith("text/plain"):
             data = response_text
         else:
@@ -427,21 +579,31 @@ class ApiClient:
         """
         if data is None:
             return None
+        deserializer = self._deserializers.get(klass)
+        if deserializer is None:
+            deserializer = self._deserializers[klass] = self.__compile(klass)
+        return deserializer(data)
+
+    def __compile(self, klass):
+        """Resolves a type string or class once into a deserializer callable.
 
+        :param klass: class literal, or string of class name.
+        :return: callable taking non-None data.
+        """
         if isinstance(klass, str):
             if klass.startswith('List['):
                 m = re.match(r'List\[(.*)]', klass)
                 assert m is not None, "Malformed List type definition"
                 sub_kls = m.group(1)
-                return [self.__deserialize(sub_data, sub_kls)
-                        for sub_data in data]
+                deserialize = self.__deserialize
+                return lambda data: [deserialize(sub_data, sub_kls) for sub_data in data]
 
             if klass.startswith('Dict['):
                 m = re.match(r'Dict\[([^,]*), (.*)]', klass)
                 assert m is not None, "Malformed Dict type definition"
                 sub_kls = m.group(2)
-                return {k: self.__deserialize(v, sub_kls)
-                        for k, v in data.items()}
+                deserialize = self.__deserialize
+                return lambda data: {k: deserialize(v, sub_kls) for k, v in data.items()}
 
             # convert str to class
             if klass in self.NATIVE_TYPES_MAPPING:
@@ -450,17 +612,24 @@ class ApiClient:
                 klass = getattr(lighter.models, klass)
 
         if klass in self.PRIMITIVE_TYPES:
-            return self.__deserialize_primitive(data, klass)
+            return lambda data: self.__deserialize_primitive(data, klass)
         elif klass == object:
-            return self.__deserialize_object(data)
+            return self.__deserialize_object
         elif klass == datetime.date:
-            return self.__deserialize_date(data)
+            return self.__deserialize_date
         elif klass == datetime.datetime:
-            return self.__deserialize_datetime(data)
+            return self.__deserialize_datetime
         elif issubclass(klass, Enum):
-            return self.__deserialize_enum(data, klass)
+            return lambda data: self.__deserialize_enum(data, klass)
         else:
-            return self.__deserialize_model(data, klass)
+            from_dict = _model_deserializer(klass)
+
+            def deserialize_model(data):
+                if self.lazy_models and isinstance(data, dict):
+                    return LazyModel(klass, data)
+                return from_dict(data)
+
+            return deserialize_model
 
     def parameters_to_tuples(self, params, collection_formats):
         """Get parameters as list of tuples, formatting collections.
@@ -508,7 +677,7 @@ class ApiClient:
             if isinstance(v, (int, float)):
                 v = str(v)
             if isinstance(v, dict):
-                v = json.dumps(v)
+                v = codec.dumps(v)
 
             if k in collection_formats:
                 collection_format = collection_formats[k]
@@ -772,13 +941,3 @@ class ApiClient:
                     .format(data, klass)
                 )
             )
-
-    def __deserialize_model(self, data, klass):
-        """Deserializes list or dict to model.
-
-        :param data: dict, list.
-        :param klass: class literal.
-        :return: model object.
-        """
-
-        return klass.from_dict(data)
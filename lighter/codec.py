@@ -0,0 +1,82 @@
+"""JSON codec for the WebSocket and REST hot paths.
+
+Uses orjson, then msgspec, when installed, and falls back to the standard
+library. `LIGHTER_JSON=orjson|msgspec|json` or `set_backend()` forces one.
+Always call through the module (`codec.loads(...)`) so a backend switch is
+picked up everywhere.
+
+`dumps` returns `str` on every backend: WebSocket text frames must be str
+(bytes would go out as a binary frame). Catch `codec.DecodeError` for bad
+input; the backends raise different exception types.
+"""
+
+import json
+import os
+
+backend = None
+loads = json.loads
+dumps = json.dumps
+DecodeError = ValueError
+
+
+def _stdlib():
+    return json.loads, json.dumps, ValueError
+
+
+def _orjson():
+    import orjson
+
+    encode = orjson.dumps
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj):
+        return encode(obj, option=option).decode("utf-8")
+
+    return orjson.loads, dumps, orjson.JSONDecodeError
+
+
+def _msgspec():
+    import msgspec
+
+    encode = msgspec.json.encode
+
+    def dumps(obj):
+        return encode(obj).decode("utf-8")
+
+    return msgspec.json.decode, dumps, (msgspec.DecodeError, ValueError)
+
+
+_BACKENDS = {"orjson": _orjson, "msgspec": _msgspec, "json": _stdlib}
+
+
+def set_backend(name=None):
+    """Select a backend by name, or the fastest installed one when None."""
+    global backend, loads, dumps, DecodeError
+    names = [name] if name else ["orjson", "msgspec", "json"]
+    for candidate in names:
+        if candidate not in _BACKENDS:
+            raise ValueError(f"unknown JSON backend {candidate!r}, expected one of {sorted(_BACKENDS)}")
+        try:
+            loads, dumps, DecodeError = _BACKENDS[candidate]()
+        except ImportError:
+            if name:
+                raise
+            continue
+        backend = candidate
+        return backend
+
+
+def sendtx_frame(request_id: str, tx_type: int, tx_info: str) -> str:
+    """`jsonapi/sendtx` frame with the signer's tx_info JSON spliced in as-is.
+
+    tx_info comes straight from the signer library, so it is embedded without
+    the decode/encode round-trip of building the frame as a dict.
+    """
+    return (
+        '{"type":"jsonapi/sendtx","data":{"id":' + dumps(request_id)
+        + ',"tx_type":' + str(int(tx_type))
+        + ',"tx_info":' + tx_info + '}}'
+    )
+
+
+set_backend(os.environ.get("LIGHTER_JSON") or None)
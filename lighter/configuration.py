@@ -187,6 +187,16 @@ conf = lighter.Configuration(
            Default values is 100, None means no-limit.
         """
 
+        self.dns_cache_ttl = 300
+        """Seconds aiohttp caches resolved host addresses (aiohttp's default is
+           10, which puts a DNS lookup back on the path of most new
+           connections). None caches forever.
+        """
+        self.keepalive_timeout = 60.0
+        """Seconds an idle pooled connection is kept open (aiohttp's default is
+           15). See ApiClient.start_keepalive to keep connections from idling out.
+        """
+
         self.proxy: Optional[str] = None
         """Proxy URL
         """
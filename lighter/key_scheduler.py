@@ -0,0 +1,114 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class _KeyState:
+    __slots__ = ("last_use", "in_flight", "rejection_rate", "uses", "rejections")
+
+    def __init__(self):
+        self.last_use = float("-inf")
+        self.in_flight = 0
+        self.rejection_rate = 0.0  # EWMA of settled txs that were rejected
+        self.uses = 0
+        self.rejections = 0
+
+
+class ApiKeyScheduler:
+    """Chooses which API key the next transaction goes out on.
+
+    A key is ready `min_interval` seconds after its last use, stretched by
+    `rejection_penalty` times its recent rejection rate (an EWMA with weight
+    `rejection_alpha`), and only while it has fewer than `max_in_flight`
+    unsettled txs. `pick()` returns the ready key with the fewest txs in
+    flight, then the lowest rejection rate, then the longest idle. When no
+    key is ready it returns the one that frees up first, with the wait. A
+    key at the cap frees up on an ack, which has no known time; it counts
+    as ready in `max(min_interval, CAPPED_RETRY)`, so callers re-pick then.
+    """
+
+    # seconds until a key at max_in_flight is worth asking about again
+    CAPPED_RETRY = 0.01
+
+    def __init__(
+            self,
+            api_keys_list: List[int],
+            min_interval: float = 0.0,
+            max_in_flight: Optional[int] = None,
+            rejection_alpha: float = 0.2,
+            rejection_penalty: float = 4.0,
+    ):
+        self.min_interval = min_interval
+        self.max_in_flight = max_in_flight
+        self.rejection_alpha = rejection_alpha
+        self.rejection_penalty = rejection_penalty
+        self._keys: Dict[int, _KeyState] = {api_key: _KeyState() for api_key in api_keys_list}
+        self._lock = threading.Lock()
+
+    def ready_at(self, api_key: int, now: Optional[float] = None) -> float:
+        """time.monotonic() at which api_key may be used again."""
+        state = self._keys[api_key]
+        ready = state.last_use + self.min_interval * (1 + self.rejection_penalty * state.rejection_rate)
+        if self.max_in_flight is not None and state.in_flight >= self.max_in_flight:
+            # no ack to wait on here; retry shortly, never "ready now"
+            now = time.monotonic() if now is None else now
+            ready = max(ready, now + max(self.min_interval, self.CAPPED_RETRY))
+        return ready
+
+    def pick(self, now: Optional[float] = None) -> Tuple[int, float]:
+        """(api_key, seconds to wait before using it; 0 when it is ready)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            best, best_rank = None, None
+            for api_key, state in self._keys.items():
+                ready = self.ready_at(api_key, now)
+                rank = (max(ready, now), state.in_flight, state.rejection_rate, state.last_use)
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = api_key, rank
+            return best, best_rank[0] - now
+
+    def sent(self, api_key: int, count: int = 1, now: Optional[float] = None):
+        with self._lock:
+            state = self._keys[api_key]
+            state.last_use = time.monotonic() if now is None else now
+            state.in_flight += count
+            state.uses += count
+
+    def unsent(self, api_key: int, count: int = 1):
+        """Undo `sent` for txs that never went out (e.g. their nonce fetch
+        failed). The key keeps its last use, so it still cools down."""
+        with self._lock:
+            state = self._keys[api_key]
+            state.in_flight = max(0, state.in_flight - count)
+            state.uses = max(0, state.uses - count)
+
+    def settled(self, api_key: int, rejected: bool):
+        with self._lock:
+            state = self._keys[api_key]
+            state.in_flight = max(0, state.in_flight - 1)
+            state.rejection_rate += self.rejection_alpha * ((1.0 if rejected else 0.0) - state.rejection_rate)
+            if rejected:
+                state.rejections += 1
+
+    def reset(self, api_key: int):
+        """Forget txs in flight on api_key, e.g. after its nonce was resynced."""
+        with self._lock:
+            self._keys[api_key].in_flight = 0
+
+    def utilization(self) -> Dict[int, Dict]:
+        """Per-key uses, share of all uses, txs in flight, rejection rate and
+        the seconds until the key is ready."""
+        now = time.monotonic()
+        with self._lock:
+            total = sum(state.uses for state in self._keys.values()) or 1
+            return {
+                api_key: {
+                    "uses": state.uses,
+                    "share": state.uses / total,
+                    "in_flight": state.in_flight,
+                    "rejections": state.rejections,
+                    "rejection_rate": state.rejection_rate,
+                    "ready_in_s": max(0.0, self.ready_at(api_key, now) - now),
+                }
+                for api_key, state in self._keys.items()
+            }
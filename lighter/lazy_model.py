@@ -0,0 +1,124 @@
+"""Lazy views over API response JSON.
+
+With `ApiClient(lazy_models=True)` responses come back as `LazyModel` views
+over the decoded JSON instead of fully validated pydantic models. Nothing is
+validated up front: a field is checked against its model's annotation (field
+validators included) the first time it is read and cached from then on.
+Nested models, and lists or dicts of them, become views in turn, so reading
+`orders.asks[0].price` validates one field of one order rather than all 250.
+
+`to_model()` builds the regular pydantic model when a full, validated copy
+is needed; `to_dict()` returns the underlying JSON unchanged.
+"""
+
+import typing
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+_NONE = type(None)
+
+# model class -> {field name: (kind, nested model class, JSON key)}
+_plans: Dict[type, Dict[str, tuple]] = {}
+# model class -> JSON keys of its fields
+_json_keys: Dict[type, frozenset] = {}
+
+
+def _model_class(annotation):
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _field_kind(annotation) -> tuple:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union and _NONE in args:
+        rest = [a for a in args if a is not _NONE]
+        if len(rest) == 1:
+            return _field_kind(rest[0])
+    model = _model_class(annotation)
+    if model is not None:
+        return "model", model
+    if origin is list and args and _model_class(args[0]):
+        return "list", args[0]
+    if origin is dict and len(args) == 2 and _model_class(args[1]):
+        return "dict", args[1]
+    return "value", None
+
+
+def _plan(klass: type) -> Dict[str, tuple]:
+    plan = _plans.get(klass)
+    if plan is None:
+        # responses use the alias (e.g. "chainId" for chain_id) where there is one
+        plan = {
+            name: _field_kind(field.annotation) + (field.alias or name,)
+            for name, field in klass.model_fields.items()
+            if name != "additional_properties"
+        }
+        _plans[klass] = plan
+        _json_keys[klass] = frozenset(entry[2] for entry in plan.values())
+    return plan
+
+
+class LazyModel:
+    """Read-only view of `data` as an instance of `klass`."""
+
+    __slots__ = ("_klass", "_data", "_values", "_shell")
+
+    def __init__(self, klass: Type[BaseModel], data: Dict[str, Any]):
+        self._klass = klass
+        self._data = data
+        self._values = {}
+        self._shell = None
+
+    def __getattr__(self, name):
+        values = self._values
+        if name in values:
+            return values[name]
+        plan = _plan(self._klass)
+        if name not in plan:
+            if name == "additional_properties":
+                known = _json_keys[self._klass]
+                return {k: v for k, v in self._data.items() if k not in known}
+            raise AttributeError(f"{self._klass.__name__!r} has no field {name!r}")
+
+        kind, nested, key = plan[name]
+        raw = self._data.get(key)
+        if kind == "value" or raw is None:
+            # None still goes through validation so missing required fields raise
+            if self._shell is None:
+                self._shell = self._klass.model_construct()
+            self._klass.__pydantic_validator__.validate_assignment(self._shell, name, raw)
+            value = getattr(self._shell, name)
+        elif kind == "model":
+            value = LazyModel(nested, raw)
+        elif kind == "list":
+            value = [LazyModel(nested, item) for item in raw]
+        else:
+            value = {key: LazyModel(nested, item) for key, item in raw.items()}
+        values[name] = value
+        return value
+
+    def __setattr__(self, name, value):
+        if name in LazyModel.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            raise AttributeError("LazyModel views are read-only; use to_model() for a mutable copy")
+
+    def __dir__(self):
+        return list(_plan(self._klass)) + ["additional_properties", "to_model", "to_dict"]
+
+    def __repr__(self):
+        return f"LazyModel({self._klass.__name__})"
+
+    @property
+    def model_class(self) -> Type[BaseModel]:
+        return self._klass
+
+    def to_model(self) -> BaseModel:
+        """Fully validated pydantic model, as the eager client would return."""
+        return self._klass.from_dict(self._data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
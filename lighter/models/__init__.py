@@ -13,144 +13,313 @@
 """  # noqa: E501
 
 
-# import models into model package
-from lighter.models.account import Account
-from lighter.models.account_api_keys import AccountApiKeys
-from lighter.models.account_asset import AccountAsset
-from lighter.models.account_limits import AccountLimits
-from lighter.models.account_margin_stats import AccountMarginStats
-from lighter.models.account_market_stats import AccountMarketStats
-from lighter.models.account_metadata import AccountMetadata
-from lighter.models.account_metadatas import AccountMetadatas
-from lighter.models.account_pn_l import AccountPnL
-from lighter.models.account_position import AccountPosition
-from lighter.models.account_stats import AccountStats
-from lighter.models.account_trade_stats import AccountTradeStats
-from lighter.models.announcement import Announcement
-from lighter.models.announcements import Announcements
-from lighter.models.api_key import ApiKey
-from lighter.models.asset import Asset
-from lighter.models.asset_details import AssetDetails
-from lighter.models.block import Block
-from lighter.models.blocks import Blocks
-from lighter.models.bridge import Bridge
-from lighter.models.bridge_supported_network import BridgeSupportedNetwork
-from lighter.models.candlestick import Candlestick
-from lighter.models.candlesticks import Candlesticks
-from lighter.models.contract_address import ContractAddress
-from lighter.models.current_height import CurrentHeight
-from lighter.models.cursor import Cursor
-from lighter.models.daily_return import DailyReturn
-from lighter.models.deposit_history import DepositHistory
-from lighter.models.deposit_history_item import DepositHistoryItem
-from lighter.models.detailed_account import DetailedAccount
-from lighter.models.detailed_accounts import DetailedAccounts
-from lighter.models.detailed_candlestick import DetailedCandlestick
-from lighter.models.enriched_tx import EnrichedTx
-from lighter.models.exchange_stats import ExchangeStats
-from lighter.models.export_data import ExportData
-from lighter.models.funding import Funding
-from lighter.models.funding_rate import FundingRate
-from lighter.models.funding_rates import FundingRates
-from lighter.models.fundings import Fundings
-from lighter.models.l1_metadata import L1Metadata
-from lighter.models.l1_provider_info import L1ProviderInfo
-from lighter.models.liq_trade import LiqTrade
-from lighter.models.liquidation import Liquidation
-from lighter.models.liquidation_info import LiquidationInfo
-from lighter.models.liquidation_infos import LiquidationInfos
-from lighter.models.market_config import MarketConfig
-from lighter.models.next_nonce import NextNonce
-from lighter.models.order import Order
-from lighter.models.order_book import OrderBook
-from lighter.models.order_book_depth import OrderBookDepth
-from lighter.models.order_book_details import OrderBookDetails
-from lighter.models.order_book_orders import OrderBookOrders
-from lighter.models.order_book_stats import OrderBookStats
-from lighter.models.order_books import OrderBooks
-from lighter.models.orders import Orders
-from lighter.models.perps_market_stats import PerpsMarketStats
-from lighter.models.perps_order_book_detail import PerpsOrderBookDetail
-from lighter.models.pn_l_entry import PnLEntry
-from lighter.models.position_funding import PositionFunding
-from lighter.models.position_fundings import PositionFundings
-from lighter.models.price_level import PriceLevel
-from lighter.models.public_pool_info import PublicPoolInfo
-from lighter.models.public_pool_metadata import PublicPoolMetadata
-from lighter.models.public_pool_share import PublicPoolShare
-from lighter.models.referral_point_entry import ReferralPointEntry
-from lighter.models.referral_points import ReferralPoints
-from lighter.models.req_export_data import ReqExportData
-from lighter.models.req_get_account import ReqGetAccount
-from lighter.models.req_get_account_active_orders import ReqGetAccountActiveOrders
-from lighter.models.req_get_account_api_keys import ReqGetAccountApiKeys
-from lighter.models.req_get_account_by_l1_address import ReqGetAccountByL1Address
-from lighter.models.req_get_account_inactive_orders import ReqGetAccountInactiveOrders
-from lighter.models.req_get_account_limits import ReqGetAccountLimits
-from lighter.models.req_get_account_metadata import ReqGetAccountMetadata
-from lighter.models.req_get_account_pn_l import ReqGetAccountPnL
-from lighter.models.req_get_account_txs import ReqGetAccountTxs
-from lighter.models.req_get_asset_details import ReqGetAssetDetails
-from lighter.models.req_get_block import ReqGetBlock
-from lighter.models.req_get_block_txs import ReqGetBlockTxs
-from lighter.models.req_get_bridges_by_l1_addr import ReqGetBridgesByL1Addr
-from lighter.models.req_get_by_account import ReqGetByAccount
-from lighter.models.req_get_candlesticks import ReqGetCandlesticks
-from lighter.models.req_get_deposit_history import ReqGetDepositHistory
-from lighter.models.req_get_fast_withdraw_info import ReqGetFastWithdrawInfo
-from lighter.models.req_get_fundings import ReqGetFundings
-from lighter.models.req_get_l1_metadata import ReqGetL1Metadata
-from lighter.models.req_get_l1_tx import ReqGetL1Tx
-from lighter.models.req_get_latest_deposit import ReqGetLatestDeposit
-from lighter.models.req_get_liquidation_infos import ReqGetLiquidationInfos
-from lighter.models.req_get_next_nonce import ReqGetNextNonce
-from lighter.models.req_get_order_book_details import ReqGetOrderBookDetails
-from lighter.models.req_get_order_book_orders import ReqGetOrderBookOrders
-from lighter.models.req_get_order_books import ReqGetOrderBooks
-from lighter.models.req_get_position_funding import ReqGetPositionFunding
-from lighter.models.req_get_public_pools_metadata import ReqGetPublicPoolsMetadata
-from lighter.models.req_get_range_with_cursor import ReqGetRangeWithCursor
-from lighter.models.req_get_range_with_index import ReqGetRangeWithIndex
-from lighter.models.req_get_range_with_index_sortable import ReqGetRangeWithIndexSortable
-from lighter.models.req_get_recent_trades import ReqGetRecentTrades
-from lighter.models.req_get_referral_points import ReqGetReferralPoints
-from lighter.models.req_get_trades import ReqGetTrades
-from lighter.models.req_get_transfer_fee_info import ReqGetTransferFeeInfo
-from lighter.models.req_get_transfer_history import ReqGetTransferHistory
-from lighter.models.req_get_tx import ReqGetTx
-from lighter.models.req_get_withdraw_history import ReqGetWithdrawHistory
-from lighter.models.resp_change_account_tier import RespChangeAccountTier
-from lighter.models.resp_get_bridges_by_l1_addr import RespGetBridgesByL1Addr
-from lighter.models.resp_get_fast_bridge_info import RespGetFastBridgeInfo
-from lighter.models.resp_get_is_next_bridge_fast import RespGetIsNextBridgeFast
-from lighter.models.resp_public_pools_metadata import RespPublicPoolsMetadata
-from lighter.models.resp_send_tx import RespSendTx
-from lighter.models.resp_send_tx_batch import RespSendTxBatch
-from lighter.models.resp_update_kickback import RespUpdateKickback
-from lighter.models.resp_update_referral_code import RespUpdateReferralCode
-from lighter.models.resp_withdrawal_delay import RespWithdrawalDelay
-from lighter.models.result_code import ResultCode
-from lighter.models.risk_info import RiskInfo
-from lighter.models.risk_parameters import RiskParameters
-from lighter.models.share_price import SharePrice
-from lighter.models.simple_order import SimpleOrder
-from lighter.models.spot_market_stats import SpotMarketStats
-from lighter.models.spot_order_book_detail import SpotOrderBookDetail
-from lighter.models.status import Status
-from lighter.models.sub_accounts import SubAccounts
-from lighter.models.ticker import Ticker
-from lighter.models.trade import Trade
-from lighter.models.trades import Trades
-from lighter.models.transfer_fee_info import TransferFeeInfo
-from lighter.models.transfer_history import TransferHistory
-from lighter.models.transfer_history_item import TransferHistoryItem
-from lighter.models.tx import Tx
-from lighter.models.tx_hash import TxHash
-from lighter.models.tx_hashes import TxHashes
-from lighter.models.txs import Txs
-from lighter.models.validator_info import ValidatorInfo
-from lighter.models.withdraw_history import WithdrawHistory
-from lighter.models.withdraw_history_item import WithdrawHistoryItem
-from lighter.models.zk_lighter_info import ZkLighterInfo
+import importlib
+import typing
 
-from lighter.models.ws_account_assets import WSAccountAssets
\ No newline at end of file
+# Models are imported on first attribute access (PEP 562), so importing the
+# package does not build every pydantic model schema up front.
+# name -> module it is defined in
+_lazy_imports = {
+    "Account": "lighter.models.account",
+    "AccountApiKeys": "lighter.models.account_api_keys",
+    "AccountAsset": "lighter.models.account_asset",
+    "AccountLimits": "lighter.models.account_limits",
+    "AccountMarginStats": "lighter.models.account_margin_stats",
+    "AccountMarketStats": "lighter.models.account_market_stats",
+    "AccountMetadata": "lighter.models.account_metadata",
+    "AccountMetadatas": "lighter.models.account_metadatas",
+    "AccountPnL": "lighter.models.account_pn_l",
+    "AccountPosition": "lighter.models.account_position",
+    "AccountStats": "lighter.models.account_stats",
+    "AccountTradeStats": "lighter.models.account_trade_stats",
+    "Announcement": "lighter.models.announcement",
+    "Announcements": "lighter.models.announcements",
+    "ApiKey": "lighter.models.api_key",
+    "Asset": "lighter.models.asset",
+    "AssetDetails": "lighter.models.asset_details",
+    "Block": "lighter.models.block",
+    "Blocks": "lighter.models.blocks",
+    "Bridge": "lighter.models.bridge",
+    "BridgeSupportedNetwork": "lighter.models.bridge_supported_network",
+    "Candlestick": "lighter.models.candlestick",
+    "Candlesticks": "lighter.models.candlesticks",
+    "ContractAddress": "lighter.models.contract_address",
+    "CurrentHeight": "lighter.models.current_height",
+    "Cursor": "lighter.models.cursor",
+    "DailyReturn": "lighter.models.daily_return",
+    "DepositHistory": "lighter.models.deposit_history",
+    "DepositHistoryItem": "lighter.models.deposit_history_item",
+    "DetailedAccount": "lighter.models.detailed_account",
+    "DetailedAccounts": "lighter.models.detailed_accounts",
+    "DetailedCandlestick": "lighter.models.detailed_candlestick",
+    "EnrichedTx": "lighter.models.enriched_tx",
+    "ExchangeStats": "lighter.models.exchange_stats",
+    "ExportData": "lighter.models.export_data",
+    "Funding": "lighter.models.funding",
+    "FundingRate": "lighter.models.funding_rate",
+    "FundingRates": "lighter.models.funding_rates",
+    "Fundings": "lighter.models.fundings",
+    "L1Metadata": "lighter.models.l1_metadata",
+    "L1ProviderInfo": "lighter.models.l1_provider_info",
+    "LiqTrade": "lighter.models.liq_trade",
+    "Liquidation": "lighter.models.liquidation",
+    "LiquidationInfo": "lighter.models.liquidation_info",
+    "LiquidationInfos": "lighter.models.liquidation_infos",
+    "MarketConfig": "lighter.models.market_config",
+    "NextNonce": "lighter.models.next_nonce",
+    "Order": "lighter.models.order",
+    "OrderBook": "lighter.models.order_book",
+    "OrderBookDepth": "lighter.models.order_book_depth",
+    "OrderBookDetails": "lighter.models.order_book_details",
+    "OrderBookOrders": "lighter.models.order_book_orders",
+    "OrderBookStats": "lighter.models.order_book_stats",
+    "OrderBooks": "lighter.models.order_books",
+    "Orders": "lighter.models.orders",
+    "PerpsMarketStats": "lighter.models.perps_market_stats",
+    "PerpsOrderBookDetail": "lighter.models.perps_order_book_detail",
+    "PnLEntry": "lighter.models.pn_l_entry",
+    "PositionFunding": "lighter.models.position_funding",
+    "PositionFundings": "lighter.models.position_fundings",
+    "PriceLevel": "lighter.models.price_level",
+    "PublicPoolInfo": "lighter.models.public_pool_info",
+    "PublicPoolMetadata": "lighter.models.public_pool_metadata",
+    "PublicPoolShare": "lighter.models.public_pool_share",
+    "ReferralPointEntry": "lighter.models.referral_point_entry",
+    "ReferralPoints": "lighter.models.referral_points",
+    "ReqExportData": "lighter.models.req_export_data",
+    "ReqGetAccount": "lighter.models.req_get_account",
+    "ReqGetAccountActiveOrders": "lighter.models.req_get_account_active_orders",
+    "ReqGetAccountApiKeys": "lighter.models.req_get_account_api_keys",
+    "ReqGetAccountByL1Address": "lighter.models.req_get_account_by_l1_address",
+    "ReqGetAccountInactiveOrders": "lighter.models.req_get_account_inactive_orders",
+    "ReqGetAccountLimits": "lighter.models.req_get_account_limits",
+    "ReqGetAccountMetadata": "lighter.models.req_get_account_metadata",
+    "ReqGetAccountPnL": "lighter.models.req_get_account_pn_l",
+    "ReqGetAccountTxs": "lighter.models.req_get_account_txs",
+    "ReqGetAssetDetails": "lighter.models.req_get_asset_details",
+    "ReqGetBlock": "lighter.models.req_get_block",
+    "ReqGetBlockTxs": "lighter.models.req_get_block_txs",
+    "ReqGetBridgesByL1Addr": "lighter.models.req_get_bridges_by_l1_addr",
+    "ReqGetByAccount": "lighter.models.req_get_by_account",
+    "ReqGetCandlesticks": "lighter.models.req_get_candlesticks",
+    "ReqGetDepositHistory": "lighter.models.req_get_deposit_history",
+    "ReqGetFastWithdrawInfo": "lighter.models.req_get_fast_withdraw_info",
+    "ReqGetFundings": "lighter.models.req_get_fundings",
+    "ReqGetL1Metadata": "lighter.models.req_get_l1_metadata",
+    "ReqGetL1Tx": "lighter.models.req_get_l1_tx",
+    "ReqGetLatestDeposit": "lighter.models.req_get_latest_deposit",
+    "ReqGetLiquidationInfos": "lighter.models.req_get_liquidation_infos",
+    "ReqGetNextNonce": "lighter.models.req_get_next_nonce",
+    "ReqGetOrderBookDetails": "lighter.models.req_get_order_book_details",
+    "ReqGetOrderBookOrders": "lighter.models.req_get_order_book_orders",
+    "ReqGetOrderBooks": "lighter.models.req_get_order_books",
+    "ReqGetPositionFunding": "lighter.models.req_get_position_funding",
+    "ReqGetPublicPoolsMetadata": "lighter.models.req_get_public_pools_metadata",
+    "ReqGetRangeWithCursor": "lighter.models.req_get_range_with_cursor",
+    "ReqGetRangeWithIndex": "lighter.models.req_get_range_with_index",
+    "ReqGetRangeWithIndexSortable": "lighter.models.req_get_range_with_index_sortable",
+    "ReqGetRecentTrades": "lighter.models.req_get_recent_trades",
+    "ReqGetReferralPoints": "lighter.models.req_get_referral_points",
+    "ReqGetTrades": "lighter.models.req_get_trades",
+    "ReqGetTransferFeeInfo": "lighter.models.req_get_transfer_fee_info",
+    "ReqGetTransferHistory": "lighter.models.req_get_transfer_history",
+    "ReqGetTx": "lighter.models.req_get_tx",
+    "ReqGetWithdrawHistory": "lighter.models.req_get_withdraw_history",
+    "RespChangeAccountTier": "lighter.models.resp_change_account_tier",
+    "RespGetBridgesByL1Addr": "lighter.models.resp_get_bridges_by_l1_addr",
+    "RespGetFastBridgeInfo": "lighter.models.resp_get_fast_bridge_info",
+    "RespGetIsNextBridgeFast": "lighter.models.resp_get_is_next_bridge_fast",
+    "RespPublicPoolsMetadata": "lighter.models.resp_public_pools_metadata",
+    "RespSendTx": "lighter.models.resp_send_tx",
+    "RespSendTxBatch": "lighter.models.resp_send_tx_batch",
+    "RespUpdateKickback": "lighter.models.resp_update_kickback",
+    "RespUpdateReferralCode": "lighter.models.resp_update_referral_code",
+    "RespWithdrawalDelay": "lighter.models.resp_withdrawal_delay",
+    "ResultCode": "lighter.models.result_code",
+    "RiskInfo": "lighter.models.risk_info",
+    "RiskParameters": "lighter.models.risk_parameters",
+    "SharePrice": "lighter.models.share_price",
+    "SimpleOrder": "lighter.models.simple_order",
+    "SpotMarketStats": "lighter.models.spot_market_stats",
+    "SpotOrderBookDetail": "lighter.models.spot_order_book_detail",
+    "Status": "lighter.models.status",
+    "SubAccounts": "lighter.models.sub_accounts",
+    "Ticker": "lighter.models.ticker",
+    "Trade": "lighter.models.trade",
+    "Trades": "lighter.models.trades",
+    "TransferFeeInfo": "lighter.models.transfer_fee_info",
+    "TransferHistory": "lighter.models.transfer_history",
+    "TransferHistoryItem": "lighter.models.transfer_history_item",
+    "Tx": "lighter.models.tx",
+    "TxHash": "lighter.models.tx_hash",
+    "TxHashes": "lighter.models.tx_hashes",
+    "Txs": "lighter.models.txs",
+    "ValidatorInfo": "lighter.models.validator_info",
+    "WithdrawHistory": "lighter.models.withdraw_history",
+    "WithdrawHistoryItem": "lighter.models.withdraw_history_item",
+    "ZkLighterInfo": "lighter.models.zk_lighter_info",
+    "WSAccountAssets": "lighter.models.ws_account_assets",
+}
+
+__all__ = list(_lazy_imports)
+
+if typing.TYPE_CHECKING:
+    from lighter.models.account import Account
+    from lighter.models.account_api_keys import AccountApiKeys
+    from lighter.models.account_asset import AccountAsset
+    from lighter.models.account_limits import AccountLimits
+    from lighter.models.account_margin_stats import AccountMarginStats
+    from lighter.models.account_market_stats import AccountMarketStats
+    from lighter.models.account_metadata import AccountMetadata
+    from lighter.models.account_metadatas import AccountMetadatas
+    from lighter.models.account_pn_l import AccountPnL
+    from lighter.models.account_position import AccountPosition
+    from lighter.models.account_stats import AccountStats
+    from lighter.models.account_trade_stats import AccountTradeStats
+    from lighter.models.announcement import Announcement
+    from lighter.models.announcements import Announcements
+    from lighter.models.api_key import ApiKey
+    from lighter.models.asset import Asset
+    from lighter.models.asset_details import AssetDetails
+    from lighter.models.block import Block
+    from lighter.models.blocks import Blocks
+    from lighter.models.bridge import Bridge
+    from lighter.models.bridge_supported_network import BridgeSupportedNetwork
+    from lighter.models.candlestick import Candlestick
+    from lighter.models.candlesticks import Candlesticks
+    from lighter.models.contract_address import ContractAddress
+    from lighter.models.current_height import CurrentHeight
+    from lighter.models.cursor import Cursor
+    from lighter.models.daily_return import DailyReturn
+    from lighter.models.deposit_history import DepositHistory
+    from lighter.models.deposit_history_item import DepositHistoryItem
+    from lighter.models.detailed_account import DetailedAccount
+    from lighter.models.detailed_accounts import DetailedAccounts
+    from lighter.models.detailed_candlestick import DetailedCandlestick
+    from lighter.models.enriched_tx import EnrichedTx
+    from lighter.models.exchange_stats import ExchangeStats
+    from lighter.models.export_data import ExportData
+    from lighter.models.funding import Funding
+    from lighter.models.funding_rate import FundingRate
+    from lighter.models.funding_rates import FundingRates
+    from lighter.models.fundings import Fundings
+    from lighter.models.l1_metadata import L1Metadata
+    from lighter.models.l1_provider_info import L1ProviderInfo
+    from lighter.models.liq_trade import LiqTrade
+    from lighter.models.liquidation import Liquidation
+    from lighter.models.liquidation_info import LiquidationInfo
+    from lighter.models.liquidation_infos import LiquidationInfos
+    from lighter.models.market_config import MarketConfig
+    from lighter.models.next_nonce import NextNonce
+    from lighter.models.order import Order
+    from lighter.models.order_book import OrderBook
+    from lighter.models.order_book_depth import OrderBookDepth
+    from lighter.models.order_book_details import OrderBookDetails
+    from lighter.models.order_book_orders import OrderBookOrders
+    from lighter.models.order_book_stats import OrderBookStats
+    from lighter.models.order_books import OrderBooks
+    from lighter.models.orders import Orders
+    from lighter.models.perps_market_stats import PerpsMarketStats
+    from lighter.models.perps_order_book_detail import PerpsOrderBookDetail
+    from lighter.models.pn_l_entry import PnLEntry
+    from lighter.models.position_funding import PositionFunding
+    from lighter.models.position_fundings import PositionFundings
+    from lighter.models.price_level import PriceLevel
+    from lighter.models.public_pool_info import PublicPoolInfo
+    from lighter.models.public_pool_metadata import PublicPoolMetadata
+    from lighter.models.public_pool_share import PublicPoolShare
+    from lighter.models.referral_point_entry import ReferralPointEntry
+    from lighter.models.referral_points import ReferralPoints
+    from lighter.models.req_export_data import ReqExportData
+    from lighter.models.req_get_account import ReqGetAccount
+    from lighter.models.req_get_account_active_orders import ReqGetAccountActiveOrders
+    from lighter.models.req_get_account_api_keys import ReqGetAccountApiKeys
+    from lighter.models.req_get_account_by_l1_address import ReqGetAccountByL1Address
+    from lighter.models.req_get_account_inactive_orders import ReqGetAccountInactiveOrders
+    from lighter.models.req_get_account_limits import ReqGetAccountLimits
+    from lighter.models.req_get_account_metadata import ReqGetAccountMetadata
+    from lighter.models.req_get_account_pn_l import ReqGetAccountPnL
+    from lighter.models.req_get_account_txs import ReqGetAccountTxs
+    from lighter.models.req_get_asset_details import ReqGetAssetDetails
+    from lighter.models.req_get_block import ReqGetBlock
+    from lighter.models.req_get_block_txs import ReqGetBlockTxs
+    from lighter.models.req_get_bridges_by_l1_addr import ReqGetBridgesByL1Addr
+    from lighter.models.req_get_by_account import ReqGetByAccount
+    from lighter.models.req_get_candlesticks import ReqGetCandlesticks
+    from lighter.models.req_get_deposit_history import ReqGetDepositHistory
+    from lighter.models.req_get_fast_withdraw_info import ReqGetFastWithdrawInfo
+    from lighter.models.req_get_fundings import ReqGetFundings
+    from lighter.models.req_get_l1_metadata import ReqGetL1Metadata
+    from lighter.models.req_get_l1_tx import ReqGetL1Tx
+    from lighter.models.req_get_latest_deposit import ReqGetLatestDeposit
+    from lighter.models.req_get_liquidation_infos import ReqGetLiquidationInfos
+    from lighter.models.req_get_next_nonce import ReqGetNextNonce
+    from lighter.models.req_get_order_book_details import ReqGetOrderBookDetails
+    from lighter.models.req_get_order_book_orders import ReqGetOrderBookOrders
+    from lighter.models.req_get_order_books import ReqGetOrderBooks
+    from lighter.models.req_get_position_funding import ReqGetPositionFunding
+    from lighter.models.req_get_public_pools_metadata import ReqGetPublicPoolsMetadata
+    from lighter.models.req_get_range_with_cursor import ReqGetRangeWithCursor
+    from lighter.models.req_get_range_with_index import ReqGetRangeWithIndex
+    from lighter.models.req_get_range_with_index_sortable import ReqGetRangeWithIndexSortable
+    from lighter.models.req_get_recent_trades import ReqGetRecentTrades
+    from lighter.models.req_get_referral_points import ReqGetReferralPoints
+    from lighter.models.req_get_trades import ReqGetTrades
+    from lighter.models.req_get_transfer_fee_info import ReqGetTransferFeeInfo
+    from lighter.models.req_get_transfer_history import ReqGetTransferHistory
+    from lighter.models.req_get_tx import ReqGetTx
+    from lighter.models.req_get_withdraw_history import ReqGetWithdrawHistory
+    from lighter.models.resp_change_account_tier import RespChangeAccountTier
+    from lighter.models.resp_get_bridges_by_l1_addr import RespGetBridgesByL1Addr
+    from lighter.models.resp_get_fast_bridge_info import RespGetFastBridgeInfo
+    from lighter.models.resp_get_is_next_bridge_fast import RespGetIsNextBridgeFast
+    from lighter.models.resp_public_pools_metadata import RespPublicPoolsMetadata
+    from lighter.models.resp_send_tx import RespSendTx
+    from lighter.models.resp_send_tx_batch import RespSendTxBatch
+    from lighter.models.resp_update_kickback import RespUpdateKickback
+    from lighter.models.resp_update_referral_code import RespUpdateReferralCode
+    from lighter.models.resp_withdrawal_delay import RespWithdrawalDelay
+    from lighter.models.result_code import ResultCode
+    from lighter.models.risk_info import RiskInfo
+    from lighter.models.risk_parameters import RiskParameters
+    from lighter.models.share_price import SharePrice
+    from lighter.models.simple_order import SimpleOrder
+    from lighter.models.spot_market_stats import SpotMarketStats
+    from lighter.models.spot_order_book_detail import SpotOrderBookDetail
+    from lighter.models.status import Status
+    from lighter.models.sub_accounts import SubAccounts
+    from lighter.models.ticker import Ticker
+    from lighter.models.trade import Trade
+    from lighter.models.trades import Trades
+    from lighter.models.transfer_fee_info import TransferFeeInfo
+    from lighter.models.transfer_history import TransferHistory
+    from lighter.models.transfer_history_item import TransferHistoryItem
+    from lighter.models.tx import Tx
+    from lighter.models.tx_hash import TxHash
+    from lighter.models.tx_hashes import TxHashes
+    from lighter.models.txs import Txs
+    from lighter.models.validator_info import ValidatorInfo
+    from lighter.models.withdraw_history import WithdrawHistory
+    from lighter.models.withdraw_history_item import WithdrawHistoryItem
+    from lighter.models.zk_lighter_info import ZkLighterInfo
+
+    from lighter.models.ws_account_assets import WSAccountAssets
+
+
+def __getattr__(name):
+    module = _lazy_imports.get(name)
+    if module is None:
+        # submodules such as `lighter.api` used to be bound by the eager imports
+        try:
+            return importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports))
@@ -1,16 +1,35 @@
 import abc
+import asyncio
+import collections
 import enum
-from typing import Optional, Tuple, List
-
-import requests
+import heapq
+import logging
+import re
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple, List
 
 from lighter.api_client import ApiClient
 from lighter.errors import ValidationError
+from lighter.key_scheduler import ApiKeyScheduler
+from lighter import sessions
+
+logger = logging.getLogger(__name__)
+
+_EXPECTED_NONCE = re.compile(r"expected(?: nonce)?\W*(\d+)", re.IGNORECASE)
+
+
+def expected_nonce_from_error(message: Optional[str]) -> Optional[int]:
+    """The nonce the exchange asked for in an invalid nonce error, if it named one."""
+    if not message:
+        return None
+    match = _EXPECTED_NONCE.search(message)
+    return int(match.group(1)) if match else None
 
 
 def get_nonce_from_api(client: ApiClient, account_index: int, api_key: int) -> int:
-    #  uses request to avoid async initialization
-    req = requests.get(
+    #  uses request to avoid async initialization, on the pooled session shared process-wide
+    req = sessions.sync_session().get(
         client.configuration.host + "/api/v1/nextNonce",
         params={"account_index": account_index, "api_key_index": api_key},
     )
@@ -19,69 +38,310 @@ def get_nonce_from_api(client: ApiClient, account_index: int, api_key: int) -> i
     return req.json()["nonce"]
 
 
+async def get_nonce_from_api_async(client: ApiClient, account_index: int, api_key: int) -> int:
+    # imported here so that importing the nonce manager stays cheap
+    from lighter.api.transaction_api import TransactionApi
+
+    response = await TransactionApi(client).next_nonce(account_index=account_index, api_key_index=api_key)
+    return response.nonce
+
+
+async def fetch_nonces(client: ApiClient, account_index: int, api_keys_list: List[int]) -> Dict[int, int]:
+    """Next nonce for every key, fetched concurrently on the client's aiohttp session."""
+    nonces = await asyncio.gather(*(
+        get_nonce_from_api_async(client, account_index, api_key) for api_key in api_keys_list
+    ))
+    return dict(zip(api_keys_list, nonces))
+
+
 class NonceManager(abc.ABC):
+    # seconds before a key is reused, see ApiKeyScheduler
+    MIN_KEY_INTERVAL = 0.0
+    # whether nonce[] drives what is handed out, so a rejection needs a repair
+    TRACKS_NONCES = True
+
     def __init__(
             self,
             account_index: int,
             api_client: ApiClient,
             api_keys_list: List[int],
+            nonces: Optional[Dict[int, int]] = None,
+            scheduler: Optional[ApiKeyScheduler] = None,
     ):
+        """`nonces` maps api key -> next nonce as returned by the API, for keys
+        already fetched elsewhere (e.g. concurrently by SignerClient.warmup);
+        the rest are fetched here. `scheduler` picks the key when none is
+        given; by default one with MIN_KEY_INTERVAL between uses of a key."""
         if len(api_keys_list) == 0:
             raise ValidationError(f"No API Key provided")
 
-        self.current = 0  # cycle through api keys
+        self.scheduler = scheduler or ApiKeyScheduler(api_keys_list, min_interval=self.MIN_KEY_INTERVAL)
         self.account_index = account_index
         self.api_client = api_client
         self.api_keys_list = api_keys_list
+        nonces = nonces or {}
         self.nonce = {
-            api_keys_list[i]: get_nonce_from_api(api_client, account_index, api_keys_list[i]) - 1
-            for i in range(len(api_keys_list))
+            api_key: (nonces[api_key] if api_key in nonces else get_nonce_from_api(api_client, account_index, api_key)) - 1
+            for api_key in api_keys_list
+        }
+        # highest nonce per key the exchange is known to have accepted
+        self.confirmed: Dict[int, int] = dict(self.nonce)
+        self._repaired_from_ack: Set[int] = set()
+        self._refresh_tasks: Dict[int, asyncio.Task] = {}
+        self.recovery_counts = {
+            "invalid_nonce": 0, "from_payload": 0, "from_acks": 0, "background_refresh": 0, "refresh_errors": 0,
+        }
+        self.recovery_ms = {
+            "local": collections.deque(maxlen=1000), "background_refresh": collections.deque(maxlen=1000),
         }
 
     def refresh_nonce(self, api_key: int) -> int:
-        self.nonce[api_key] = get_nonce_from_api(self.api_client, self.account_index, api_key)
-        return self.nonce[api_key]
+        return self._resync(api_key, get_nonce_from_api(self.api_client, self.account_index, api_key))
 
     def hard_refresh_nonce(self, api_key: int):
-        self.nonce[api_key] = get_nonce_from_api(self.api_client, self.account_index, api_key) - 1
+        self._resync(api_key, get_nonce_from_api(self.api_client, self.account_index, api_key) - 1)
+
+    async def refresh_nonce_async(self, api_key: int) -> int:
+        return self._resync(api_key, await get_nonce_from_api_async(self.api_client, self.account_index, api_key))
+
+    async def hard_refresh_nonce_async(self, api_key: int):
+        self._resync(api_key, await get_nonce_from_api_async(self.api_client, self.account_index, api_key) - 1)
+
+    def _resync(self, api_key: int, last_used: int) -> int:
+        """Adopt a nonce from the API as the last one handed out for api_key."""
+        self.nonce[api_key] = last_used
+        self.scheduler.reset(api_key)
+        return last_used
+
+    def recover_nonce(self, api_key: int, error: Optional[str] = None) -> None:
+        """Repair api_key after an invalid nonce rejection without blocking.
+
+        Uses the nonce named in the error payload if there is one, else the
+        highest nonce acknowledged on the key. If that was already tried and
+        the key was rejected again before any success, or there is nothing
+        to go on, a REST refresh runs as a background task on the loop (one
+        per key at a time). Call after `acknowledge_failure` for the nonce.
+        """
+        start = time.perf_counter()
+        self.recovery_counts["invalid_nonce"] += 1
+        if not self.TRACKS_NONCES:
+            return
+
+        expected = expected_nonce_from_error(error)
+        if expected is not None:
+            self._resync(api_key, expected - 1)
+            self._confirm(api_key, expected - 1)
+            self.recovery_counts["from_payload"] += 1
+        elif api_key in self.confirmed and api_key not in self._repaired_from_ack:
+            self._resync(api_key, self.confirmed[api_key])
+            self._repaired_from_ack.add(api_key)
+            self.recovery_counts["from_acks"] += 1
+        else:
+            self._schedule_refresh(api_key)
+            return
+        self.recovery_ms["local"].append((time.perf_counter() - start) * 1e3)
+
+    def _schedule_refresh(self, api_key: int) -> None:
+        if api_key in self._refresh_tasks:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no loop to hand it to; the caller is synchronous anyway
+            self.hard_refresh_nonce(api_key)
+            self._confirm(api_key, self.nonce[api_key])
+            return
+        self._refresh_tasks[api_key] = loop.create_task(self._background_refresh(api_key))
+
+    async def _background_refresh(self, api_key: int) -> None:
+        start = time.perf_counter()
+        try:
+            await self.hard_refresh_nonce_async(api_key)
+            self._confirm(api_key, self.nonce[api_key])
+            self.recovery_counts["background_refresh"] += 1
+            self.recovery_ms["background_refresh"].append((time.perf_counter() - start) * 1e3)
+        except Exception as e:
+            self.recovery_counts["refresh_errors"] += 1
+            logger.warning(f"nonce refresh for api key {api_key} failed: {e}")
+        finally:
+            self._refresh_tasks.pop(api_key, None)
+
+    async def wait_for_recovery(self) -> None:
+        """Wait for background nonce refreshes still running."""
+        await asyncio.gather(*self._refresh_tasks.values(), return_exceptions=True)
+
+    def cancel_recovery(self) -> None:
+        for task in self._refresh_tasks.values():
+            task.cancel()
+
+    def recovery_stats(self) -> Dict:
+        """Invalid nonce rejections by how they were repaired, plus median and
+        max repair time per path in ms."""
+        stats = dict(self.recovery_counts, pending_refreshes=len(self._refresh_tasks))
+        for path, samples in self.recovery_ms.items():
+            if samples:
+                ordered = sorted(samples)
+                stats[f"{path}_ms_p50"] = ordered[len(ordered) // 2]
+                stats[f"{path}_ms_max"] = ordered[-1]
+        return stats
+
+    def _confirm(self, api_key: int, nonce: Optional[int]) -> None:
+        self._repaired_from_ack.discard(api_key)
+        if nonce is not None and nonce > self.confirmed.get(api_key, -1):
+            self.confirmed[api_key] = nonce
+
+    def _pick_key(self) -> int:
+        return self.scheduler.pick()[0]
+
+    async def _wait_for_key(self) -> int:
+        """Best key per the scheduler, sleeping only if every key is still hot."""
+        api_key, wait = self.scheduler.pick()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            # a capped key may still be at its cap, or another key freed up
+            api_key, wait = self.scheduler.pick()
+        return api_key
+
+    def utilization(self) -> Dict[int, Dict]:
+        return self.scheduler.utilization()
 
     @abc.abstractmethod
     def next_nonce(self, api_key: Optional[int] = None) -> Tuple[int, int]:
         pass
 
-    def acknowledge_failure(self, api_key: int) -> None:
-        pass
+    async def next_nonce_async(self, api_key: Optional[int] = None) -> Tuple[int, int]:
+        """next_nonce for use on the event loop; never blocks on HTTP. Without
+        an api_key it waits for the scheduler when every key is hot, where
+        next_nonce would use the least hot key right away."""
+        if api_key is None:
+            api_key = await self._wait_for_key()
+        return self.next_nonce(api_key)
+
+    def reserve(self, count: int, api_key: Optional[int] = None) -> Tuple[int, int]:
+        """Reserve `count` consecutive nonces on one key; returns (api_key, first nonce).
+
+        Managers that read the nonce from the API on every call have nothing
+        to reserve: the range simply follows the nonce returned.
+        """
+        return self.next_nonce(api_key)
+
+    def acknowledge_success(self, api_key: int, nonce: int) -> None:
+        self._confirm(api_key, nonce)
+        self.scheduler.settled(api_key, rejected=False)
+
+    def acknowledge_failure(self, api_key: int, nonce: Optional[int] = None) -> None:
+        self.scheduler.settled(api_key, rejected=True)
 
 
 class OptimisticNonceManager(NonceManager):
+    """Hands out nonces locally and tracks the ones still in flight.
+
+    `nonce[key]` is the highest nonce handed out on a key. A failed nonce
+    below that mark goes to a per-key free list and is handed out again
+    before the mark advances, so the sequence the exchange sees has no gap;
+    a failed nonce at the mark just lowers it. `reserve(n)` hands out a
+    consecutive range for batches. A lock makes this safe to call from
+    asyncio tasks and worker threads alike.
+
+    Pass the nonce to `acknowledge_failure` / `acknowledge_success`. Without
+    one, acknowledge_failure releases the key's most recent in-flight nonce.
+    """
+
     def __init__(
             self,
             account_index: int,
             api_client: ApiClient,
-            api_keys_list: List[int]
+            api_keys_list: List[int],
+            nonces: Optional[Dict[int, int]] = None,
+            scheduler: Optional[ApiKeyScheduler] = None,
     ) -> None:
-        super().__init__(account_index, api_client, api_keys_list)
+        super().__init__(account_index, api_client, api_keys_list, nonces, scheduler)
+        self._lock = threading.Lock()
+        self.in_flight: Dict[int, Set[int]] = {api_key: set() for api_key in api_keys_list}
+        self._free: Dict[int, List[int]] = {api_key: [] for api_key in api_keys_list}
 
     def next_nonce(self, api_key: Optional[int] = None) -> Tuple[int, int]:
-        if api_key is None:
-            self.current = (self.current + 1) % len(self.api_keys_list)
-            api_key = self.api_keys_list[self.current]
+        with self._lock:
+            if api_key is None:
+                api_key = self._pick_key()
+
+            free = self._free[api_key]
+            if free:
+                nonce = heapq.heappop(free)
+            else:
+                self.nonce[api_key] += 1
+                nonce = self.nonce[api_key]
+            self.in_flight[api_key].add(nonce)
+            self.scheduler.sent(api_key)
+            return api_key, nonce
+
+    def reserve(self, count: int, api_key: Optional[int] = None) -> Tuple[int, int]:
+        with self._lock:
+            if api_key is None:
+                api_key = self._pick_key()
+
+            # ranges always come from the mark; free nonces are not consecutive
+            first = self.nonce[api_key] + 1
+            self.nonce[api_key] += count
+            self.in_flight[api_key].update(range(first, first + count))
+            self.scheduler.sent(api_key, count)
+            return api_key, first
 
-        self.nonce[api_key] += 1
-        return api_key, self.nonce[api_key]
+    def acknowledge_success(self, api_key: int, nonce: int) -> None:
+        with self._lock:
+            self._confirm(api_key, nonce)
+            if nonce in self.in_flight[api_key]:
+                self.in_flight[api_key].discard(nonce)
+                self.scheduler.settled(api_key, rejected=False)
 
-    def acknowledge_failure(self, api_key: int) -> None:
-        self.nonce[api_key] -= 1
+    def acknowledge_failure(self, api_key: int, nonce: Optional[int] = None) -> None:
+        with self._lock:
+            in_flight = self.in_flight[api_key]
+            if nonce is None:
+                if not in_flight:
+                    self.nonce[api_key] -= 1
+                    return
+                nonce = max(in_flight)
+            elif nonce not in in_flight:
+                # already settled, or from before a resync
+                return
+            in_flight.discard(nonce)
+            self.scheduler.settled(api_key, rejected=True)
+
+            free = self._free[api_key]
+            if nonce == self.nonce[api_key]:
+                self.nonce[api_key] -= 1
+                # the mark may now sit on nonces that were freed earlier
+                while free and self.nonce[api_key] in free:
+                    free.remove(self.nonce[api_key])
+                    self.nonce[api_key] -= 1
+                heapq.heapify(free)
+            else:
+                heapq.heappush(free, nonce)
+
+    def _resync(self, api_key: int, last_used: int) -> int:
+        with self._lock:
+            self.nonce[api_key] = last_used
+            self.in_flight[api_key].clear()
+            self._free[api_key].clear()
+            self.scheduler.reset(api_key)
+            return last_used
 
 
 class ApiNonceManager(NonceManager):
+    MIN_KEY_INTERVAL = 0.35
+    # every nonce comes fresh from the API; a rejection has nothing to repair
+    TRACKS_NONCES = False
+
     def __init__(
             self,
             account_index: int,
             api_client: ApiClient,
             api_keys_list: List[int],
+            nonces: Optional[Dict[int, int]] = None,
+            scheduler: Optional[ApiKeyScheduler] = None,
     ) -> None:
-        super().__init__(account_index, api_client, api_keys_list)
+        super().__init__(account_index, api_client, api_keys_list, nonces, scheduler)
 
     def next_nonce(self, api_key: Optional[int] = None) -> Tuple[int, int]:
         """
@@ -90,10 +350,30 @@ class ApiNonceManager(NonceManager):
         predicted_execution_time_ms from the response could give you a tighter bound.
         """
         if api_key is None:
-            self.current = (self.current + 1) % len(self.api_keys_list)
-            api_key = self.api_keys_list[self.current]
+            api_key = self._pick_key()
+
+        # marked used before the fetch so that nothing else picks the key
+        # meanwhile; not refresh_nonce: that is a resync, which would forget
+        # the key's txs in flight on every order
+        self.scheduler.sent(api_key)
+        try:
+            nonce = self.nonce[api_key] = get_nonce_from_api(self.api_client, self.account_index, api_key)
+        except Exception:
+            self.scheduler.unsent(api_key)
+            raise
+        return api_key, nonce
+
+    async def next_nonce_async(self, api_key: Optional[int] = None) -> Tuple[int, int]:
+        if api_key is None:
+            api_key = await self._wait_for_key()
 
-        nonce = self.refresh_nonce(api_key)
+        # before the await: concurrent callers must see the key as busy
+        self.scheduler.sent(api_key)
+        try:
+            nonce = self.nonce[api_key] = await get_nonce_from_api_async(self.api_client, self.account_index, api_key)
+        except BaseException:
+            self.scheduler.unsent(api_key)
+            raise
         return api_key, nonce
 
 
@@ -107,17 +387,31 @@ def nonce_manager_factory(
         account_index: int,
         api_client: ApiClient,
         api_keys_list: List[int],
+        nonces: Optional[Dict[int, int]] = None,
 ) -> NonceManager:
     if nonce_manager_type == NonceManagerType.OPTIMISTIC:
         return OptimisticNonceManager(
             account_index=account_index,
             api_client=api_client,
             api_keys_list=api_keys_list,
+            nonces=nonces,
         )
     elif nonce_manager_type == NonceManagerType.API:
         return ApiNonceManager(
             account_index=account_index,
             api_client=api_client,
             api_keys_list=api_keys_list,
+            nonces=nonces,
         )
     raise ValidationError("invalid nonce manager type")
+
+
+async def nonce_manager_factory_async(
+        nonce_manager_type: NonceManagerType,
+        account_index: int,
+        api_client: ApiClient,
+        api_keys_list: List[int],
+) -> NonceManager:
+    """nonce_manager_factory with every key's nonce fetched concurrently over aiohttp."""
+    nonces = await fetch_nonces(api_client, account_index, api_keys_list)
+    return nonce_manager_factory(nonce_manager_type, account_index, api_client, api_keys_list, nonces)
@@ -0,0 +1,238 @@
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+
+class _Ladder:
+    """One side of the book: price -> size, plus the prices kept sorted.
+
+    Prices are stored as `sign * price` in ascending order, with sign chosen so
+    the best level is always last. Updates cluster near the top of the book,
+    so inserts and deletes mostly shift only the tail of the list.
+    """
+
+    def __init__(self, sign: int):
+        self.sign = sign
+        self.keys: List[int] = []
+        self.sizes: Dict[int, int] = {}
+
+    def set(self, price: int, size: int):
+        if size == 0:
+            if self.sizes.pop(price, None) is not None:
+                keys = self.keys
+                del keys[bisect_left(keys, self.sign * price)]
+            return
+        if price not in self.sizes:
+            key = self.sign * price
+            keys = self.keys
+            if not keys or key > keys[-1]:
+                keys.append(key)
+            else:
+                keys.insert(bisect_left(keys, key), key)
+        self.sizes[price] = size
+
+    def best(self) -> Optional[Tuple[int, int]]:
+        if not self.keys:
+            return None
+        price = self.sign * self.keys[-1]
+        return price, self.sizes[price]
+
+    def levels(self, depth: Optional[int] = None) -> List[Tuple[int, int]]:
+        keys = self.keys if depth is None else self.keys[-depth:]
+        sign, sizes = self.sign, self.sizes
+        return [(sign * key, sizes[sign * key]) for key in reversed(keys)]
+
+    def clear(self):
+        self.keys.clear()
+        self.sizes.clear()
+
+    def rescale_prices(self, factor: int):
+        self.keys = [key * factor for key in self.keys]
+        self.sizes = {price * factor: size for price, size in self.sizes.items()}
+
+    def rescale_sizes(self, factor: int):
+        self.sizes = {price: size * factor for price, size in self.sizes.items()}
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class OrderBook:
+    """Incremental L2 order book for one market.
+
+    Prices and sizes are held as integers scaled by 10**price_decimals and
+    10**size_decimals. Pass the market's decimals when known; otherwise they
+    start at 0 and widen (rescaling the book) when a level needs more.
+    Updates are O(log n) to locate and top of book is O(1).
+
+    `book["asks"]` / `book["bids"]` return the levels best-first in the
+    `{"price": str, "size": str}` shape of the raw WebSocket messages, for
+    callbacks written against the old list-of-dicts state.
+
+    The book also remembers the sequence position of the last message applied:
+    `nonce` when the feed sends `nonce`/`begin_nonce`, otherwise `offset`.
+    `follows()` tells whether a delta continues from there.
+    """
+
+    def __init__(self, price_decimals: Optional[int] = None, size_decimals: Optional[int] = None):
+        self._fixed_price_decimals = price_decimals is not None
+        self._fixed_size_decimals = size_decimals is not None
+        self.price_decimals = price_decimals or 0
+        self.size_decimals = size_decimals or 0
+        self.asks = _Ladder(-1)
+        self.bids = _Ladder(1)
+        self.updates = 0
+        self.nonce: Optional[int] = None
+        self.offset: Optional[int] = None
+
+    # === feeding ===
+    def apply_snapshot(self, order_book: dict, offset: Optional[int] = None):
+        self.clear()
+        self.nonce = None
+        self.offset = None
+        self.apply_update(order_book, offset)
+
+    def follows(self, order_book: dict, offset: Optional[int] = None) -> bool:
+        """False if applying this delta would skip or replay messages."""
+        begin_nonce = order_book.get("begin_nonce")
+        if begin_nonce is not None and self.nonce is not None:
+            return begin_nonce == self.nonce
+        if offset is None:
+            offset = order_book.get("offset")
+        if offset is not None and self.offset is not None:
+            return offset > self.offset
+        return True
+
+    def is_newer(self, order_book: dict, offset: Optional[int] = None) -> bool:
+        """False if this delta is already reflected in the book."""
+        nonce = order_book.get("nonce")
+        if nonce is not None and self.nonce is not None:
+            return nonce > self.nonce
+        if offset is None:
+            offset = order_book.get("offset")
+        if offset is not None and self.offset is not None:
+            return offset > self.offset
+        return True
+
+    def apply_update(self, order_book: dict, offset: Optional[int] = None):
+        for side, levels in ((self.asks, order_book.get("asks")), (self.bids, order_book.get("bids"))):
+            if not levels:
+                continue
+            set_level, scale_price, scale_size = side.set, self._scale_price, self._scale_size
+            for level in levels:
+                set_level(scale_price(level["price"]), scale_size(level["size"]))
+        self.updates += 1
+
+        nonce = order_book.get("nonce")
+        if nonce is not None:
+            self.nonce = nonce
+        if offset is None:
+            offset = order_book.get("offset")
+        if offset is not None:
+            self.offset = offset
+
+    def apply_message(self, message):
+        """Apply a ws_messages.OrderBookMessage, reusing its integer levels."""
+        if message.is_snapshot:
+            self.clear()
+            self.nonce = None
+            self.offset = None
+        if message.price_decimals > self.price_decimals:
+            self._widen_prices(message.price_decimals - self.price_decimals)
+        if message.size_decimals > self.size_decimals:
+            self._widen_sizes(message.size_decimals - self.size_decimals)
+        price_factor = 10 ** (self.price_decimals - message.price_decimals)
+        size_factor = 10 ** (self.size_decimals - message.size_decimals)
+        for side, levels in ((self.asks, message.asks), (self.bids, message.bids)):
+            for level in levels:
+                side.set(level.price * price_factor, level.size * size_factor)
+        self.updates += 1
+        if message.nonce is not None:
+            self.nonce = message.nonce
+        if message.offset is not None:
+            self.offset = message.offset
+
+    def clear(self):
+        self.asks.clear()
+        self.bids.clear()
+
+    # === reading ===
+    def best_bid(self) -> Optional[Tuple[int, int]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[int, int]]:
+        return self.asks.best()
+
+    def spread(self) -> Optional[int]:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def price_to_float(self, price: int) -> float:
+        return price / 10 ** self.price_decimals
+
+    def size_to_float(self, size: int) -> float:
+        return size / 10 ** self.size_decimals
+
+    def __getitem__(self, side: str) -> List[dict]:
+        if side not in ("asks", "bids"):
+            raise KeyError(side)
+        return [
+            {"price": self._format(price, self.price_decimals), "size": self._format(size, self.size_decimals)}
+            for price, size in getattr(self, side).levels()
+        ]
+
+    def get(self, side: str, default=None):
+        try:
+            return self[side]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"OrderBook(bid={self.best_bid()}, ask={self.best_ask()}, levels={len(self.bids)}/{len(self.asks)})"
+
+    # === scaling ===
+    def _scale_price(self, value: str) -> int:
+        whole, _, frac = value.partition(".")
+        if len(frac) == self.price_decimals:
+            return int(whole + frac)
+        extra = len(frac) - self.price_decimals
+        if extra > 0:
+            frac = frac.rstrip("0")
+            extra = len(frac) - self.price_decimals
+            if extra > 0:
+                self._widen_prices(extra)
+        return int(whole + frac.ljust(self.price_decimals, "0"))
+
+    def _scale_size(self, value: str) -> int:
+        whole, _, frac = value.partition(".")
+        if len(frac) == self.size_decimals:
+            return int(whole + frac)
+        extra = len(frac) - self.size_decimals
+        if extra > 0:
+            frac = frac.rstrip("0")
+            extra = len(frac) - self.size_decimals
+            if extra > 0:
+                self._widen_sizes(extra)
+        return int(whole + frac.ljust(self.size_decimals, "0"))
+
+    def _widen_prices(self, extra: int):
+        if self._fixed_price_decimals:
+            raise ValueError(f"price has more than {self.price_decimals} decimals")
+        self.price_decimals += extra
+        self.asks.rescale_prices(10 ** extra)
+        self.bids.rescale_prices(10 ** extra)
+
+    def _widen_sizes(self, extra: int):
+        if self._fixed_size_decimals:
+            raise ValueError(f"size has more than {self.size_decimals} decimals")
+        self.size_decimals += extra
+        self.asks.rescale_sizes(10 ** extra)
+        self.bids.rescale_sizes(10 ** extra)
+
+    @staticmethod
+    def _format(value: int, decimals: int) -> str:
+        if not decimals:
+            return str(value)
+        digits = str(value).rjust(decimals + 1, "0")
+        return f"{digits[:-decimals]}.{digits[-decimals:]}"
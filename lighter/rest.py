@@ -13,14 +13,14 @@
 
 
 import io
-import json
 import re
 import ssl
-from typing import Optional, Union
+from typing import Dict, Optional, Union
 
 import aiohttp
 import aiohttp_retry
 
+from lighter import codec
 from lighter.exceptions import ApiException, ApiValueError
 
 RESTResponseType = aiohttp.ClientResponse
@@ -70,8 +70,22 @@ class RESTClientObject:
 
         connector = aiohttp.TCPConnector(
             limit=maxsize,
-            ssl=ssl_context
+            ssl=ssl_context,
+            ttl_dns_cache=configuration.dns_cache_ttl,
+            keepalive_timeout=configuration.keepalive_timeout
         )
+        self.connector = connector
+
+        # connections opened / reused and DNS cache hits, see connection_stats
+        self.stats = {
+            "opened": 0, "reused": 0, "requests": 0, "dns_cache_hits": 0, "dns_cache_misses": 0,
+        }
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._count("opened"))
+        trace_config.on_connection_reuseconn.append(self._count("reused"))
+        trace_config.on_request_end.append(self._count("requests"))
+        trace_config.on_dns_cache_hit.append(self._count("dns_cache_hits"))
+        trace_config.on_dns_cache_miss.append(self._count("dns_cache_misses"))
 
         self.proxy = configuration.proxy
         self.proxy_headers = configuration.proxy_headers
@@ -79,7 +93,8 @@ class RESTClientObject:
         # https pool manager
         self.pool_manager = aiohttp.ClientSession(
             connector=connector,
-            trust_env=True
+            trust_env=True,
+            trace_configs=[trace_config]
         )
 
         retries = configuration.retries
@@ -97,6 +112,21 @@ class RESTClientObject:
         else:
             self.retry_client = None
 
+    def _count(self, stat):
+        async def on_event(session, context, params):
+            self.stats[stat] += 1
+        return on_event
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Pool counters: connections open (idle + in use), idle, in use,
+        opened and reused over the session's life, requests completed and DNS
+        cache hits / misses."""
+        # aiohttp exposes no public view of the pool; _conns holds the idle
+        # connections per host, _acquired the ones serving a request
+        idle = sum(len(conns) for conns in getattr(self.connector, "_conns", {}).values())
+        in_use = len(getattr(self.connector, "_acquired", ()))
+        return dict(self.stats, open=idle + in_use, idle=idle, in_use=in_use)
+
     async def close(self):
         await self.pool_manager.close()
         if self.retry_client is not None:
@@ -165,7 +195,7 @@ class RESTClientObject:
         if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
             if re.search('json', headers['Content-Type'], re.IGNORECASE):
                 if body is not None:
-                    body = json.dumps(body)
+                    body = codec.dumps(body)
                 args["data"] = body
             elif headers['Content-Type'] == 'application/x-www-form-urlencoded':
                 args["data"] = aiohttp.FormData(post_params)
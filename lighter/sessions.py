@@ -0,0 +1,103 @@
+"""Process-wide registry of ApiClients, one per host.
+
+Every ApiClient owns an aiohttp session and its connection pool, so each
+`lighter.ApiClient(...)` pays its own DNS, TCP and TLS setup. Code that
+talks to the same host should share one client instead:
+
+    api_client = sessions.acquire(url)
+    try:
+        ...
+    finally:
+        await sessions.release(api_client)
+
+`acquire` hands out the host's client, creating it on first use, and counts
+the reference. `release` closes it once the last holder lets go;
+`close_all()` closes every client regardless, e.g. at shutdown. Clients are
+bound to the event loop they were created on: a host whose client belongs to
+another loop, or was closed directly, gets a fresh one.
+
+Blocking code paths (the sync nonce manager calls) share one pooled
+`requests.Session` from `sync_session()` rather than opening a connection
+per call.
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+from lighter.api_client import ApiClient
+from lighter.configuration import Configuration
+from lighter.errors import ValidationError
+
+_clients: Dict[str, ApiClient] = {}
+_refs: Dict[str, int] = {}
+_loops: Dict[str, asyncio.AbstractEventLoop] = {}
+_sync_session = None
+
+
+def _usable(host: str, loop: asyncio.AbstractEventLoop) -> bool:
+    client = _clients.get(host)
+    return client is not None and _loops[host] is loop and not client.rest_client.pool_manager.closed
+
+
+def acquire(host: str, configuration: Optional[Configuration] = None) -> ApiClient:
+    """The shared ApiClient for host, created with `configuration` (default:
+    `Configuration(host=host)`) if there is none yet. Must be called with an
+    event loop running; pair every call with `release`.
+
+    Raises ValidationError if `configuration` is given but the host already
+    has a client built from a different one: its settings (proxy, retries,
+    headers) would be silently ignored. Build a private ApiClient instead.
+    """
+    host = host.rstrip("/")
+    loop = asyncio.get_running_loop()
+    if _usable(host, loop):
+        if configuration is not None and configuration is not _clients[host].configuration:
+            raise ValidationError(f"{host} already has a shared ApiClient with a different configuration")
+    else:
+        _clients[host] = ApiClient(configuration=configuration or Configuration(host=host))
+        _refs[host] = 0
+        _loops[host] = loop
+    _refs[host] += 1
+    return _clients[host]
+
+
+async def release(api_client: ApiClient) -> None:
+    """Drop one reference to a client from `acquire`; closes it after the
+    last. A client that is not in the registry is closed right away."""
+    host = api_client.configuration.host.rstrip("/")
+    if _clients.get(host) is not api_client:
+        await api_client.close()
+        return
+    _refs[host] -= 1
+    if _refs[host] <= 0:
+        del _clients[host], _refs[host], _loops[host]
+        await api_client.close()
+
+
+def refcount(host: str) -> int:
+    return _refs.get(host.rstrip("/"), 0)
+
+
+async def close_all() -> None:
+    """Close every registered client and the sync session."""
+    global _sync_session
+    clients = list(_clients.values())
+    _clients.clear()
+    _refs.clear()
+    _loops.clear()
+    for client in clients:
+        await client.close()
+    if _sync_session is not None:
+        _sync_session.close()
+        _sync_session = None
+
+
+def sync_session():
+    """A process-wide `requests.Session`, for the few blocking calls left."""
+    global _sync_session
+    if _sync_session is None:
+        # imported here so that importing lighter stays cheap
+        import requests
+
+        _sync_session = requests.Session()
+    return _sync_session
@@ -1,24 +1,25 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import ctypes
-from functools import wraps
+from functools import partial, wraps
 import inspect
-import json
 import platform
 import logging
 import os
+import threading
 import time
 from typing import Dict, List, Optional, Union, Tuple
 
-from eth_account import Account
-from eth_account.messages import encode_defunct
 from pydantic import StrictInt
 import lighter
-from lighter.configuration import Configuration
+from lighter import codec
 from lighter.errors import ValidationError
 from lighter.models import TxHash
-from lighter import nonce_manager
+from lighter import nonce_manager, sessions
 from lighter.models.resp_send_tx import RespSendTx
 from lighter.models.resp_send_tx_batch import RespSendTxBatch
 from lighter.transactions import CreateOrder, CancelOrder, Withdraw, CreateGroupedOrders
+from lighter.ws_tx_sender import WsTxSender
 
 CODE_OK = 200
 
@@ -186,7 +187,8 @@ def process_api_key_and_nonce(func):
         api_key_index = bound_args.arguments.get("api_key_index", 255)
         nonce = bound_args.arguments.get("nonce", -1)
         if api_key_index == 255 and nonce == -1:
-            api_key_index, nonce = self.nonce_manager.next_nonce()
+            manager = await self._get_nonce_manager()
+            api_key_index, nonce = await manager.next_nonce_async()
 
         # Call the original function with modified kwargs
         ret: TxHash
@@ -194,13 +196,16 @@ def process_api_key_and_nonce(func):
             partial_arguments = {k: v for k, v in bound_args.arguments.items() if k not in ("self", "nonce", "api_key_index")}
             created_tx, ret, err = await func(self, **partial_arguments, nonce=nonce, api_key_index=api_key_index)
             if (ret is None and err) or (ret and ret.code != CODE_OK):
-                self.nonce_manager.acknowledge_failure(api_key_index)
+                self.nonce_manager.acknowledge_failure(api_key_index, nonce)
+            else:
+                self.nonce_manager.acknowledge_success(api_key_index, nonce)
         except lighter.exceptions.BadRequestException as e:
             if "invalid nonce" in str(e):
-                self.nonce_manager.hard_refresh_nonce(api_key_index)
+                self.nonce_manager.acknowledge_failure(api_key_index, nonce)
+                self.nonce_manager.recover_nonce(api_key_index, str(e))
                 return None, None, trim_exc(str(e))
             else:
-                self.nonce_manager.acknowledge_failure(api_key_index)
+                self.nonce_manager.acknowledge_failure(api_key_index, nonce)
                 return None, None, trim_exc(str(e))
 
         return created_tx, ret, err
@@ -259,26 +264,128 @@ class SignerClient:
             account_index,
             api_private_keys: Dict[int, str],
             nonce_management_type=nonce_manager.NonceManagerType.OPTIMISTIC,
+            signing_workers: Optional[int] = None,
     ):
         self.url = url
         self.chain_id = 304 if "mainnet" in url else 300
 
+        init_start = time.perf_counter()
         self.validate_api_private_keys(api_private_keys)
         self.api_key_dict = api_private_keys
         self.account_index = account_index
-        self.signer = get_signer()
-        self.api_client = lighter.ApiClient(configuration=Configuration(host=url))
-        self.tx_api = lighter.TransactionApi(self.api_client)
-        self.order_api = lighter.OrderApi(self.api_client)
-
-        self.nonce_manager = nonce_manager.nonce_manager_factory(
-            nonce_manager_type=nonce_management_type,
-            account_index=account_index,
+        # shared with every other user of this host in the process, see lighter.sessions
+        self.api_client = sessions.acquire(url)
+        self.nonce_management_type = nonce_management_type
+
+        # The signer library, per-key signer clients, API objects and nonce
+        # manager are built on first use, or all at once off the event loop
+        # by `await warmup()`. startup_timings holds ms per phase.
+        self._signer = None
+        self._tx_api = None
+        self._order_api = None
+        self._nonce_manager: Optional[nonce_manager.NonceManager] = None
+        self._startup_lock = threading.Lock()
+        self.startup_timings: Dict[str, float] = {}
+
+        # ctypes releases the GIL for the duration of a native call, so signing
+        # in threads runs in parallel and keeps the event loop free
+        self.signing_workers = signing_workers or min(len(api_private_keys) * 2, os.cpu_count() or 1)
+        self._signing_executor: Optional[ThreadPoolExecutor] = None
+        self._ws_tx_sender: Optional[WsTxSender] = None
+        self.startup_timings["init"] = (time.perf_counter() - init_start) * 1e3
+
+    @property
+    def signer(self):
+        if self._signer is None:
+            self._load_signer()
+        return self._signer
+
+    @property
+    def tx_api(self):
+        if self._tx_api is None:
+            self._tx_api = lighter.TransactionApi(self.api_client)
+        return self._tx_api
+
+    @property
+    def order_api(self):
+        if self._order_api is None:
+            self._order_api = lighter.OrderApi(self.api_client)
+        return self._order_api
+
+    @property
+    def nonce_manager(self) -> nonce_manager.NonceManager:
+        if self._nonce_manager is None:
+            self._init_nonce_manager()
+        return self._nonce_manager
+
+    def _load_signer(self):
+        with self._startup_lock:
+            if self._signer is not None:
+                return
+            start = time.perf_counter()
+            signer = get_signer()
+            loaded = time.perf_counter()
+            for api_key_index in self.api_key_dict.keys():
+                self.create_client(api_key_index, signer)
+            # published only now: the signer property skips the lock once it
+            # is set, so every key's client must exist first
+            self._signer = signer
+            self.startup_timings["signer_library"] = (loaded - start) * 1e3
+            self.startup_timings["create_clients"] = (time.perf_counter() - loaded) * 1e3
+
+    async def _get_nonce_manager(self):
+        """nonce_manager, created without blocking the loop if not done yet."""
+        if self._nonce_manager is None:
+            start = time.perf_counter()
+            nonces = await nonce_manager.fetch_nonces(self.api_client, self.account_index, list(self.api_key_dict.keys()))
+            self._init_nonce_manager(nonces)
+            self.startup_timings["nonces"] = (time.perf_counter() - start) * 1e3
+        return self._nonce_manager
+
+    def _init_nonce_manager(self, nonces: Optional[Dict[int, int]] = None):
+        start = time.perf_counter()
+        manager = nonce_manager.nonce_manager_factory(
+            nonce_manager_type=self.nonce_management_type,
+            account_index=self.account_index,
             api_client=self.api_client,
-            api_keys_list=list(api_private_keys.keys()),
+            api_keys_list=list(self.api_key_dict.keys()),
+            nonces=nonces,
+        )
+        if self._nonce_manager is None:
+            self._nonce_manager = manager
+            self.startup_timings.setdefault("nonces", (time.perf_counter() - start) * 1e3)
+
+    async def warmup(self, connections: int = 2, keepalive_interval: Optional[float] = 15.0) -> Dict[str, float]:
+        """Do the startup work the constructor defers, without blocking the loop.
+
+        Loads the signer library and creates the per-key clients in a worker
+        thread while the nonces for all keys are fetched concurrently on the
+        aiohttp session, the API modules are imported and `connections`
+        pooled connections are opened (`ApiClient.warmup`). Those are then
+        kept open with `ApiClient.start_keepalive(keepalive_interval)`
+        unless it is None, so orders never pay a handshake. Returns
+        `startup_timings`: ms per phase, plus "warmup" for the wall time of
+        this call. Calling it again is cheap.
+        """
+        start = time.perf_counter()
+
+        async def import_apis():
+            api_start = time.perf_counter()
+            await asyncio.to_thread(lambda: (self.tx_api, self.order_api))
+            self.startup_timings["api_modules"] = (time.perf_counter() - api_start) * 1e3
+
+        async def open_connections():
+            connect_start = time.perf_counter()
+            await self.api_client.warmup(connections)
+            self.startup_timings["connections"] = (time.perf_counter() - connect_start) * 1e3
+
+        await asyncio.gather(
+            asyncio.to_thread(self._load_signer), self._get_nonce_manager(), import_apis(), open_connections()
         )
-        for api_key_index in api_private_keys.keys():
-            self.create_client(api_key_index)
+        if keepalive_interval is not None:
+            self.api_client.start_keepalive(keepalive_interval, connections)
+        self.startup_timings["warmup"] = (time.perf_counter() - start) * 1e3
+        return self.startup_timings
 
     # === signer helpers ===
     @staticmethod
@@ -305,15 +412,18 @@ class SignerClient:
         tx_hash_str = result.txHash.decode("utf-8") if result.txHash else None
         msg_to_sign = result.messageToSign.decode("utf-8") if result.messageToSign else None
 
-        # sign the message
+        # sign the message; eth_account is slow to import and only needed for L1-signed txs
+        from eth_account import Account
+        from eth_account.messages import encode_defunct
+
         acct = Account.from_key(eth_private_key)
         message = encode_defunct(text=msg_to_sign)
         signature = acct.sign_message(message)
 
         # add signature to tx_info
-        tx_info = json.loads(tx_info_str)
+        tx_info = codec.loads(tx_info_str)
         tx_info["L1Sig"] = signature.signature.to_0x_hex()
-        return tx_type, json.dumps(tx_info), tx_hash_str, None
+        return tx_type, codec.dumps(tx_info), tx_hash_str, None
 
     def validate_api_private_keys(self, private_keys: Dict[int, str]):
         if len(private_keys) == 0:
@@ -324,8 +434,9 @@ class SignerClient:
             if private_key.startswith("0x"):
                 private_keys[api_key_index] = private_key[2:]
 
-    def create_client(self, api_key_index):
-        err = self.signer.CreateClient(
+    def create_client(self, api_key_index, signer=None):
+        # _load_signer passes the library it has not published yet
+        err = (signer or self.signer).CreateClient(
             self.url.encode("utf-8"),
             self.api_key_dict[api_key_index].encode("utf-8"),
             self.chain_id,
@@ -448,6 +559,64 @@ class SignerClient:
             grouping_type, orders_arr, len(orders), nonce, api_key_index, self.account_index
         ))
 
+    def sign_create_orders_batch(
+            self,
+            orders,
+            api_key_index: int = DEFAULT_API_KEY_INDEX,
+    ) -> Union[Tuple[List[int], List[str], List[str], None], Tuple[None, None, None, str]]:
+        """Sign independent orders under consecutive nonces of one API key.
+
+        `orders` is a sequence of `CreateOrderTxReq`, a sequence of dicts keyed by
+        the `CreateOrderTxReq` field names, or a NumPy structured array with
+        those fields. Returns (tx_types, tx_infos, tx_hashes, None), ready for
+        `send_tx_batch`, or (None, None, None, error) with every reserved nonce
+        handed back.
+
+        The signer library has no bulk entry point for ungrouped orders, so this
+        still makes one native call per order, but without the per-call nonce
+        manager round-trip, argument re-binding and `SignedTxResponse` decode
+        helper of `sign_create_order`.
+        """
+        columns = self.__order_columns(orders)
+        n = len(columns[0])
+        if n == 0:
+            return [], [], [], None
+
+        api_key_index, first_nonce = self.nonce_manager.reserve(
+            n, None if api_key_index == self.DEFAULT_API_KEY_INDEX else api_key_index
+        )
+
+        sign = self.signer.SignCreateOrder
+        account_index = self.account_index
+        tx_types, tx_infos, tx_hashes = [], [], []
+        for i, (market_index, client_order_index, base_amount, price, is_ask, order_type, time_in_force,
+                reduce_only, trigger_price, order_expiry) in enumerate(zip(*columns)):
+            result = sign(
+                market_index, client_order_index, base_amount, price, is_ask, order_type, time_in_force,
+                reduce_only, trigger_price, order_expiry, first_nonce + i, api_key_index, account_index,
+            )
+            if result.err:
+                for nonce in reversed(range(first_nonce, first_nonce + n)):
+                    self.nonce_manager.acknowledge_failure(api_key_index, nonce)
+                return None, None, None, f"order {i}: {result.err.decode('utf-8')}"
+            tx_types.append(result.txType)
+            tx_infos.append(result.txInfo.decode("utf-8"))
+            tx_hashes.append(result.txHash.decode("utf-8") if result.txHash else None)
+
+        return tx_types, tx_infos, tx_hashes, None
+
+    @staticmethod
+    def __order_columns(orders) -> List[List[int]]:
+        fields = [name for name, _ in CreateOrderTxReq._fields_]
+        dtype = getattr(orders, "dtype", None)
+        if dtype is not None and dtype.names:
+            return [orders[name].tolist() for name in fields]
+        if len(orders) and isinstance(orders[0], dict):
+            defaults = {"ReduceOnly": 0, "TriggerPrice": SignerClient.NIL_TRIGGER_PRICE,
+                        "OrderExpiry": SignerClient.DEFAULT_28_DAY_ORDER_EXPIRY}
+            return [[int(order.get(name, defaults.get(name))) for order in orders] for name in fields]
+        return [[getattr(order, name) for order in orders] for name in fields]
+
     def sign_cancel_order(self, market_index: int, order_index: int, nonce: int = DEFAULT_NONCE, api_key_index: int = DEFAULT_API_KEY_INDEX) -> Union[Tuple[str, str, str, None], Tuple[None, None, None, str]]:
         return self.__decode_tx_info(self.signer.SignCancelOrder(market_index, order_index, nonce, api_key_index, self.account_index))
 
@@ -483,6 +652,91 @@ class SignerClient:
 
     def sign_update_margin(self, market_index: int, usdc_amount: int, direction: int, nonce: int = DEFAULT_NONCE, api_key_index: int = DEFAULT_API_KEY_INDEX) -> Union[Tuple[str, str, str, None], Tuple[None, None, None, str]]:
         return self.__decode_tx_info(self.signer.SignUpdateMargin(market_index, usdc_amount, direction, nonce, api_key_index, self.account_index))
+    # === async signing ===
+    @property
+    def signing_executor(self) -> ThreadPoolExecutor:
+        if self._signing_executor is None:
+            self._signing_executor = ThreadPoolExecutor(
+                max_workers=self.signing_workers, thread_name_prefix="lighter-signer"
+            )
+        return self._signing_executor
+
+    async def sign_async(self, sign_func, *args, **kwargs):
+        """Run any `sign_*` method on the signing pool instead of the event loop thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.signing_executor, partial(sign_func, *args, **kwargs))
+
+    async def sign_create_order_async(
+            self,
+            market_index,
+            client_order_index,
+            base_amount,
+            price,
+            is_ask,
+            order_type,
+            time_in_force,
+            reduce_only=False,
+            trigger_price=NIL_TRIGGER_PRICE,
+            order_expiry=DEFAULT_28_DAY_ORDER_EXPIRY,
+            nonce: int = DEFAULT_NONCE,
+            api_key_index: int = DEFAULT_API_KEY_INDEX
+    ) -> Union[Tuple[str, str, str, None], Tuple[None, None, None, str]]:
+        if api_key_index == self.DEFAULT_API_KEY_INDEX and nonce == self.DEFAULT_NONCE:
+            # Reserved here, on the loop thread, so nonces follow call order
+            manager = await self._get_nonce_manager()
+            api_key_index, nonce = await manager.next_nonce_async()
+            reserved = True
+        else:
+            reserved = False
+
+        tx_type, tx_info, tx_hash, error = await self.sign_async(
+            self.sign_create_order,
+            market_index,
+            client_order_index,
+            base_amount,
+            price,
+            is_ask,
+            order_type,
+            time_in_force,
+            reduce_only,
+            trigger_price,
+            order_expiry,
+            nonce,
+            api_key_index,
+        )
+        if error is not None and reserved:
+            self.nonce_manager.acknowledge_failure(api_key_index, nonce)
+        return tx_type, tx_info, tx_hash, error
+
+    async def sign_create_orders_async(
+            self, orders: List[Dict]
+    ) -> List[Union[Tuple[str, str, str, None], Tuple[None, None, None, str]]]:
+        """Sign many orders concurrently on the signing pool.
+
+        Each order is a dict of `sign_create_order` keyword arguments. Nonces are
+        reserved up front in list order, so the results (returned in the same
+        order) can be submitted as-is with `send_tx_batch`. Orders that fail to
+        sign hand a reserved nonce back with `acknowledge_failure`, as
+        `sign_create_order_async` does, so the next order reuses it.
+        """
+        loop = asyncio.get_running_loop()
+        manager = await self._get_nonce_manager()
+        futures = []
+        reserved = []
+        for order in orders:
+            kwargs = dict(order)
+            if kwargs.get("api_key_index", self.DEFAULT_API_KEY_INDEX) == self.DEFAULT_API_KEY_INDEX and \
+                    kwargs.get("nonce", self.DEFAULT_NONCE) == self.DEFAULT_NONCE:
+                kwargs["api_key_index"], kwargs["nonce"] = await manager.next_nonce_async()
+                reserved.append((kwargs["api_key_index"], kwargs["nonce"]))
+            else:
+                reserved.append(None)
+            futures.append(loop.run_in_executor(self.signing_executor, partial(self.sign_create_order, **kwargs)))
+        results = list(await asyncio.gather(*futures))
+        for result, reservation in zip(results, reserved):
+            if result[3] is not None and reservation is not None:
+                manager.acknowledge_failure(*reservation)
+        return results
 
     @process_api_key_and_nonce
     async def create_order(
@@ -903,10 +1157,29 @@ class SignerClient:
 
         if tx_infos[0][0] != "{":
             raise Exception(tx_infos)
-        return await self.tx_api.send_tx_batch(tx_types=json.dumps(tx_types), tx_infos=json.dumps(tx_infos))
+        return await self.tx_api.send_tx_batch(tx_types=codec.dumps(tx_types), tx_infos=codec.dumps(tx_infos))
+
+    def ws_tx_sender(self, **kwargs) -> WsTxSender:
+        """WebSocket alternative to send_tx / send_tx_batch, sharing this client's nonce manager.
+
+        The sender is created on first use and closed with the client; kwargs
+        are passed to WsTxSender then.
+        """
+        if self._ws_tx_sender is None:
+            host = self.url.replace("https://", "").replace("http://", "ws://")
+            self._ws_tx_sender = WsTxSender(host=host, nonce_manager=self.nonce_manager, **kwargs)
+        return self._ws_tx_sender
 
     async def close(self):
-        await self.api_client.close()
+        if self._ws_tx_sender is not None:
+            await self._ws_tx_sender.close()
+            self._ws_tx_sender = None
+        if self._signing_executor is not None:
+            self._signing_executor.shutdown(wait=False)
+            self._signing_executor = None
+        if self._nonce_manager is not None:
+            self._nonce_manager.cancel_recovery()
+        await sessions.release(self.api_client)
 
     @staticmethod
     def are_keys_equal(key1, key2) -> bool:
@@ -1,9 +1,19 @@
-import json
+import asyncio
+from collections import deque
+import logging
+import time
+import websockets
 from websockets.sync.client import connect
-from websockets.client import connect as connect_async
+from websockets.asyncio.client import connect as connect_async
+from lighter import codec
 from lighter.configuration import Configuration
+from lighter.order_book import OrderBook
+from lighter.ws_messages import WsMessageDecoder
 
 class WsClient:
+    # deltas held per market while waiting for a resync snapshot
+    MAX_RESYNC_BUFFER = 10000
+
     def __init__(
         self,
         host=None,
@@ -12,35 +22,73 @@ class WsClient:
         account_ids=[],
         on_order_book_update=print,
         on_account_update=print,
+        on_channel_error=None,
         headers={},
+        reconnect_backoff=0.05,
+        reconnect_backoff_max=5.0,
+        reconnect_reset_after=10.0,
+        max_reconnect_attempts=None,
+        max_outbound=1000,
+        typed_messages=False,
     ):
         if host is None:
             host = Configuration.get_default().host.replace("https://", "")
 
-        self.base_url = f"wss://{host}{path}"
+        self.base_url = host + path if "://" in host else f"wss://{host}{path}"
 
         self.subscriptions = {
             "order_books": order_book_ids,
             "accounts": account_ids,
         }
 
-        if len(order_book_ids) == 0 and len(account_ids) == 0:
-            raise Exception("No subscriptions provided.")
+        # channel ("order_book/0", "trade/0", ...) -> callback(id, state);
+        # None falls back to on_order_book_update / on_account_update
+        self.channels = {}
+        for market_id in order_book_ids:
+            self.channels[f"order_book/{market_id}"] = None
+        for account_id in account_ids:
+            self.channels[f"account_all/{account_id}"] = None
 
         self.order_book_states = {}
         self.account_states = {}
 
+        # market_id -> (resync start perf_counter, buffered update messages)
+        self._resyncing = {}
+        self.order_book_sync_stats = {}
+
+        # account_all state and non-book channel callbacks get ws_messages
+        # structs instead of raw dicts
+        self.decoder = WsMessageDecoder() if typed_messages else None
+
         self.on_order_book_update = on_order_book_update
         self.on_account_update = on_account_update
+        # callback(channel or None, error) for error frames; None logs them
+        self.on_channel_error = on_channel_error
         self.headers = headers
 
+        # run_async only: reconnect policy and the writer task's queue
+        self.reconnect_backoff = reconnect_backoff
+        self.reconnect_backoff_max = reconnect_backoff_max
+        # seconds a connection must stay up before the backoff starts over
+        self.reconnect_reset_after = reconnect_reset_after
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.max_outbound = max_outbound
+        self.reconnects = 0
+        self._outbound = None
+        self._closing = False
+
         self.ws = None
 
     def on_message(self, ws, message):
         if isinstance(message, str):
-            message = json.loads(message)
+            message = codec.loads(message)
+
+        message_type = message.get("type") or ""
 
-        message_type = message.get("type")
+        channel = message.get("channel")
+        if channel is not None and channel.replace(":", "/", 1) not in self.channels:
+            # late message for a channel that was unsubscribed
+            return
 
         if message_type == "connected":
             self.handle_connected(ws)
@@ -54,94 +102,189 @@ class WsClient:
             self.handle_update_account(message)
         elif message_type == "ping":
             # Respond to ping with pong
-            ws.send(json.dumps({"type": "pong"}))
+            ws.send(codec.dumps({"type": "pong"}))
+        elif message_type == "error" or (not message_type and "error" in message):
+            self.handle_error_message(message)
+        elif message_type.startswith("unsubscribed/"):
+            pass
+        elif message_type.startswith(("subscribed/", "update/")) and channel is not None:
+            self.handle_channel_message(message)
         else:
             self.handle_unhandled_message(message)
 
     async def on_message_async(self, ws, message):
-        message = json.loads(message)
-        message_type = message.get("type")
+        if isinstance(message, str):
+            message = codec.loads(message)
 
-        if message_type == "connected":
+        if message.get("type") == "connected":
             await self.handle_connected_async(ws)
-        elif message_type == "ping":
-            # Respond to ping with pong
-            await ws.send(json.dumps({"type": "pong"}))
         else:
             self.on_message(ws, message)
 
     def handle_connected(self, ws):
-        for market_id in self.subscriptions["order_books"]:
-            ws.send(
-                json.dumps({"type": "subscribe", "channel": f"order_book/{market_id}"})
-            )
-        for account_id in self.subscriptions["accounts"]:
-            ws.send(
-                json.dumps(
-                    {"type": "subscribe", "channel": f"account_all/{account_id}"}
-                )
-            )
+        for channel in self.channels:
+            ws.send(codec.dumps({"type": "subscribe", "channel": channel}))
 
     async def handle_connected_async(self, ws):
-        for market_id in self.subscriptions["order_books"]:
-            await ws.send(
-                json.dumps({"type": "subscribe", "channel": f"order_book/{market_id}"})
-            )
-        for account_id in self.subscriptions["accounts"]:
-            await ws.send(
-                json.dumps(
-                    {"type": "subscribe", "channel": f"account_all/{account_id}"}
-                )
-            )
+        for channel in list(self.channels):
+            await self.send_async(codec.dumps({"type": "subscribe", "channel": channel}))
+
+    async def subscribe(self, channel, callback=None):
+        """Add a channel on the running connection (and every reconnect after it).
+
+        `callback(id, state)` receives updates for this channel only, where `id`
+        is the part after the slash. order_book and account_all channels keep
+        their managed state (OrderBook, latest message) and default to
+        on_order_book_update / on_account_update; any other channel, e.g.
+        "trade/0" or "account_all_trades/123", gets the raw message and needs a
+        callback.
+        """
+        if callback is None and channel.partition("/")[0] not in ("order_book", "account_all"):
+            raise ValueError(f"channel {channel} needs a callback")
+        is_new = channel not in self.channels
+        self.channels[channel] = callback
+        if is_new and self.ws is not None and self._outbound is not None:
+            await self.send_async(codec.dumps({"type": "subscribe", "channel": channel}))
+
+    async def unsubscribe(self, channel):
+        self.channels.pop(channel, None)
+        kind, _, channel_id = channel.partition("/")
+        if kind == "order_book":
+            self.order_book_states.pop(channel_id, None)
+            self._resyncing.pop(channel_id, None)
+        elif kind == "account_all":
+            self.account_states.pop(channel_id, None)
+        if self.ws is not None and self._outbound is not None:
+            await self.send_async(codec.dumps({"type": "unsubscribe", "channel": channel}))
+
+    def handle_channel_message(self, message):
+        channel = message["channel"].replace(":", "/", 1)
+        callback = self.channels.get(channel)
+        if callback is None:
+            self.handle_unhandled_message(message)
+            return
+        if self.decoder is not None:
+            message = self.decoder.decode(message)
+        callback(channel.split("/", 1)[1], message)
 
     def handle_subscribed_order_book(self, message):
         market_id = message["channel"].split(":")[1]
-        self.order_book_states[market_id] = message["order_book"]
-        if self.on_order_book_update:
-            self.on_order_book_update(market_id, self.order_book_states[market_id])
+        book = self.order_book_states.get(market_id)
+        if book is None:
+            book = self.order_book_states[market_id] = OrderBook()
+        book.apply_snapshot(message["order_book"], message.get("offset"))
+
+        resync = self._resyncing.pop(market_id, None)
+        if resync is not None:
+            started, buffered = resync
+            for update in buffered:
+                if not book.is_newer(update["order_book"], update.get("offset")):
+                    continue
+                if not book.follows(update["order_book"], update.get("offset")):
+                    self.start_order_book_resync(market_id)
+                    return
+                book.apply_update(update["order_book"], update.get("offset"))
+            stats = self.order_book_sync_stats[market_id]
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats["resyncs"] += 1
+            stats["last_resync_ms"] = elapsed_ms
+            stats["max_resync_ms"] = max(stats["max_resync_ms"], elapsed_ms)
+            stats["total_resync_ms"] += elapsed_ms
+
+        callback = self.channels.get(f"order_book/{market_id}") or self.on_order_book_update
+        if callback:
+            callback(market_id, self.order_book_states[market_id])
 
     def handle_update_order_book(self, message):
         market_id = message["channel"].split(":")[1]
-        self.update_order_book_state(market_id, message["order_book"])
-        if self.on_order_book_update:
-            self.on_order_book_update(market_id, self.order_book_states[market_id])
-
-    def update_order_book_state(self, market_id, order_book):
-        self.update_orders(
-            order_book["asks"], self.order_book_states[market_id]["asks"]
-        )
-        self.update_orders(
-            order_book["bids"], self.order_book_states[market_id]["bids"]
-        )
+        resync = self._resyncing.get(market_id)
+        if resync is not None:
+            resync[1].append(message)
+            return
+
+        book = self.order_book_states[market_id]
+        if not book.follows(message["order_book"], message.get("offset")):
+            self.start_order_book_resync(market_id)
+            self._resyncing[market_id][1].append(message)
+            return
+
+        self.update_order_book_state(market_id, message["order_book"], message.get("offset"))
+        callback = self.channels.get(f"order_book/{market_id}") or self.on_order_book_update
+        if callback:
+            callback(market_id, self.order_book_states[market_id])
+
+    def update_order_book_state(self, market_id, order_book, offset=None):
+        self.order_book_states[market_id].apply_update(order_book, offset)
+
+    def start_order_book_resync(self, market_id):
+        """Drop the local book's continuity and rebuild it from a fresh snapshot.
+
+        Deltas arriving meanwhile are buffered and replayed on top of the new
+        snapshot; no order book callbacks fire until it is consistent again.
+        """
+        stats = self.order_book_sync_stats.setdefault(market_id, {
+            "gaps": 0,
+            "resyncs": 0,
+            "last_resync_ms": None,
+            "max_resync_ms": 0.0,
+            "total_resync_ms": 0.0,
+        })
+        stats["gaps"] += 1
+        self._resyncing[market_id] = (time.perf_counter(), deque(maxlen=self.MAX_RESYNC_BUFFER))
+
+        self._send(codec.dumps({"type": "unsubscribe", "channel": f"order_book/{market_id}"}))
+        self._send(codec.dumps({"type": "subscribe", "channel": f"order_book/{market_id}"}))
+
+    def _send(self, frame):
+        if self._outbound is not None:
+            self._enqueue(frame)
+        else:
+            self.ws.send(frame)
 
     def update_orders(self, new_orders, existing_orders):
+        """Merge level updates into a list-of-dicts side in place.
+
+        Kept for callers managing their own raw book state; WsClient itself
+        uses OrderBook.
+        """
+        index = {float(order["price"]): order for order in existing_orders}
         for new_order in new_orders:
-            is_new_order = True
-            for existing_order in existing_orders:
-                if new_order["price"] == existing_order["price"]:
-                    is_new_order = False
-                    existing_order["size"] = new_order["size"]
-                    if float(new_order["size"]) == 0:
-                        existing_orders.remove(existing_order)
-                    break
-            if is_new_order:
+            existing_order = index.get(float(new_order["price"]))
+            if existing_order is not None:
+                existing_order["size"] = new_order["size"]
+            elif float(new_order["size"]) > 0:
                 existing_orders.append(new_order)
+                index[float(new_order["price"])] = new_order
 
-        existing_orders = [
+        existing_orders[:] = [
             order for order in existing_orders if float(order["size"]) > 0
         ]
 
     def handle_subscribed_account(self, message):
         account_id = message["channel"].split(":")[1]
-        self.account_states[account_id] = message
-        if self.on_account_update:
-            self.on_account_update(account_id, self.account_states[account_id])
+        self.account_states[account_id] = self.decoder.decode_account_all(message) if self.decoder else message
+        callback = self.channels.get(f"account_all/{account_id}") or self.on_account_update
+        if callback:
+            callback(account_id, self.account_states[account_id])
 
     def handle_update_account(self, message):
         account_id = message["channel"].split(":")[1]
-        self.account_states[account_id] = message
-        if self.on_account_update:
-            self.on_account_update(account_id, self.account_states[account_id])
+        self.account_states[account_id] = self.decoder.decode_account_all(message) if self.decoder else message
+        callback = self.channels.get(f"account_all/{account_id}") or self.on_account_update
+        if callback:
+            callback(account_id, self.account_states[account_id])
+
+    def handle_error_message(self, message):
+        """Error frames (e.g. a rejected subscribe) go to on_channel_error with
+        the channel they name, if any, instead of ending the stream."""
+        channel = message.get("channel")
+        if channel is not None:
+            channel = channel.replace(":", "/", 1)
+        error = message.get("error", message)
+        if self.on_channel_error is not None:
+            self.on_channel_error(channel, error)
+        else:
+            logging.warning(f"WsClient error frame on {channel or 'connection'}: {error}")
 
     def handle_unhandled_message(self, message):
         raise Exception(f"Unhandled message: {message}")
@@ -160,9 +303,109 @@ class WsClient:
             self.on_message(ws, message)
 
     async def run_async(self):
-        print(f"DEBUG: WsClient.run_async connecting to {self.base_url} with headers {self.headers}")
-        ws = await connect_async(self.base_url, extra_headers=self.headers)
-        self.ws = ws
+        """Stream until close(), reconnecting with exponential backoff.
+
+        Failed connects and dropped connections both count as attempts, and
+        each reconnect waits `min(reconnect_backoff * 2**(attempt-1),
+        reconnect_backoff_max)` first. The count starts over only after a
+        connection stayed up for `reconnect_reset_after` seconds, so a server
+        that accepts and then drops the socket is not hammered.
+        Every subscription is replayed on each new connection and its snapshot
+        replaces the local book, so callbacks resume from a consistent state.
+        Outbound frames go through a bounded queue drained by a writer task;
+        pings are answered by the reader before any callback runs. Error
+        frames go to on_channel_error; an exception from any other frame or
+        callback is logged and the stream carries on.
+        """
+        # not cleared here: a close() that came before this task ran still counts
+        self._outbound = asyncio.Queue(maxsize=self.max_outbound)
+        attempt = 0
+        try:
+            while not self._closing:
+                if attempt > 0:
+                    await asyncio.sleep(self._reconnect_delay(attempt))
+                    if self._closing:
+                        break
+                try:
+                    ws = await connect_async(self.base_url, additional_headers=self.headers, ping_interval=None)
+                except (OSError, websockets.InvalidHandshake, asyncio.TimeoutError) as e:
+                    attempt += 1
+                    if self.max_reconnect_attempts is not None and attempt > self.max_reconnect_attempts:
+                        raise
+                    logging.warning(
+                        f"WsClient connect failed ({e}), retrying in {self._reconnect_delay(attempt):.2f}s"
+                    )
+                    continue
+
+                if self._closing:
+                    # close() arrived while connecting
+                    await ws.close()
+                    break
+
+                connected_at = time.monotonic()
+                self.ws = ws
+                writer = asyncio.create_task(self._writer(ws))
+                try:
+                    async for raw in ws:
+                        try:
+                            message = codec.loads(raw)
+                            if message.get("type") == "ping":
+                                self._enqueue(codec.dumps({"type": "pong"}))
+                                continue
+                            await self.on_message_async(ws, message)
+                        except websockets.ConnectionClosed:
+                            raise
+                        except Exception:
+                            # one bad frame or callback must not end every channel's stream
+                            logging.exception(f"WsClient failed to handle {str(raw)[:200]}")
+                except websockets.ConnectionClosed as e:
+                    if not self._closing:
+                        logging.warning(f"WsClient connection closed ({e}), reconnecting")
+                finally:
+                    writer.cancel()
+                    await asyncio.gather(writer, return_exceptions=True)
+                    await ws.close()
+                    self.ws = None
+
+                if not self._closing:
+                    self.reconnects += 1
+                    self._reset_connection_state()
+                    if time.monotonic() - connected_at >= self.reconnect_reset_after:
+                        attempt = 0
+                    attempt += 1
+                    if self.max_reconnect_attempts is not None and attempt > self.max_reconnect_attempts:
+                        raise ConnectionError(f"WsClient gave up after {attempt - 1} reconnect attempts")
+        finally:
+            self._outbound = None
+            # the close has been honoured; a later run_async starts afresh
+            self._closing = False
+
+    def _reconnect_delay(self, attempt):
+        return min(self.reconnect_backoff * 2 ** (attempt - 1), self.reconnect_backoff_max)
+
+    async def send_async(self, frame):
+        """Queue a frame for the writer task, waiting while the queue is full."""
+        await self._outbound.put(frame)
+
+    async def close(self):
+        self._closing = True
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _enqueue(self, frame):
+        try:
+            self._outbound.put_nowait(frame)
+        except asyncio.QueueFull:
+            logging.warning(f"WsClient outbound queue full, dropping {frame[:80]}")
+
+    async def _writer(self, ws):
+        while True:
+            frame = await self._outbound.get()
+            await ws.send(frame)
 
-        async for message in ws:
-            await self.on_message_async(ws, message)
+    def _reset_connection_state(self):
+        # Frames queued for the dead socket are stale (subscribes are replayed)
+        while not self._outbound.empty():
+            self._outbound.get_nowait()
+        # Deltas buffered for a resync are superseded by the resubscribe snapshot
+        self._resyncing.clear()
@@ -0,0 +1,279 @@
+"""Compact typed forms of the WebSocket stream messages.
+
+`WsMessageDecoder.decode()` turns a decoded frame dict into one of the
+`__slots__` classes below, converting price and size strings to integers once
+at ingest. Each market's scale (10**price_decimals, 10**size_decimals) is
+either passed in, e.g. from `OrderApi.order_book_details`, or learned from
+the feed and only ever widened; every message records the decimals its
+integers use.
+"""
+
+from typing import Dict, List, Optional
+
+
+def _decimals(value: str) -> int:
+    dot = value.find(".")
+    return 0 if dot < 0 else len(value) - dot - 1
+
+
+def scale(value: str, decimals: int) -> int:
+    """"3000.5" at 2 decimals -> 300050. Raises ValueError if precision would be lost."""
+    whole, _, frac = value.partition(".")
+    if len(frac) == decimals:
+        return int(whole + frac)
+    if len(frac) > decimals:
+        frac = frac.rstrip("0")
+        if len(frac) > decimals:
+            raise ValueError(f"{value} has more than {decimals} decimals")
+    return int(whole + frac.ljust(decimals, "0"))
+
+
+def _levels(levels: List[dict], price_decimals: int, size_decimals: int) -> List["BookLevel"]:
+    # scale() inlined for the common case where every string already carries
+    # exactly the market's decimals; anything else takes the general path
+    out = []
+    append = out.append
+    for level in levels:
+        price, size = level["price"], level["size"]
+        whole, _, frac = price.partition(".")
+        price = int(whole + frac) if len(frac) == price_decimals else scale(price, price_decimals)
+        whole, _, frac = size.partition(".")
+        size = int(whole + frac) if len(frac) == size_decimals else scale(size, size_decimals)
+        append(BookLevel(price, size))
+    return out
+
+
+class BookLevel:
+    __slots__ = ("price", "size")
+
+    def __init__(self, price: int, size: int):
+        self.price = price
+        self.size = size
+
+    def __repr__(self):
+        return f"BookLevel({self.price}, {self.size})"
+
+
+class OrderBookMessage:
+    __slots__ = ("market_id", "is_snapshot", "asks", "bids", "offset", "nonce", "begin_nonce",
+                 "price_decimals", "size_decimals")
+
+    def __init__(self, market_id: int, is_snapshot: bool, asks: List[BookLevel], bids: List[BookLevel],
+                 offset: Optional[int], nonce: Optional[int], begin_nonce: Optional[int],
+                 price_decimals: int, size_decimals: int):
+        self.market_id = market_id
+        self.is_snapshot = is_snapshot
+        self.asks = asks
+        self.bids = bids
+        self.offset = offset
+        self.nonce = nonce
+        self.begin_nonce = begin_nonce
+        self.price_decimals = price_decimals
+        self.size_decimals = size_decimals
+
+    def __repr__(self):
+        kind = "snapshot" if self.is_snapshot else "update"
+        return f"OrderBookMessage(market_id={self.market_id}, {kind}, asks={len(self.asks)}, bids={len(self.bids)})"
+
+
+class Trade:
+    __slots__ = ("trade_id", "market_id", "price", "size", "is_maker_ask", "ask_account_id", "bid_account_id",
+                 "ask_client_id", "bid_client_id", "timestamp", "tx_hash", "price_decimals", "size_decimals")
+
+    def __init__(self, trade_id, market_id, price, size, is_maker_ask, ask_account_id, bid_account_id,
+                 ask_client_id, bid_client_id, timestamp, tx_hash, price_decimals, size_decimals):
+        self.trade_id = trade_id
+        self.market_id = market_id
+        self.price = price
+        self.size = size
+        self.is_maker_ask = is_maker_ask
+        self.ask_account_id = ask_account_id
+        self.bid_account_id = bid_account_id
+        self.ask_client_id = ask_client_id
+        self.bid_client_id = bid_client_id
+        self.timestamp = timestamp
+        self.tx_hash = tx_hash
+        self.price_decimals = price_decimals
+        self.size_decimals = size_decimals
+
+    def __repr__(self):
+        return f"Trade(trade_id={self.trade_id}, market_id={self.market_id}, price={self.price}, size={self.size})"
+
+
+class TradeMessage:
+    """trade/{market} and account_all_trades/{account} messages."""
+
+    __slots__ = ("channel", "is_snapshot", "trades")
+
+    def __init__(self, channel: str, is_snapshot: bool, trades: List[Trade]):
+        self.channel = channel
+        self.is_snapshot = is_snapshot
+        self.trades = trades
+
+    def __repr__(self):
+        return f"TradeMessage(channel={self.channel!r}, trades={len(self.trades)})"
+
+
+class Position:
+    """Position sizes and entry price are integer-scaled; USDC amounts stay float."""
+
+    __slots__ = ("market_id", "position", "avg_entry_price", "position_value", "unrealized_pnl", "realized_pnl",
+                 "open_order_count", "price_decimals", "size_decimals")
+
+    def __init__(self, market_id, position, avg_entry_price, position_value, unrealized_pnl, realized_pnl,
+                 open_order_count, price_decimals, size_decimals):
+        self.market_id = market_id
+        self.position = position  # signed
+        self.avg_entry_price = avg_entry_price
+        self.position_value = position_value
+        self.unrealized_pnl = unrealized_pnl
+        self.realized_pnl = realized_pnl
+        self.open_order_count = open_order_count
+        self.price_decimals = price_decimals
+        self.size_decimals = size_decimals
+
+    def __repr__(self):
+        return f"Position(market_id={self.market_id}, position={self.position}, avg_entry_price={self.avg_entry_price})"
+
+
+class AccountAllMessage:
+    __slots__ = ("account_id", "is_snapshot", "positions", "trades")
+
+    def __init__(self, account_id: int, is_snapshot: bool, positions: Dict[int, Position],
+                 trades: Dict[int, List[Trade]]):
+        self.account_id = account_id
+        self.is_snapshot = is_snapshot
+        self.positions = positions
+        self.trades = trades
+
+    def __repr__(self):
+        return f"AccountAllMessage(account_id={self.account_id}, positions={len(self.positions)})"
+
+
+class WsMessageDecoder:
+    """Decode frame dicts into the typed messages above.
+
+    Frames of other types are returned unchanged.
+    """
+
+    def __init__(self, price_decimals: Optional[Dict[int, int]] = None,
+                 size_decimals: Optional[Dict[int, int]] = None):
+        self.price_decimals = dict(price_decimals or {})
+        self.size_decimals = dict(size_decimals or {})
+        # markets whose decimals were given and must not be widened
+        self._fixed_price = set(self.price_decimals)
+        self._fixed_size = set(self.size_decimals)
+
+    def decode(self, message: dict):
+        message_type = message.get("type", "")
+        kind = message_type.partition("/")[2]
+        if kind == "order_book":
+            return self.decode_order_book(message)
+        if kind in ("trade", "account_all_trades"):
+            trades = message.get("trades")
+            if isinstance(trades, dict):
+                trades = [trade for market_trades in trades.values() for trade in market_trades]
+            return TradeMessage(
+                message.get("channel", "").replace(":", "/", 1),
+                message_type.startswith("subscribed/"),
+                self.decode_trades(trades or []),
+            )
+        if kind == "account_all":
+            return self.decode_account_all(message)
+        return message
+
+    def decode_order_book(self, message: dict) -> OrderBookMessage:
+        market_id = int(message["channel"].split(":")[1])
+        order_book = message["order_book"]
+        asks, bids = order_book.get("asks") or [], order_book.get("bids") or []
+        price_decimals = self.price_decimals.get(market_id, 0)
+        size_decimals = self.size_decimals.get(market_id, 0)
+        try:
+            ask_levels = _levels(asks, price_decimals, size_decimals)
+            bid_levels = _levels(bids, price_decimals, size_decimals)
+        except ValueError:
+            # more precision than seen so far on this market: widen, then redo
+            price_decimals = self._price_decimals(market_id, (lvl["price"] for side in (asks, bids) for lvl in side))
+            size_decimals = self._size_decimals(market_id, (lvl["size"] for side in (asks, bids) for lvl in side))
+            ask_levels = _levels(asks, price_decimals, size_decimals)
+            bid_levels = _levels(bids, price_decimals, size_decimals)
+        offset = message.get("offset", order_book.get("offset"))
+        return OrderBookMessage(
+            market_id,
+            message.get("type", "").startswith("subscribed/"),
+            ask_levels,
+            bid_levels,
+            offset,
+            order_book.get("nonce"),
+            order_book.get("begin_nonce"),
+            price_decimals,
+            size_decimals,
+        )
+
+    def decode_trades(self, trades: List[dict]) -> List[Trade]:
+        out = []
+        for trade in trades:
+            market_id = trade.get("market_id")
+            price_decimals = self._price_decimals(market_id, (trade["price"],))
+            size_decimals = self._size_decimals(market_id, (trade["size"],))
+            out.append(Trade(
+                trade.get("trade_id"),
+                market_id,
+                scale(trade["price"], price_decimals),
+                scale(trade["size"], size_decimals),
+                trade.get("is_maker_ask"),
+                trade.get("ask_account_id"),
+                trade.get("bid_account_id"),
+                trade.get("ask_client_id"),
+                trade.get("bid_client_id"),
+                trade.get("timestamp"),
+                trade.get("tx_hash"),
+                price_decimals,
+                size_decimals,
+            ))
+        return out
+
+    def decode_account_all(self, message: dict) -> AccountAllMessage:
+        positions = {}
+        for market, position in (message.get("positions") or {}).items():
+            market_id = int(market)
+            price_decimals = self._price_decimals(market_id, (position.get("avg_entry_price", "0"),))
+            size_decimals = self._size_decimals(market_id, (position.get("position", "0"),))
+            size = scale(position.get("position", "0"), size_decimals)
+            positions[market_id] = Position(
+                market_id,
+                -size if position.get("sign", 1) < 0 else size,
+                scale(position.get("avg_entry_price", "0"), price_decimals),
+                float(position.get("position_value", 0)),
+                float(position.get("unrealized_pnl", 0)),
+                float(position.get("realized_pnl", 0)),
+                position.get("open_order_count"),
+                price_decimals,
+                size_decimals,
+            )
+        trades = {int(market): self.decode_trades(market_trades)
+                  for market, market_trades in (message.get("trades") or {}).items()}
+        return AccountAllMessage(
+            int(message["channel"].split(":")[1]) if "channel" in message else message.get("account"),
+            message.get("type", "").startswith("subscribed/"),
+            positions,
+            trades,
+        )
+
+    def _price_decimals(self, market_id, values) -> int:
+        current = self.price_decimals.get(market_id, 0)
+        if market_id in self._fixed_price:
+            return current
+        needed = max((_decimals(v) for v in values), default=0)
+        if needed > current:
+            self.price_decimals[market_id] = current = needed
+        return current
+
+    def _size_decimals(self, market_id, values) -> int:
+        current = self.size_decimals.get(market_id, 0)
+        if market_id in self._fixed_size:
+            return current
+        needed = max((_decimals(v) for v in values), default=0)
+        if needed > current:
+            self.size_decimals[market_id] = current = needed
+        return current
@@ -0,0 +1,220 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from typing import Dict, List, Optional
+
+from lighter.order_book import OrderBook
+from lighter.ws_client import WsClient
+
+
+class WsEvent:
+    """One decoded update from a pool shard.
+
+    `data` is what a WsClient channel callback receives: the OrderBook for
+    order_book channels, the latest message for account_all, the raw message
+    otherwise. Shards running in worker processes send a top-of-book dict
+    instead of the OrderBook (see WsClientPool).
+    """
+
+    def __init__(self, recv_ns: int, shard: int, channel: str, data):
+        self.recv_ns = recv_ns  # time.monotonic_ns() when the shard decoded it
+        self.shard = shard
+        self.channel = channel
+        self.data = data
+
+    def __repr__(self):
+        return f"WsEvent(shard={self.shard}, channel={self.channel!r}, recv_ns={self.recv_ns})"
+
+
+def _top_of_book(book: OrderBook) -> dict:
+    return {
+        "best_bid": book.best_bid(),
+        "best_ask": book.best_ask(),
+        "price_decimals": book.price_decimals,
+        "size_decimals": book.size_decimals,
+        "nonce": book.nonce,
+        "offset": book.offset,
+    }
+
+
+def _run_shard_process(shard, channels, host, path, events, client_kwargs):
+    """Worker process entry: one WsClient, events forwarded to the parent queue."""
+
+    def forward(channel):
+        def callback(_, data):
+            if isinstance(data, OrderBook):
+                data = _top_of_book(data)
+            events.put(("event", time.monotonic_ns(), shard, channel, data))
+        return callback
+
+    async def main():
+        client = WsClient(host=host, path=path, **client_kwargs)
+        for channel in channels:
+            client.channels[channel] = forward(channel)
+        task = asyncio.create_task(client.run_async())
+        reconnects = 0
+        while not task.done():
+            await asyncio.sleep(1)
+            if client.reconnects != reconnects:
+                reconnects = client.reconnects
+                events.put(("reconnects", time.monotonic_ns(), shard, None, reconnects))
+        await task
+
+    asyncio.run(main())
+
+
+class WsClientPool:
+    """Shard channels over several WsClient connections and merge their updates.
+
+    Channels are spread round-robin over `shards` sockets. With
+    `use_processes=False` every shard runs on the caller's event loop, which
+    spreads socket buffering but still decodes on one core. With
+    `use_processes=True` each shard gets its own process (JSON decode and book
+    maintenance on its own core) and forwards events through a
+    multiprocessing queue; order_book events then carry a top-of-book dict
+    rather than the full OrderBook, and channels are fixed at start().
+
+    Consume the merged stream, in arrival order, with
+    `async for event in pool.events()`. `stats()` reports per-shard event
+    counts, reconnects and the lag from decode to consumption.
+    """
+
+    def __init__(
+        self,
+        channels: List[str],
+        shards: int = 2,
+        host=None,
+        path="/stream",
+        use_processes=False,
+        max_events=10000,
+        **client_kwargs,
+    ):
+        self.host = host
+        self.path = path
+        self.use_processes = use_processes
+        self.max_events = max_events
+        self.client_kwargs = client_kwargs
+
+        self.shard_channels: List[List[str]] = [[] for _ in range(max(1, shards))]
+        for i, channel in enumerate(channels):
+            self.shard_channels[i % len(self.shard_channels)].append(channel)
+
+        self._stats = [
+            {"channels": len(c), "events": 0, "dropped": 0, "reconnects": 0, "max_lag_us": 0.0, "total_lag_us": 0.0}
+            for c in self.shard_channels
+        ]
+        self._queue: Optional[asyncio.Queue] = None
+        self._clients: List[WsClient] = []
+        self._tasks: List[asyncio.Task] = []
+        self._processes: List[multiprocessing.Process] = []
+        self._mp_events = None
+        self._bridge: Optional[threading.Thread] = None
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_events)
+        if self.use_processes:
+            self._start_processes()
+            return
+        for shard, channels in enumerate(self.shard_channels):
+            client = WsClient(host=self.host, path=self.path, **self.client_kwargs)
+            for channel in channels:
+                client.channels[channel] = self._callback(shard, channel)
+            self._clients.append(client)
+            self._tasks.append(asyncio.create_task(client.run_async()))
+
+    async def subscribe(self, channel: str):
+        """Add a channel on the least loaded shard (in-process shards only)."""
+        if self.use_processes:
+            raise Exception("channels are fixed at start() when shards run in processes")
+        shard = min(range(len(self.shard_channels)), key=lambda i: len(self.shard_channels[i]))
+        self.shard_channels[shard].append(channel)
+        self._stats[shard]["channels"] += 1
+        await self._clients[shard].subscribe(channel, self._callback(shard, channel))
+
+    async def unsubscribe(self, channel: str):
+        for shard, channels in enumerate(self.shard_channels):
+            if channel in channels:
+                channels.remove(channel)
+                self._stats[shard]["channels"] -= 1
+                if not self.use_processes:
+                    await self._clients[shard].unsubscribe(channel)
+                return
+
+    async def events(self):
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                return
+            stats = self._stats[event.shard]
+            lag_us = (time.monotonic_ns() - event.recv_ns) / 1e3
+            stats["total_lag_us"] += lag_us
+            if lag_us > stats["max_lag_us"]:
+                stats["max_lag_us"] = lag_us
+            yield event
+
+    def stats(self) -> List[Dict]:
+        out = []
+        for shard, stats in enumerate(self._stats):
+            stats = dict(stats, shard=shard)
+            if not self.use_processes and shard < len(self._clients):
+                stats["reconnects"] = self._clients[shard].reconnects
+            stats["mean_lag_us"] = stats["total_lag_us"] / stats["events"] if stats["events"] else None
+            out.append(stats)
+        return out
+
+    async def close(self):
+        for client in self._clients:
+            await client.close()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for process in self._processes:
+            process.terminate()
+            process.join()
+        if self._mp_events is not None:
+            self._mp_events.put(None)
+            self._bridge.join()
+        if self._queue is not None:
+            while self._queue.full():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+
+    def _callback(self, shard, channel):
+        def callback(_, data):
+            self._push(WsEvent(time.monotonic_ns(), shard, channel, data))
+        return callback
+
+    def _push(self, event: WsEvent):
+        stats = self._stats[event.shard]
+        try:
+            self._queue.put_nowait(event)
+            stats["events"] += 1
+        except asyncio.QueueFull:
+            stats["dropped"] += 1
+
+    def _start_processes(self):
+        ctx = multiprocessing.get_context("spawn")
+        self._mp_events = ctx.Queue()
+        for shard, channels in enumerate(self.shard_channels):
+            process = ctx.Process(
+                target=_run_shard_process,
+                args=(shard, channels, self.host, self.path, self._mp_events, self.client_kwargs),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+        loop = asyncio.get_running_loop()
+
+        def bridge():
+            while True:
+                item = self._mp_events.get()
+                if item is None:
+                    return
+                kind, recv_ns, shard, channel, data = item
+                if kind == "reconnects":
+                    self._stats[shard]["reconnects"] = data
+                else:
+                    loop.call_soon_threadsafe(self._push, WsEvent(recv_ns, shard, channel, data))
+
+        self._bridge = threading.Thread(target=bridge, name="lighter-ws-pool", daemon=True)
+        self._bridge.start()
@@ -0,0 +1,232 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Dict, List, Optional
+
+import websockets
+from websockets.asyncio.client import connect as connect_async
+
+from lighter import codec
+from lighter.configuration import Configuration
+
+CODE_OK = 200
+
+
+class TxAck:
+    """Outcome of one transaction sent through WsTxSender."""
+
+    def __init__(self, tx_hash, api_key_index, nonce, code=None, message=None, error=None, ack_ns=None):
+        self.tx_hash = tx_hash
+        self.api_key_index = api_key_index
+        self.nonce = nonce
+        self.code = code
+        self.message = message
+        self.error = error
+        self.ack_ns = ack_ns  # perf_counter_ns() when the ack frame arrived
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def response_missing(self) -> bool:
+        return self.ack_ns is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"TxAck(tx_hash={self.tx_hash!r}, api_key_index={self.api_key_index}, nonce={self.nonce}, {status})"
+
+
+class WsTxSender:
+    """Submit signed transactions over one persistent WebSocket.
+
+    Single txs go out as `jsonapi/sendtx`, batches as `jsonapi/sendtxbatch`.
+    Every frame carries a request id; a reader task matches acks back to the
+    request and resolves one TxAck per tx with its hash and nonce. Rejected txs
+    are reported to `nonce_manager` the same way SignerClient does for REST.
+    """
+
+    def __init__(
+        self,
+        host=None,
+        path="/stream",
+        nonce_manager=None,
+        ack_timeout=10.0,
+        headers={},
+    ):
+        if host is None:
+            host = Configuration.get_default().host.replace("https://", "")
+
+        self.base_url = host + path if "://" in host else f"wss://{host}{path}"
+        self.nonce_manager = nonce_manager
+        self.ack_timeout = ack_timeout
+        self.headers = headers
+
+        self.ws = None
+        self._reader_task = None
+        self._connect_lock = asyncio.Lock()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._request_ids = itertools.count()
+
+    async def connect(self):
+        async with self._connect_lock:
+            if self.ws is not None:
+                return
+            ws = await connect_async(self.base_url, additional_headers=self.headers, ping_interval=None)
+            message = codec.loads(await ws.recv())
+            if message.get("type") != "connected":
+                await ws.close()
+                raise Exception(f"Unexpected init message: {message}")
+            self.ws = ws
+            self._reader_task = asyncio.create_task(self._reader(ws))
+
+    async def close(self):
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            await ws.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+
+    async def send_tx(
+        self,
+        tx_type: int,
+        tx_info: str,
+        tx_hash: Optional[str] = None,
+        api_key_index: Optional[int] = None,
+        nonce: Optional[int] = None,
+    ) -> TxAck:
+        """Send one signed tx. tx_info goes into the frame unparsed; it is only
+        decoded for its ApiKeyIndex/Nonce when those are not passed in."""
+        response = await self._request(lambda request_id: codec.sendtx_frame(request_id, tx_type, tx_info))
+        if api_key_index is None or nonce is None:
+            meta = codec.loads(tx_info)
+        else:
+            meta = {"ApiKeyIndex": api_key_index, "Nonce": nonce}
+        ack = self._make_ack(meta, tx_hash, response, 0)
+        self._settle_nonces([ack])
+        return ack
+
+    async def send_tx_batch(
+        self, tx_types: List[int], tx_infos: List[str], tx_hashes: Optional[List[Optional[str]]] = None
+    ) -> List[TxAck]:
+        if len(tx_types) != len(tx_infos):
+            raise Exception("Tx types and tx infos must be of same length")
+        if len(tx_types) == 0:
+            raise Exception("Empty tx types and tx infos")
+        if tx_hashes is None:
+            tx_hashes = [None] * len(tx_infos)
+
+        tx_types_json, tx_infos_json = codec.dumps(tx_types), codec.dumps(tx_infos)
+        response = await self._request(lambda request_id: codec.dumps({
+            "type": "jsonapi/sendtxbatch",
+            "data": {"id": request_id, "tx_types": tx_types_json, "tx_infos": tx_infos_json},
+        }))
+        acks = [self._make_ack(codec.loads(tx_info), tx_hash, response, i)
+                for i, (tx_info, tx_hash) in enumerate(zip(tx_infos, tx_hashes))]
+        self._settle_nonces(acks)
+        return acks
+
+    async def _request(self, build_frame):
+        """Send build_frame(request_id) and wait for its ack.
+
+        Returns (recv_ns, message), or None on timeout.
+        """
+        if self.ws is None:
+            await self.connect()
+
+        request_id = f"tx_{next(self._request_ids)}"
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self.ws.send(build_frame(request_id))
+            return await asyncio.wait_for(future, timeout=self.ack_timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _reader(self, ws):
+        try:
+            async for raw in ws:
+                recv_ns = time.perf_counter_ns()
+                try:
+                    message = codec.loads(raw)
+                except codec.DecodeError:
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                message_type = message.get("type")
+                if message_type == "ping":
+                    await ws.send(codec.dumps({"type": "pong"}))
+                    continue
+
+                data = message.get("data")
+                if not isinstance(data, dict):
+                    data = {}
+                request_id = data.get("id") or message.get("id")
+                future = self._pending.get(request_id)
+                if future is not None and not future.done():
+                    future.set_result((recv_ns, message))
+        except websockets.ConnectionClosed:
+            pass
+        except Exception:
+            # nobody awaits this task; log instead of leaving it unretrieved
+            logging.exception("WsTxSender reader failed")
+        finally:
+            if self.ws is ws:
+                self.ws = None
+            await ws.close()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("tx websocket closed before ack"))
+
+    @staticmethod
+    def _make_ack(tx_info: dict, tx_hash: Optional[str], response, position: int) -> TxAck:
+        ack = TxAck(tx_hash, tx_info.get("ApiKeyIndex"), tx_info.get("Nonce"))
+        if response is None:
+            ack.error = "ack timeout"
+            return ack
+
+        ack.ack_ns, message = response
+        data = message.get("data")
+        if not isinstance(data, dict):
+            data = {}
+        error = message.get("error") or data.get("error")
+        if isinstance(error, dict):
+            error = error.get("message") or codec.dumps(error)
+
+        ack.code = data.get("code", message.get("code"))
+        ack.message = data.get("message", message.get("message"))
+        if error is None and ack.code is not None and ack.code != CODE_OK:
+            error = ack.message or f"code {ack.code}"
+        ack.error = error
+
+        hashes = data.get("tx_hash")
+        if isinstance(hashes, list):
+            hashes = hashes[position] if position < len(hashes) else None
+        if hashes:
+            ack.tx_hash = hashes
+        return ack
+
+    def _settle_nonces(self, acks: List[TxAck]):
+        """Report each ack to the nonce manager. Keys rejected for their nonce
+        are repaired from the acks and error payloads, without a round trip
+        on the send path (see NonceManager.recover_nonce)."""
+        if self.nonce_manager is None:
+            return
+        resync = {}
+        for ack in acks:
+            # A timed-out tx may still land; leave its nonce alone
+            if ack.response_missing or ack.api_key_index is None:
+                continue
+            if ack.ok:
+                self.nonce_manager.acknowledge_success(ack.api_key_index, ack.nonce)
+            elif "invalid nonce" in ack.error:
+                self.nonce_manager.acknowledge_failure(ack.api_key_index, ack.nonce)
+                resync.setdefault(ack.api_key_index, ack.error)
+            else:
+                self.nonce_manager.acknowledge_failure(ack.api_key_index, ack.nonce)
+        for api_key_index, error in resync.items():
+            self.nonce_manager.recover_nonce(api_key_index, error)
@@ -30,7 +30,7 @@ REQUIRES = [
     "aiohttp-retry >= 2.8.3",
     "pydantic >= 2",
     "typing-extensions >= 4.7.1",
-    "websockets >= 12.0.0",
+    "websockets >= 13.0",
     "eth-account >= 0.13.4",
     "requests >= 2.31.0",
 ]
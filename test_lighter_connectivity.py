@@ -11,8 +11,11 @@ Usage:
 """
 
 import asyncio
+import itertools
 import json
+import math
 import signal
+import statistics
 import sys
 import time
 from datetime import datetime, timezone
@@ -20,7 +23,7 @@ from datetime import datetime, timezone
 import websockets
 
 import lighter
-from lighter import AccountApi
+from lighter import AccountApi, OrderBook, codec, sessions
 
 # ============================================================
 # === EDIT THESE ===
@@ -40,6 +43,29 @@ ORDER_TIMEOUT = 10  # seconds
 LIMIT_PRICE_DISCOUNT = 0.95  # 5% below best bid
 FILL_TIMEOUT = 5  # seconds to wait for fill notification after ack
 
+# Benchmark mode: N BUY/SELL round-trips instead of a single BUY + SELL
+BENCHMARK_ROUNDS = 0  # 0 = single-shot taker test
+BENCHMARK_PACING = 1.0  # seconds to sleep between round-trips
+BENCHMARK_SIZE_WEI = TEST_SIZE_WEI
+BENCHMARK_SAMPLES_FILE = None  # e.g. "s2f_samples.json" to dump raw samples
+
+# Pre-signed order pool: benchmark also runs round-trips with signing off
+# the S2F path, and reports both
+PRESIGN_POOL = False
+PRESIGN_SLIPPAGES = (0.002, SLIPPAGE, 0.01)  # worst-price ladder
+PRESIGN_SIZES_WEI = (TEST_SIZE_WEI,)
+PRESIGN_REFRESH_BPS = 10  # re-sign when the mid moves more than this
+PRESIGN_MAX_AGE = 60  # seconds before the ladder is re-signed regardless
+
+# Pipelined mode: keep K orders in flight at once, for each K listed
+PIPELINE_DEPTHS = ()  # e.g. (1, 2, 4, 8); empty = disabled
+PIPELINE_ORDERS = 8  # orders per depth, alternating BUY/SELL (keep even)
+
+# Taker WS session reconnects (exponential backoff)
+RECONNECT_ATTEMPTS = 5
+RECONNECT_BACKOFF = 0.5  # seconds, doubled per attempt
+RECONNECT_BACKOFF_MAX = 8.0  # seconds
+
 # WS URL derived from API URL
 WS_URL = API_URL.replace("https://", "wss://") + "/stream"
 
@@ -74,6 +100,12 @@ class Results:
         self.taker_sell_send_to_ack_ms = None
         self.taker_sell_ack_to_fill_ms = None
         self.taker_sell_s2f_ms = None
+        # Benchmark mode: one dict per BUY/SELL leg, raw ms values
+        self.benchmark_samples = []
+        self.benchmark_rounds_done = 0
+        self.benchmark_failures = 0
+        # Pipelined mode: one dict per depth K (see test_taker_pipelined)
+        self.pipeline_runs = []
         # Binance
         self.binance_ws_connect_ms = None
         self.binance_ping_rtt_ms = None
@@ -87,6 +119,36 @@ class Results:
 
 results = Results()
 
+# (sample key, summary label) for the benchmark percentile table
+BENCHMARK_METRICS = (
+    ("signing_ms", "Signing"),
+    ("send_to_ack_ms", "Send -> Ack"),
+    ("ack_to_fill_ms", "Ack -> Fill"),
+    ("s2f_ms", "Total S2F"),
+)
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def _summarize(values):
+    """Return p50/p90/p99/max/stddev of the non-None values, or None if empty."""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return {
+        "n": len(values),
+        "p50": _percentile(values, 50),
+        "p90": _percentile(values, 90),
+        "p99": _percentile(values, 99),
+        "max": values[-1],
+        "stddev": statistics.pstdev(values),
+    }
+
+
 # Global state for cleanup on Ctrl+C
 _signer_client = None
 _cleanup_done = False
@@ -174,9 +236,54 @@ def _print_summary():
         avg = (results.taker_buy_s2f_ms + results.taker_sell_s2f_ms) / 2
         print(f"  Average S2F:        {avg:.0f}ms")
 
+    if results.benchmark_samples or results.benchmark_failures:
+        _print_benchmark_stats()
+
+    if results.pipeline_runs:
+        _print_pipeline_stats()
+
     print("=" * 60)
 
 
+def _print_pipeline_stats():
+    print(f"  Pipelined ({PIPELINE_ORDERS} orders per depth):")
+    print(f"    {'K':>3}{'done':>6}{'ord/s':>8}{'ack p50':>9}{'ack p99':>9}{'s2f p50':>9}{'s2f p99':>9}")
+    for run in results.pipeline_runs:
+        ack = _summarize(s["send_to_ack_ms"] for s in run["samples"])
+        s2f = _summarize(s["s2f_ms"] for s in run["samples"])
+        cols = []
+        for stats in (ack, s2f):
+            for key in ("p50", "p99"):
+                cols.append(f"{stats[key]:>9.1f}" if stats else f"{'-':>9}")
+        print(f"    {run['depth']:>3}{len(run['samples']):>6}{run['throughput']:>8.1f}{''.join(cols)}")
+
+
+def _print_benchmark_stats():
+    legs = len(results.benchmark_samples)
+    print(f"  Benchmark:          {results.benchmark_rounds_done} round-trips "
+          f"({legs} legs, {results.benchmark_failures} failed)")
+    modes = sorted({s["mode"] for s in results.benchmark_samples}, reverse=True)
+    for mode in modes:
+        samples = [s for s in results.benchmark_samples if s["mode"] == mode]
+        if len(modes) > 1:
+            print(f"    {'Signed at signal' if mode == 'sign' else 'Pre-signed pool'}:")
+        print(f"    {'Metric':<14}{'N':>4}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}{'stddev':>8}")
+        for key, label in BENCHMARK_METRICS:
+            stats = _summarize(s[key] for s in samples)
+            if stats is None:
+                print(f"    {label:<14}{0:>4}{'-':>8}{'-':>8}{'-':>8}{'-':>8}{'-':>8}")
+                continue
+            print(f"    {label:<14}{stats['n']:>4}{stats['p50']:>8.1f}{stats['p90']:>8.1f}"
+                  f"{stats['p99']:>8.1f}{stats['max']:>8.1f}{stats['stddev']:>8.1f}")
+
+    if len(modes) > 1:
+        signed = _summarize(s["s2f_ms"] for s in results.benchmark_samples if s["mode"] == "sign")
+        pooled = _summarize(s["s2f_ms"] for s in results.benchmark_samples if s["mode"] == "pool")
+        if signed and pooled:
+            print(f"    Pool saves:       {signed['p50'] - pooled['p50']:.1f}ms S2F p50, "
+                  f"{signed['p99'] - pooled['p99']:.1f}ms p99")
+
+
 # ------------------------------------------------------------------
 # Test 0: Binance Perps Ticker Latency
 # ------------------------------------------------------------------
@@ -323,16 +430,12 @@ async def test_geo_block():
                 results.orderbook_sub_ms = sub_ms
                 print(f"  Orderbook Subscribe: PASS ({sub_ms:.0f}ms)")
 
-                ob = data.get("order_book", {})
-                bids = ob.get("bids", [])
-                asks = ob.get("asks", [])
-
-                if bids:
-                    bids.sort(key=lambda x: float(x["price"]), reverse=True)
-                    best_bid = float(bids[0]["price"])
-                if asks:
-                    asks.sort(key=lambda x: float(x["price"]))
-                    best_ask = float(asks[0]["price"])
+                book = OrderBook()
+                book.apply_snapshot(data.get("order_book", {}))
+                if book.best_bid():
+                    best_bid = book.price_to_float(book.best_bid()[0])
+                if book.best_ask():
+                    best_ask = book.price_to_float(book.best_ask()[0])
 
                 results.best_bid = best_bid
                 results.best_ask = best_ask
@@ -367,10 +470,14 @@ async def pre_flight():
             account_index=ACCOUNT_INDEX,
             api_private_keys={API_KEY_INDEX: PRIVATE_KEY},
         )
+        timings = await signer.warmup()
     except Exception as e:
         print(f"  Credentials:       FAIL ({e})")
         return None
 
+    phases = ", ".join(f"{phase} {ms:.0f}ms" for phase, ms in timings.items() if phase != "warmup")
+    print(f"  Startup:           {timings['warmup']:.0f}ms ({phases})")
+
     err = signer.check_client()
     if err is not None:
         print(f"  Credentials:       FAIL ({err})")
@@ -379,8 +486,8 @@ async def pre_flight():
     print("  Credentials:       OK")
     _signer_client = signer
 
-    # Query account
-    api_client = lighter.ApiClient(configuration=lighter.Configuration(host=API_URL))
+    # Query account on the signer's session
+    api_client = sessions.acquire(API_URL)
     account_api = AccountApi(api_client)
 
     try:
@@ -416,7 +523,7 @@ async def pre_flight():
     except Exception as e:
         print(f"  Account query:     WARN ({e})")
 
-    await api_client.close()
+    await sessions.release(api_client)
 
     results.preflight_ok = True
     print()
@@ -426,11 +533,18 @@ async def pre_flight():
 # ------------------------------------------------------------------
 # Test 2: Taker Order Latency (WebSocket)
 # ------------------------------------------------------------------
-def _sign_order(signer, size_wei, is_ask, worst_price):
+_request_ids = itertools.count()
+_order_indexes = itertools.count(int(time.time() * 1000))
+
+
+def _sign_order(signer, size_wei, is_ask, worst_price, api_key_index=None, nonce=None):
     """Sign a market order. Returns (order_index, payload_dict, error)."""
-    order_index = int(time.time() * 1000) % 2**31
+    # Distinct per order, even for several signed within the same millisecond
+    order_index = next(_order_indexes) % 2**31
 
-    api_key_index, nonce = signer.nonce_manager.next_nonce()
+    reserved = nonce is None
+    if reserved:
+        api_key_index, nonce = signer.nonce_manager.next_nonce()
     tx_type, tx_info, tx_hash, err = signer.sign_create_order(
         market_index=MARKET_INDEX,
         client_order_index=order_index,
@@ -444,52 +558,149 @@ def _sign_order(signer, size_wei, is_ask, worst_price):
         api_key_index=api_key_index,
     )
     if err is not None:
+        if reserved:
+            signer.nonce_manager.acknowledge_failure(api_key_index, nonce)
         return order_index, None, f"sign: {err}"
 
+    # The frame is built here so sending is just a write; tx_info is spliced
+    # in verbatim rather than decoded and re-encoded
+    request_id = f"req_{int(time.time()*1000)}_{next(_request_ids)}"
     payload = {
-        "type": "jsonapi/sendtx",
-        "data": {
-            "id": f"req_{int(time.time()*1000)}",
-            "tx_type": tx_type,
-            "tx_info": json.loads(tx_info),
-        },
+        "id": request_id,
+        "frame": codec.sendtx_frame(request_id, tx_type, tx_info),
+        "api_key_index": api_key_index,
+        "nonce": nonce,
     }
     return order_index, payload, None
 
 
-async def _send_and_measure(signer, order_ws, size_wei, is_ask, worst_price):
+class PresignedOrderPool:
+    """Ladder of signed IOC market orders ready to send at signal time.
+
+    Every entry (side x size x slippage) is signed with the same reserved
+    nonce: exactly one of them gets sent, after which refresh() reserves the
+    next nonce and re-signs the ladder. While the pool holds a reservation no
+    other order may use the nonce manager — release() hands it back first.
+    """
+
+    def __init__(self, signer, slippages=PRESIGN_SLIPPAGES, sizes=PRESIGN_SIZES_WEI):
+        self.signer = signer
+        self.slippages = sorted(slippages)
+        self.sizes = sizes
+        self.entries = {}  # (is_ask, size_wei, slippage) -> (order_index, payload)
+        self.api_key_index = None
+        self.nonce = None
+        self.mid = None
+        self.signed_at = None
+        self.resigns = 0
+
+    def refresh(self, best_bid, best_ask):
+        """Re-sign the ladder if it was used, is stale, or the book moved.
+
+        Returns an error string or None.
+        """
+        mid = (best_bid + best_ask) / 2
+        if self.nonce is not None and self.entries:
+            moved_bps = abs(mid - self.mid) / self.mid * 1e4
+            age = time.monotonic() - self.signed_at
+            if moved_bps <= PRESIGN_REFRESH_BPS and age <= PRESIGN_MAX_AGE:
+                return None
+
+        if self.nonce is None:
+            self.api_key_index, self.nonce = self.signer.nonce_manager.next_nonce()
+
+        entries = {}
+        for is_ask in (False, True):
+            for size_wei in self.sizes:
+                for slippage in self.slippages:
+                    if is_ask:
+                        worst_price = int(best_bid * (1 - slippage) * 100)
+                    else:
+                        worst_price = int(best_ask * (1 + slippage) * 100)
+                    order_index, payload, err = _sign_order(
+                        self.signer, size_wei, is_ask, worst_price,
+                        api_key_index=self.api_key_index, nonce=self.nonce,
+                    )
+                    if err is not None:
+                        self.entries = {}
+                        return err
+                    entries[(is_ask, size_wei, slippage)] = (order_index, payload)
+
+        self.entries = entries
+        self.mid = mid
+        self.signed_at = time.monotonic()
+        self.resigns += 1
+        return None
+
+    def take(self, is_ask, size_wei, max_slippage):
+        """Pop the widest pre-signed order within max_slippage.
+
+        Returns (order_index, payload, error). The whole ladder is spent,
+        since its siblings share the nonce that is about to be used.
+        """
+        fits = [s for s in self.slippages if s <= max_slippage]
+        entry = self.entries.get((is_ask, size_wei, fits[-1])) if fits else None
+        if entry is None:
+            return None, None, "presign: no matching pool entry"
+        self.entries = {}
+        self.nonce = None
+        return entry[0], entry[1], None
+
+    def release(self):
+        """Give the reserved nonce back to the nonce manager."""
+        if self.nonce is not None:
+            self.signer.nonce_manager.acknowledge_failure(self.api_key_index, self.nonce)
+        self.entries = {}
+        self.nonce = None
+
+
+async def _send_and_measure(signer, session, size_wei, is_ask, worst_price, pool=None):
     """Sign and send a market order, capturing granular timestamps.
 
     Returns (order_index, t0, t1, t3, ws_response, error).
-    t0 = signal (before signing), t1 = signing done, t3 = ack received.
+    t0 = signal (before signing), t1 = signing done, t3 = ack frame arrival.
+    With a PresignedOrderPool, "signing" is taking a ready order within
+    SLIPPAGE from the pool and worst_price is ignored.
+    The fill waiter is registered before sending so that a fill racing the
+    ack is still stamped on arrival; collect it with _wait_for_fill().
     """
     t0 = time.perf_counter()
-    order_index, payload, err = _sign_order(signer, size_wei, is_ask, worst_price)
+    if pool is not None:
+        order_index, payload, err = pool.take(is_ask, size_wei, SLIPPAGE)
+    else:
+        order_index, payload, err = _sign_order(signer, size_wei, is_ask, worst_price)
     t1 = time.perf_counter()
 
     if err is not None:
         return order_index, t0, t1, None, None, err
 
-    await order_ws.send(json.dumps(payload))
-
+    ack = session.expect_ack(payload["id"], order_index)
+    session.expect_fill(order_index, is_ask)
     try:
-        ws_resp = await asyncio.wait_for(order_ws.recv(), timeout=ORDER_TIMEOUT)
-        t3 = time.perf_counter()
-        return order_index, t0, t1, t3, ws_resp, None
+        await session.send_order(payload["frame"])
+        t3_ns, ws_resp = await asyncio.wait_for(ack, timeout=ORDER_TIMEOUT)
+        _settle_nonce(signer, payload, ws_resp)
+        return order_index, t0, t1, t3_ns / 1e9, ws_resp, None
     except asyncio.TimeoutError:
-        return order_index, t0, t1, None, None, "ws response timeout"
+        # A timed-out order may still land; leave its nonce alone
+        err = "ws response timeout"
+    except ConnectionError as e:
+        err = f"order ws: {e}"
+    session.forget(payload["id"], order_index)
+    return order_index, t0, t1, None, None, err
 
 
-def _is_fill_for_order(msg, order_index, is_ask):
-    """Check if a WS trade message corresponds to our order.
+def _our_fills(msg):
+    """Yield (is_ask, client_id) for each trade in a WS message where we traded.
 
     For a BUY (is_ask=False), we are the bid side.
     For a SELL (is_ask=True), we are the ask side.
+    client_id is None when the trade doesn't carry a client order index.
     """
     msg_type = msg.get("type", "")
     # Accept both account_all_trades and account_all update messages
     if "update" not in msg_type:
-        return False
+        return
 
     # Look for trades in the message — the format may be:
     # {"trades": {"0": [...]}} keyed by market_index, or
@@ -501,52 +712,33 @@ def _is_fill_for_order(msg, order_index, is_ask):
     elif isinstance(trades, list):
         market_trades = trades
     else:
-        return False
+        return
 
     for trade in market_trades:
-        # Match by account_id
-        if is_ask:
-            acct_id = trade.get("ask_account_id")
-            client_id = trade.get("ask_client_id")
-        else:
-            acct_id = trade.get("bid_account_id")
-            client_id = trade.get("bid_client_id")
-
-        if acct_id is not None and int(acct_id) != ACCOUNT_INDEX:
-            continue
-
-        # If client_order_index is present, match it
-        if client_id is not None and int(client_id) == order_index:
-            return True
-
-        # If no client_id field or it doesn't match, accept by account_id alone
-        if acct_id is not None and int(acct_id) == ACCOUNT_INDEX:
-            return True
-
-    return False
+        for is_ask, side in ((True, "ask"), (False, "bid")):
+            acct_id = trade.get(f"{side}_account_id")
+            if acct_id is None or int(acct_id) != ACCOUNT_INDEX:
+                continue
+            client_id = trade.get(f"{side}_client_id")
+            yield is_ask, int(client_id) if client_id is not None else None
 
 
-async def _wait_for_fill(fill_ws, order_index, is_ask, timeout=FILL_TIMEOUT):
-    """Wait for a fill notification on the fill listener WS.
+async def _wait_for_fill(session, order_index, timeout=FILL_TIMEOUT):
+    """Wait for the fill registered by _send_and_measure().
 
-    Handles ping/pong and filters for our specific order.
-    Returns the fill message or None on timeout.
+    Returns (t4, fill_msg), t4 being the perf_counter() arrival time of the
+    fill frame, or None on timeout.
     """
-    deadline = time.perf_counter() + timeout
-    while True:
-        remaining = deadline - time.perf_counter()
-        if remaining <= 0:
-            return None
-        try:
-            raw = await asyncio.wait_for(fill_ws.recv(), timeout=remaining)
-        except asyncio.TimeoutError:
-            return None
-        msg = json.loads(raw)
-        if msg.get("type") == "ping":
-            await fill_ws.send(json.dumps({"type": "pong"}))
-            continue
-        if _is_fill_for_order(msg, order_index, is_ask):
-            return msg
+    fut = session.fill_future(order_index)
+    if fut is None:
+        return None
+    try:
+        t4_ns, msg = await asyncio.wait_for(fut, timeout=timeout)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        session.forget(None, order_index)
+    return t4_ns / 1e9, msg
 
 
 async def _setup_fill_listener():
@@ -615,64 +807,276 @@ async def _setup_fill_listener():
     return fill_ws, setup_ms
 
 
-def _check_ack_error(ws_resp, label):
+def _ack_error(ws_resp):
+    """The error carried by a WS ack, or None (also for unparseable acks)."""
+    try:
+        resp_data = codec.loads(ws_resp)
+    except codec.DecodeError:
+        return None
+    data = resp_data.get("data")
+    return resp_data.get("error") or (data.get("error") if isinstance(data, dict) else None)
+
+
+def _settle_nonce(signer, payload, ws_resp):
+    """Report an order's ack to the nonce manager, repairing the key's
+    nonce from the ack itself when it was rejected for its nonce."""
+    api_key_index, nonce = payload["api_key_index"], payload["nonce"]
+    err_msg = _ack_error(ws_resp)
+    if err_msg is None:
+        signer.nonce_manager.acknowledge_success(api_key_index, nonce)
+        return
+    err_msg = err_msg if isinstance(err_msg, str) else codec.dumps(err_msg)
+    signer.nonce_manager.acknowledge_failure(api_key_index, nonce)
+    if "invalid nonce" in err_msg.lower():
+        signer.nonce_manager.recover_nonce(api_key_index, err_msg)
+
+
+def _check_ack_error(ws_resp, label, verbose=True):
     """Parse WS ack response and check for errors. Returns error message or None."""
     if not ws_resp:
         return None
     try:
-        resp_data = json.loads(ws_resp)
-        resp_str = json.dumps(resp_data, indent=None)
-        if len(resp_str) > 200:
-            resp_str = resp_str[:200] + "..."
-        print(f"  WS Response:       {resp_str}")
-        err_msg = resp_data.get("error") or resp_data.get("data", {}).get("error")
+        resp_data = codec.loads(ws_resp)
+        if verbose:
+            resp_str = json.dumps(resp_data, indent=None)
+            if len(resp_str) > 200:
+                resp_str = resp_str[:200] + "..."
+            print(f"  WS Response:       {resp_str}")
+        err_msg = _ack_error(ws_resp)
         if err_msg:
-            print(f"  {label} rejected:     {err_msg}")
+            if verbose:
+                print(f"  {label} rejected:     {err_msg}")
             return f"{label.lower()} rejected: {err_msg}"
-    except json.JSONDecodeError:
-        print(f"  WS Response:       {ws_resp[:200]}")
+    except codec.DecodeError:
+        if verbose:
+            print(f"  WS Response:       {ws_resp[:200]}")
     return None
 
 
-async def test_taker_latency(signer, best_ask, best_bid):
-    """Place market BUY via WS, then SELL to flatten. Measure signal-to-fill latency."""
-    print("[2/2] Taker Signal-to-Fill Latency Test")
+async def _setup_order_ws():
+    """Connect the order sender WS and drain its "connected" message.
 
-    if best_ask <= 0 or best_bid <= 0:
-        print("  SKIP: No valid orderbook data")
-        results.taker_error = "no orderbook data"
-        print()
-        return
+    Returns (order_ws, error).
+    """
+    try:
+        order_ws = await asyncio.wait_for(
+            websockets.connect(WS_URL, ping_interval=None),
+            timeout=ORDER_TIMEOUT,
+        )
+        init_msg = await asyncio.wait_for(order_ws.recv(), timeout=5)
+        init_data = json.loads(init_msg)
+        if init_data.get("type") == "connected":
+            print(f"  Order WS:          connected")
+        else:
+            print(f"  Order WS:          unexpected init: {init_data.get('type')}")
+    except Exception as e:
+        print(f"  Order WS Connect:  FAIL ({e})")
+        return None, f"order ws connect: {e}"
+    return order_ws, None
 
-    fill_ws = None
-    order_ws = None
 
-    try:
-        # --- Setup fill listener WS (must be ready before placing orders) ---
+class TakerSession:
+    """Fill listener + order sender sockets shared by any number of measurements.
+
+    A reader task per socket owns recv(): it stamps every frame with
+    perf_counter_ns() on arrival, answers server pings, and routes acks (by
+    request id) and fills (by client order index) into futures registered
+    before the order is sent. A dropped socket is reconnected with
+    exponential backoff.
+    """
+
+    def __init__(self):
+        self.fill_ws = None
+        self.order_ws = None
+        self.fill_enabled = False
+        self.reconnects = 0
+        self._acks = {}  # request id -> (client order index, Future[(t_ns, raw)])
+        self._fills = {}  # client order index -> (is_ask, Future[(t_ns, msg)])
+        self._readers = []
+
+    async def connect(self):
+        """Open both sockets. Returns an error string if the order WS fails."""
         fill_ws, setup_ms = await _setup_fill_listener()
         if fill_ws is None:
             print("  WARNING: Fill listener failed — will measure ack latency only")
         else:
             results.fill_listener_setup_ms = setup_ms
+            self.fill_ws = fill_ws
+            self.fill_enabled = True
+
+        order_ws, err = await _setup_order_ws()
+        if order_ws is None:
+            return err
+        self.order_ws = order_ws
+        kinds = ["order"] + (["fill"] if self.fill_enabled else [])
+        self._readers = [asyncio.create_task(self._reader(kind)) for kind in kinds]
+        return None
+
+    def expect_ack(self, request_id, order_index=None):
+        fut = asyncio.get_running_loop().create_future()
+        self._acks[request_id] = (order_index, fut)
+        return fut
+
+    def expect_fill(self, order_index, is_ask):
+        if self.fill_enabled:
+            fut = asyncio.get_running_loop().create_future()
+            self._fills[order_index] = (is_ask, fut)
+
+    def fill_future(self, order_index):
+        entry = self._fills.get(order_index)
+        return entry[1] if entry else None
+
+    def forget(self, request_id, order_index):
+        self._acks.pop(request_id, None)
+        self._fills.pop(order_index, None)
 
-        # --- Setup order sender WS ---
+    async def send_order(self, frame):
+        if self.order_ws is None:
+            raise ConnectionError("not connected")
         try:
-            order_ws = await asyncio.wait_for(
-                websockets.connect(WS_URL, ping_interval=None),
-                timeout=ORDER_TIMEOUT,
-            )
-            init_msg = await asyncio.wait_for(order_ws.recv(), timeout=5)
-            init_data = json.loads(init_msg)
-            if init_data.get("type") == "connected":
-                print(f"  Order WS:          connected")
+            await self.order_ws.send(frame)
+        except websockets.exceptions.ConnectionClosed as e:
+            raise ConnectionError(str(e)) from e
+
+    async def close(self):
+        readers, self._readers = self._readers, []
+        for task in readers:
+            task.cancel()
+        for task in readers:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        for ws in (self.order_ws, self.fill_ws):
+            if ws is not None:
+                try:
+                    await ws.close()
+                except Exception:
+                    pass
+        self.order_ws = None
+        self.fill_ws = None
+
+    async def _reconnect(self, kind):
+        delay = RECONNECT_BACKOFF
+        for attempt in range(1, RECONNECT_ATTEMPTS + 1):
+            print(f"  Session:           reconnecting {kind} WS (attempt {attempt}/{RECONNECT_ATTEMPTS})")
+            if kind == "order":
+                ws, _ = await _setup_order_ws()
             else:
-                print(f"  Order WS:          unexpected init: {init_data.get('type')}")
-        except Exception as e:
-            print(f"  Order WS Connect:  FAIL ({e})")
-            results.taker_error = f"order ws connect: {e}"
-            print()
+                ws, _ = await _setup_fill_listener()
+            if ws is not None:
+                setattr(self, f"{kind}_ws", ws)
+                self.reconnects += 1
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_BACKOFF_MAX)
+        raise ConnectionError(f"{kind} ws: reconnect failed after {RECONNECT_ATTEMPTS} attempts")
+
+    async def _reader(self, kind):
+        while True:
+            ws = getattr(self, f"{kind}_ws")
+            try:
+                raw = await ws.recv()
+                t_ns = time.perf_counter_ns()
+                try:
+                    msg = codec.loads(raw)
+                except codec.DecodeError:
+                    continue
+                msg_type = msg.get("type", "")
+                if msg_type == "ping":
+                    # inside the try: the socket can drop between recv and pong
+                    await ws.send(codec.dumps({"type": "pong"}))
+                    continue
+            except websockets.exceptions.ConnectionClosed:
+                if kind == "order":
+                    # Acks for orders sent on the dead socket will never come
+                    self._fail_acks(ConnectionError("order ws closed before ack"))
+                setattr(self, f"{kind}_ws", None)
+                try:
+                    await self._reconnect(kind)
+                except ConnectionError as e:
+                    print(f"  Session:           {e}")
+                    self._fail_acks(e)
+                    return
+                continue
+            if kind == "order":
+                self._route_ack(t_ns, raw, msg, msg_type)
+            else:
+                self._route_fill(t_ns, msg)
+
+    def _route_ack(self, t_ns, raw, msg, msg_type):
+        if msg_type == "connected" or not self._acks:
+            return
+        data = msg.get("data")
+        request_id = data.get("id") if isinstance(data, dict) else None
+        if request_id is None:
+            request_id = msg.get("id")
+        if request_id is None:
+            # No id echoed back: the oldest outstanding request is answered first
+            request_id = next(iter(self._acks))
+        order_index, fut = self._acks.pop(request_id, (None, None))
+        if fut is None:
             return
+        if msg.get("error") or (isinstance(data, dict) and data.get("error")):
+            # Rejected orders never fill; don't let their waiter claim a later fill
+            self._fills.pop(order_index, None)
+        if not fut.done():
+            fut.set_result((t_ns, raw))
+
+    def _route_fill(self, t_ns, msg):
+        for is_ask, client_id in _our_fills(msg):
+            entry = self._fills.get(client_id)
+            if entry is None or entry[0] != is_ask:
+                # No client id match: fall back to the side, but only when
+                # a single order on that side is waiting
+                waiting = [
+                    oidx for oidx, (ask, fut) in self._fills.items()
+                    if ask == is_ask and not fut.done()
+                ]
+                if len(waiting) != 1:
+                    continue
+                entry = self._fills[waiting[0]]
+            fut = entry[1]
+            if not fut.done():
+                fut.set_result((t_ns, msg))
+
+    def _fail_acks(self, exc):
+        acks, self._acks = self._acks, {}
+        for _, fut in acks.values():
+            if not fut.done():
+                fut.set_exception(exc)
+
+
+async def _open_session(session):
+    """Return (session, owned, error), connecting a new session if none was given."""
+    if session is not None:
+        return session, False, None
+    # Fill listener must be ready before placing orders
+    session = TakerSession()
+    err = await session.connect()
+    if err is not None:
+        await session.close()
+        return None, False, err
+    return session, True, None
+
+
+async def test_taker_latency(signer, best_ask, best_bid, session=None):
+    """Place market BUY via WS, then SELL to flatten. Measure signal-to-fill latency."""
+    print("[2/2] Taker Signal-to-Fill Latency Test")
+
+    if best_ask <= 0 or best_bid <= 0:
+        print("  SKIP: No valid orderbook data")
+        results.taker_error = "no orderbook data"
+        print()
+        return
 
+    session, owned, err = await _open_session(session)
+    if session is None:
+        results.taker_error = err
+        print()
+        return
+
+    try:
         size_wei = TEST_SIZE_WEI
         size_eth = size_wei / 1e4
 
@@ -681,7 +1085,7 @@ async def test_taker_latency(signer, best_ask, best_bid):
         worst_buy_price = int(best_ask * (1 + SLIPPAGE) * 100)
 
         oidx, t0, t1, t3, ws_resp, err = await _send_and_measure(
-            signer, order_ws, size_wei, False, worst_buy_price
+            signer, session, size_wei, False, worst_buy_price
         )
 
         if err is not None:
@@ -692,7 +1096,7 @@ async def test_taker_latency(signer, best_ask, best_bid):
                 size_eth = size_wei / 1e4
                 worst_buy_price = int(best_ask * (1 + SLIPPAGE) * 100)
                 oidx, t0, t1, t3, ws_resp, err = await _send_and_measure(
-                    signer, order_ws, size_wei, False, worst_buy_price
+                    signer, session, size_wei, False, worst_buy_price
                 )
 
         if err is not None:
@@ -714,10 +1118,10 @@ async def test_taker_latency(signer, best_ask, best_bid):
         print(f"  BUY Send->Ack:     {results.taker_buy_send_to_ack_ms:.0f}ms")
 
         # Wait for fill
-        if fill_ws is not None:
-            fill_msg = await _wait_for_fill(fill_ws, oidx, False)
-            if fill_msg is not None:
-                t4 = time.perf_counter()
+        if session.fill_enabled:
+            fill = await _wait_for_fill(session, oidx)
+            if fill is not None:
+                t4, _ = fill
                 results.taker_buy_ack_to_fill_ms = (t4 - t3) * 1000
                 results.taker_buy_s2f_ms = (t4 - t0) * 1000
                 print(f"  BUY Ack->Fill:     {results.taker_buy_ack_to_fill_ms:.0f}ms")
@@ -737,7 +1141,7 @@ async def test_taker_latency(signer, best_ask, best_bid):
 
         for attempt in range(3):
             oidx, t0, t1, t3, ws_resp, err = await _send_and_measure(
-                signer, order_ws, size_wei, True, worst_sell_price
+                signer, session, size_wei, True, worst_sell_price
             )
 
             if err is not None:
@@ -764,10 +1168,10 @@ async def test_taker_latency(signer, best_ask, best_bid):
             print(f"  SELL Send->Ack:    {results.taker_sell_send_to_ack_ms:.0f}ms")
 
             # Wait for fill
-            if fill_ws is not None:
-                fill_msg = await _wait_for_fill(fill_ws, oidx, True)
-                if fill_msg is not None:
-                    t4 = time.perf_counter()
+            if session.fill_enabled:
+                fill = await _wait_for_fill(session, oidx)
+                if fill is not None:
+                    t4, _ = fill
                     results.taker_sell_ack_to_fill_ms = (t4 - t3) * 1000
                     results.taker_sell_s2f_ms = (t4 - t0) * 1000
                     print(f"  SELL Ack->Fill:    {results.taker_sell_ack_to_fill_ms:.0f}ms")
@@ -781,20 +1185,314 @@ async def test_taker_latency(signer, best_ask, best_bid):
             break
 
     finally:
-        if order_ws is not None:
-            try:
-                await order_ws.close()
-            except Exception:
-                pass
-        if fill_ws is not None:
-            try:
-                await fill_ws.close()
-            except Exception:
-                pass
+        if owned:
+            await session.close()
 
     print()
 
 
+# ------------------------------------------------------------------
+# Test 2 (benchmark mode): N round-trips with percentile statistics
+# ------------------------------------------------------------------
+async def _run_leg(signer, session, size_wei, is_ask, worst_price, pool=None):
+    """Send one market order and wait for its fill.
+
+    Returns (sample, error). sample holds the raw ms breakdown; ack_to_fill_ms
+    and s2f_ms are None when the fill did not arrive (or there is no listener).
+    """
+    label = "SELL" if is_ask else "BUY"
+    oidx, t0, t1, t3, ws_resp, err = await _send_and_measure(
+        signer, session, size_wei, is_ask, worst_price, pool=pool
+    )
+    if err is not None:
+        return None, err
+    ack_err = _check_ack_error(ws_resp, label, verbose=False)
+    if ack_err:
+        return None, ack_err
+
+    sample = {
+        "side": label,
+        "mode": "pool" if pool is not None else "sign",
+        "signing_ms": (t1 - t0) * 1000,
+        "send_to_ack_ms": (t3 - t1) * 1000,
+        "ack_to_fill_ms": None,
+        "s2f_ms": None,
+    }
+    if session.fill_enabled:
+        fill = await _wait_for_fill(session, oidx)
+        if fill is not None:
+            t4, _ = fill
+            sample["ack_to_fill_ms"] = (t4 - t3) * 1000
+            sample["s2f_ms"] = (t4 - t0) * 1000
+    return sample, None
+
+
+def _format_leg(sample):
+    if sample["s2f_ms"] is not None:
+        return f"{sample['side']} {sample['s2f_ms']:.0f}ms"
+    return f"{sample['side']} ack {sample['send_to_ack_ms']:.0f}ms/no fill"
+
+
+def _dump_benchmark_samples(path):
+    """Write raw samples and their summary to JSON for cross-region comparison."""
+    doc = {
+        "endpoint": API_URL,
+        "market_index": MARKET_INDEX,
+        "time": datetime.now(timezone.utc).isoformat(),
+        "rounds": results.benchmark_rounds_done,
+        "failures": results.benchmark_failures,
+        # per mode: signed at signal vs pre-signed pool must not be blended
+        "stats": {
+            mode: {
+                key: _summarize(s[key] for s in results.benchmark_samples if s["mode"] == mode)
+                for key, _ in BENCHMARK_METRICS
+            }
+            for mode in sorted({s["mode"] for s in results.benchmark_samples}, reverse=True)
+        },
+        "samples": results.benchmark_samples,
+    }
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2)
+    print(f"  Samples written:   {path}")
+
+
+async def _top_of_book(signer):
+    """Current (best_bid, best_ask) from REST, or None if unavailable."""
+    try:
+        orders = await signer.order_api.order_book_orders(market_id=MARKET_INDEX, limit=1)
+        return float(orders.bids[0].price), float(orders.asks[0].price)
+    except Exception:
+        return None
+
+
+async def _benchmark_round(signer, session, rnd, rounds, size_wei, best_bid, best_ask, pool=None):
+    """One BUY then SELL-to-flatten round-trip. Returns False if the benchmark must stop."""
+    tag = f"Round {rnd}/{rounds}" + (" [pool]" if pool is not None else "")
+    worst_buy_price = int(best_ask * (1 + SLIPPAGE) * 100)
+    worst_sell_price = int(best_bid * (1 - SLIPPAGE) * 100)
+
+    # Signing happens here, between signals, not on the measured path
+    if pool is not None:
+        err = pool.refresh(best_bid, best_ask)
+        if err is not None:
+            results.benchmark_failures += 1
+            print(f"  {tag}: presign failed ({err})")
+            return True
+
+    buy, err = await _run_leg(
+        signer, session, size_wei, False, worst_buy_price, pool=pool
+    )
+    if err is not None:
+        results.benchmark_failures += 1
+        print(f"  {tag}: BUY failed ({err})")
+        return True
+    buy["round"] = rnd
+    results.benchmark_samples.append(buy)
+
+    # An unfilled IOC left us flat; selling now would open a short
+    if session.fill_enabled and buy["s2f_ms"] is None:
+        print(f"  {tag}: {_format_leg(buy)} — skipping SELL")
+        return True
+
+    sell = None
+    for attempt in range(3):
+        err = pool.refresh(best_bid, best_ask) if pool is not None else None
+        if err is None:
+            sell, err = await _run_leg(
+                signer, session, size_wei, True, worst_sell_price, pool=pool
+            )
+        if err is None:
+            break
+        results.benchmark_failures += 1
+        print(f"  {tag}: SELL failed ({err}) (attempt {attempt+1}/3)")
+        if attempt < 2:
+            await asyncio.sleep(1)
+
+    if sell is None:
+        # Stop rather than stack up an unflattened position
+        results.taker_error = f"sell: {err}"
+        return False
+
+    sell["round"] = rnd
+    results.benchmark_samples.append(sell)
+    print(f"  {tag}: {_format_leg(buy)}  {_format_leg(sell)}")
+    return True
+
+
+async def test_taker_benchmark(signer, best_ask, best_bid, rounds=BENCHMARK_ROUNDS, session=None):
+    """Run `rounds` BUY/SELL round-trips and report S2F percentile statistics."""
+    print(f"[2/2] Taker Signal-to-Fill Benchmark ({rounds} round-trips)")
+
+    if best_ask <= 0 or best_bid <= 0:
+        print("  SKIP: No valid orderbook data")
+        results.taker_error = "no orderbook data"
+        print()
+        return
+
+    session, owned, err = await _open_session(session)
+    if session is None:
+        results.taker_error = err
+        print()
+        return
+
+    size_wei = BENCHMARK_SIZE_WEI
+    print(f"  Size: {size_wei / 1e4:.4f} ETH  Pacing: {BENCHMARK_PACING}s"
+          + ("  Pre-signed pool: on" if PRESIGN_POOL else ""))
+
+    pool = PresignedOrderPool(signer) if PRESIGN_POOL else None
+    modes = ("sign", "pool") if pool is not None else ("sign",)
+
+    try:
+        for rnd in range(1, rounds + 1):
+            if rnd > 1 and BENCHMARK_PACING > 0:
+                await asyncio.sleep(BENCHMARK_PACING)
+            if rnd > 1:
+                # Off the measured path: worst prices, and the pool's
+                # PRESIGN_REFRESH_BPS check, follow the book between rounds
+                top = await _top_of_book(signer)
+                if top is not None and top[0] > 0 and top[1] > 0:
+                    best_bid, best_ask = top
+
+            ok = True
+            for mode in modes:
+                if mode == "pool":
+                    ok = await _benchmark_round(
+                        signer, session, rnd, rounds, size_wei, best_bid, best_ask, pool=pool
+                    )
+                else:
+                    if pool is not None:
+                        # Plain orders need the nonce the pool is holding
+                        pool.release()
+                    ok = await _benchmark_round(
+                        signer, session, rnd, rounds, size_wei, best_bid, best_ask
+                    )
+                if not ok:
+                    break
+            if not ok:
+                break
+            results.benchmark_rounds_done += 1
+
+    finally:
+        if pool is not None:
+            pool.release()
+        if owned:
+            await session.close()
+
+    if session.reconnects:
+        print(f"  Session:           {session.reconnects} reconnect(s)")
+
+    if BENCHMARK_SAMPLES_FILE and results.benchmark_samples:
+        _dump_benchmark_samples(BENCHMARK_SAMPLES_FILE)
+
+    print()
+
+
+# ------------------------------------------------------------------
+# Test 2 (pipelined mode): K orders in flight on one order socket
+# ------------------------------------------------------------------
+async def _run_depth(signer, session, depth, size_wei, worst_buy_price, worst_sell_price):
+    """Send PIPELINE_ORDERS orders with at most `depth` in flight. Returns a run dict."""
+    in_flight = asyncio.Semaphore(depth)
+    samples = []
+    errors = []
+
+    async def one(i):
+        is_ask = i % 2 == 1
+        async with in_flight:
+            sample, err = await _run_leg(
+                signer, session, size_wei, is_ask,
+                worst_sell_price if is_ask else worst_buy_price,
+            )
+        if err is not None:
+            errors.append(err)
+        else:
+            sample["seq"] = i
+            samples.append(sample)
+
+    t_start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(PIPELINE_ORDERS)))
+    wall_s = time.perf_counter() - t_start
+
+    return {
+        "depth": depth,
+        "orders": PIPELINE_ORDERS,
+        "failures": len(errors),
+        "errors": errors,
+        "wall_s": wall_s,
+        "throughput": len(samples) / wall_s if wall_s > 0 else 0.0,
+        "samples": sorted(samples, key=lambda s: s["seq"]),
+    }
+
+
+def _net_filled_legs(samples):
+    """Filled BUY legs minus filled SELL legs (equal sizes)."""
+    net = 0
+    for sample in samples:
+        if sample["s2f_ms"] is not None:
+            net += -1 if sample["side"] == "SELL" else 1
+    return net
+
+
+async def test_taker_pipelined(signer, best_ask, best_bid, depths=PIPELINE_DEPTHS, session=None):
+    """Measure per-order latency and throughput with K orders in flight."""
+    print(f"[Pipelined] Taker Latency with K in flight (K={', '.join(map(str, depths))})")
+
+    if best_ask <= 0 or best_bid <= 0:
+        print("  SKIP: No valid orderbook data")
+        results.taker_error = "no orderbook data"
+        print()
+        return
+
+    session, owned, err = await _open_session(session)
+    if session is None:
+        results.taker_error = err
+        print()
+        return
+    if not session.fill_enabled:
+        # Without fills we can't tell which side executed, so we can't flatten
+        print("  SKIP: Pipelined mode needs the fill listener")
+        if owned:
+            await session.close()
+        print()
+        return
+
+    size_wei = BENCHMARK_SIZE_WEI
+    worst_buy_price = int(best_ask * (1 + SLIPPAGE) * 100)
+    worst_sell_price = int(best_bid * (1 - SLIPPAGE) * 100)
+
+    try:
+        for depth in depths:
+            run = await _run_depth(
+                signer, session, depth, size_wei, worst_buy_price, worst_sell_price
+            )
+            results.pipeline_runs.append(run)
+            s2f = _summarize(s["s2f_ms"] for s in run["samples"])
+            s2f_str = f"s2f p50 {s2f['p50']:.0f}ms" if s2f else "no fills"
+            print(f"  K={depth:<3} {len(run['samples'])}/{run['orders']} acked, "
+                  f"{run['throughput']:.1f} ord/s, {s2f_str}")
+            for err in run["errors"]:
+                print(f"    failed: {err}")
+
+            # Unequal BUY/SELL fills leave a position; flatten before the next depth
+            net = _net_filled_legs(run["samples"])
+            for _ in range(abs(net)):
+                is_ask = net > 0
+                sample, err = await _run_leg(
+                    signer, session, size_wei, is_ask,
+                    worst_sell_price if is_ask else worst_buy_price,
+                )
+                if err is not None or sample["s2f_ms"] is None:
+                    results.taker_error = f"pipelined flatten failed ({err or 'no fill'})"
+                    print(f"  Flatten:           FAIL ({err or 'no fill'})")
+                    return
+            if net:
+                print(f"  Flatten:           {abs(net)} order(s)")
+    finally:
+        if owned:
+            await session.close()
+        print()
+
+
 # ------------------------------------------------------------------
 # Cleanup: Verify final account state
 # ------------------------------------------------------------------
@@ -802,7 +1500,7 @@ async def cleanup(signer):
     """Query final account state and warn if position is open."""
     print("[Cleanup]")
 
-    api_client = lighter.ApiClient(configuration=lighter.Configuration(host=API_URL))
+    api_client = sessions.acquire(API_URL)
     account_api = AccountApi(api_client)
 
     try:
@@ -834,13 +1532,24 @@ async def cleanup(signer):
     except Exception as e:
         print(f"  Cleanup query:     WARN ({e})")
 
-    await api_client.close()
+    await sessions.release(api_client)
 
-    # Close signer client
+    conns = signer.api_client.connection_stats()
+    print(f"  REST connections:  {conns['opened']} opened, {conns['reused']} reused, "
+          f"{conns['idle']} idle at exit")
+
+    recovery = signer.nonce_manager.recovery_stats()
+    if recovery["invalid_nonce"]:
+        print(f"  Nonce recovery:    {recovery['invalid_nonce']} invalid nonce "
+              f"({recovery['from_payload']} from payload, {recovery['from_acks']} from acks, "
+              f"{recovery['background_refresh']} REST refresh, {recovery['refresh_errors']} failed)")
+
+    # Close signer client, then whatever is left of the shared sessions
     try:
         await signer.close()
     except Exception:
         pass
+    await sessions.close_all()
 
     print()
 
@@ -887,6 +1596,7 @@ async def _emergency_cleanup():
         await _signer_client.close()
     except Exception:
         pass
+    await sessions.close_all()
 
 
 # ------------------------------------------------------------------
@@ -918,8 +1628,23 @@ async def main():
         _print_summary()
         return 2
 
-    # Test 2: Taker latency (buy + sell)
-    await test_taker_latency(signer, results.best_ask, results.best_bid)
+    # Test 2: Taker latency (buy + sell, or N round-trips in benchmark mode),
+    # all modes sharing one fill listener + order socket session
+    print("[Session]")
+    session, _, err = await _open_session(None)
+    print()
+    if session is None:
+        results.taker_error = err
+    else:
+        try:
+            if BENCHMARK_ROUNDS > 0:
+                await test_taker_benchmark(signer, results.best_ask, results.best_bid, session=session)
+            else:
+                await test_taker_latency(signer, results.best_ask, results.best_bid, session=session)
+            if PIPELINE_DEPTHS and not results.taker_error:
+                await test_taker_pipelined(signer, results.best_ask, results.best_bid, session=session)
+        finally:
+            await session.close()
 
     # Cleanup
     await cleanup(signer)